@@ -5,14 +5,16 @@ Applies augmentations to the annotated dataset
 
 import os
 import sys
+import logging
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
-from augmentation import DataAugmentor
 from utils import load_config, setup_logging
 
+logger = logging.getLogger(__name__)
+
 def main():
     """Run data augmentation on the annotated dataset"""
     
@@ -21,8 +23,6 @@ def main():
     
     # Setup logging
     setup_logging(config)
-    import logging
-    logger = logging.getLogger(__name__)
     
     logger.info("="*60)
     logger.info("BASKETBALL DATASET AUGMENTATION - PHASE 3")
@@ -42,6 +42,9 @@ def main():
     logger.info(f"\nInput directory: {input_dir}")
     logger.info(f"Output directory: {output_dir}")
     
+    # Imported late: pulls in OpenCV/NumPy, which the early-exit paths don't need
+    from augmentation import DataAugmentor
+    
     # Initialize augmentor
     augmentor = DataAugmentor(config)
     
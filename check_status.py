@@ -5,234 +5,403 @@ Shows: Source Videos → Trimmed Clips → Extracted Frames → Ball Detection
 """
 
 import os
-from pathlib import Path
+import sys
+import json
+import functools
+from concurrent.futures import ThreadPoolExecutor
 
 
+IMAGE_EXTS = frozenset({'jpg', 'jpeg', 'png', 'bmp'})
+VIDEO_EXTS = frozenset({'mp4', 'avi', 'mov', 'mkv', 'flv', 'wmv'})
+
+# Below this many video folders a thread pool costs more than it saves
+PARALLEL_SCAN_MIN_FOLDERS = 4
+
+STATUS_CACHE_FILENAME = '.status_cache.json'
+
+# {key: [mtime_ns, value]} while check_pipeline_status runs; None disables caching
+_status_cache = None
+
+
+def _extension(name):
+    """Lower-cased extension of a file name, without the dot ('' if none)"""
+    head, dot, ext = name.rpartition('.')
+    return ext.lower() if dot and head else ''
+
+
+def _ext_set(extensions):
+    """Normalize an extension collection ('.jpg' or 'jpg', any case) to a frozenset"""
+    if extensions is None or extensions is IMAGE_EXTS or extensions is VIDEO_EXTS:
+        return extensions
+    return frozenset(ext.lstrip('.').lower() for ext in extensions)
+
+
+def _count_dir_files(directory, extensions=None):
+    """Count files in a single directory using the cached DirEntry type"""
+    # Symlinks are followed: trimming with --link leaves symlinked videos behind
+    # (only symlinks cost an extra stat; regular files use the dirent type)
+    with os.scandir(directory) as it:
+        return sum(1 for entry in it
+                   if entry.is_file()
+                   and (not extensions or _extension(entry.name) in extensions))
+
+
+def count_images_in(directory, extensions):
+    """Count matching files in directory, treating a missing directory as empty"""
+    try:
+        return _count_dir_files(directory, extensions)
+    except (FileNotFoundError, NotADirectoryError):
+        return 0
+
+
+def _map_folders(func, folders):
+    """Apply func to each folder, overlapping the directory scans in threads"""
+    # Directory scans release the GIL, so threads overlap the filesystem
+    # latency on large/networked trees.
+    if len(folders) < PARALLEL_SCAN_MIN_FOLDERS:
+        return [func(folder) for folder in folders]
+    max_workers = min(32, (os.cpu_count() or 1) * 4, len(folders))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(func, folders))
+
+
+def _dir_mtime(directory):
+    """mtime of the directory itself (changes when entries are added/removed)"""
+    return os.stat(directory).st_mtime_ns
+
+
+def _tree_mtime(directory):
+    """Latest mtime of the directory and its immediate subdirectories"""
+    mtime = os.stat(directory).st_mtime_ns
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                mtime = max(mtime, entry.stat(follow_symlinks=False).st_mtime_ns)
+    return mtime
+
+
+def _extracted_mtime(directory):
+    """Latest mtime over frame folders and their Ball_detected/No_ball_detected folders"""
+    mtime = os.stat(directory).st_mtime_ns
+    with os.scandir(directory) as it:
+        for entry in it:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            mtime = max(mtime, entry.stat(follow_symlinks=False).st_mtime_ns)
+            for name in ("Ball_detected", "No_ball_detected"):
+                try:
+                    mtime = max(mtime, os.stat(os.path.join(entry.path, name)).st_mtime_ns)
+                except FileNotFoundError:
+                    pass
+    return mtime
+
+
+def _mtime_cached(fingerprint):
+    """Reuse a directory count from the status cache while fingerprint() is unchanged"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(directory, *args):
+            cache = _status_cache
+            if cache is None:
+                return func(directory, *args)
+            try:
+                mtime = fingerprint(directory)
+            except (FileNotFoundError, NotADirectoryError):
+                return func(directory, *args)
+            
+            key = "|".join([func.__name__, str(directory)] +
+                           [",".join(sorted(a)) if isinstance(a, (set, frozenset)) else repr(a)
+                            for a in args])
+            entry = cache.get(key)
+            if entry and entry[0] == mtime:
+                value = entry[1]
+                return tuple(value) if isinstance(value, list) else value
+            
+            value = func(directory, *args)
+            cache[key] = [mtime, value]
+            return value
+        return wrapper
+    return decorator
+
+
+def load_status_cache(cache_path):
+    """Load the status count cache, or an empty one"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_status_cache(cache_path, cache):
+    """Atomically write the status count cache"""
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+@_mtime_cached(_dir_mtime)
 def count_files_in_dir(directory, extensions=None):
-    """Count files in directory"""
-    if not os.path.exists(directory):
+    """Count files in directory
+    
+    extensions may be given with or without the leading dot; IMAGE_EXTS and
+    VIDEO_EXTS are used as-is.
+    """
+    try:
+        return _count_dir_files(directory, _ext_set(extensions))
+    except (FileNotFoundError, NotADirectoryError):
         return 0
-    
-    files = list(Path(directory).iterdir())
-    if extensions:
-        files = [f for f in files if f.suffix.lower() in extensions]
-    
-    return len([f for f in files if f.is_file()])
 
 
+@_mtime_cached(_dir_mtime)
 def count_subdirs(directory):
     """Count subdirectories"""
-    if not os.path.exists(directory):
+    try:
+        with os.scandir(directory) as it:
+            return sum(1 for entry in it if entry.is_dir(follow_symlinks=False))
+    except (FileNotFoundError, NotADirectoryError):
         return 0
-    return len([d for d in Path(directory).iterdir() if d.is_dir()])
 
 
+@_mtime_cached(_tree_mtime)
 def count_files_recursive(directory, extensions=None):
     """Recursively count files in directory and subdirectories"""
-    if not os.path.exists(directory):
-        return 0
-    
-    count = 0
-    path = Path(directory)
+    extensions = _ext_set(extensions)
     
     # Count files in all subdirectories
-    for subdir in path.iterdir():
-        if subdir.is_dir():
-            files = list(subdir.iterdir())
-            if extensions:
-                files = [f for f in files if f.is_file() and f.suffix.lower() in extensions]
-            else:
-                files = [f for f in files if f.is_file()]
-            count += len(files)
+    try:
+        with os.scandir(directory) as it:
+            subdirs = [entry.path for entry in it if entry.is_dir(follow_symlinks=False)]
+    except (FileNotFoundError, NotADirectoryError):
+        return 0
     
-    return count
+    return sum(_map_folders(lambda subdir: count_images_in(subdir, extensions), subdirs))
 
 
-def check_ball_detection_folders():
-    """Check Ball_detected and No_ball_detected folders inside extracted_frames"""
-    base_dir = Path(os.path.dirname(os.path.abspath(__file__)))
-    extracted_dir = base_dir / "data" / "extracted_frames"
+def count_images(directory):
+    """Count image files in directory, treating a missing directory as empty"""
+    return count_images_in(directory, IMAGE_EXTS)
+
+
+def _scan_detection_folder(video_folder):
+    """Return (ball_count, no_ball_count, unclassified_count) for one extracted video folder"""
+    ball_files = no_ball_files = unclassified = 0
+    try:
+        with os.scandir(video_folder) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name == "Ball_detected":
+                        ball_files += count_images(entry.path)
+                    elif entry.name == "No_ball_detected":
+                        no_ball_files += count_images(entry.path)
+                elif entry.is_file(follow_symlinks=False) and _extension(entry.name) in IMAGE_EXTS:
+                    unclassified += 1
+    except FileNotFoundError:
+        # Folder removed while the pipeline is running
+        pass
+    return ball_files, no_ball_files, unclassified
+
+
+@_mtime_cached(_extracted_mtime)
+def scan_extracted(extracted_dir):
+    """Scan extracted_frames once for frame folder and ball detection counts
     
+    Returns:
+        Tuple of (ball_detected, no_ball, unclassified, folder_count, folders_with_detection)
+    """
     ball_detected_count = 0
     no_ball_count = 0
+    unclassified_count = 0
     folders_with_detection = 0
     
-    image_extensions = ['.jpg', '.jpeg', '.png', '.bmp']
-    
-    if not extracted_dir.exists():
-        return 0, 0, 0
+    try:
+        with os.scandir(extracted_dir) as it:
+            video_folders = [entry.path for entry in it if entry.is_dir(follow_symlinks=False)]
+    except FileNotFoundError:
+        return 0, 0, 0, 0, 0
     
     # Check each video folder in extracted_frames
-    for video_folder in extracted_dir.iterdir():
-        if not video_folder.is_dir():
-            continue
-        
-        ball_detected_dir = video_folder / "Ball_detected"
-        no_ball_dir = video_folder / "No_ball_detected"
-        
-        has_detection = False
+    for ball_files, no_ball_files, unclassified in _map_folders(_scan_detection_folder, video_folders):
+        ball_detected_count += ball_files
+        no_ball_count += no_ball_files
+        unclassified_count += unclassified
         
-        if ball_detected_dir.exists():
-            files = [f for f in ball_detected_dir.iterdir() 
-                    if f.is_file() and f.suffix.lower() in image_extensions]
-            ball_detected_count += len(files)
-            if len(files) > 0:
-                has_detection = True
-        
-        if no_ball_dir.exists():
-            files = [f for f in no_ball_dir.iterdir() 
-                    if f.is_file() and f.suffix.lower() in image_extensions]
-            no_ball_count += len(files)
-            if len(files) > 0:
-                has_detection = True
-        
-        if has_detection:
+        if ball_files or no_ball_files:
             folders_with_detection += 1
     
-    return ball_detected_count, no_ball_count, folders_with_detection
+    return (ball_detected_count, no_ball_count, unclassified_count,
+            len(video_folders), folders_with_detection)
+
+
+def check_ball_detection_folders():
+    """Check Ball_detected and No_ball_detected folders inside extracted_frames"""
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    extracted_dir = os.path.join(base_dir, "data", "extracted_frames")
+    
+    ball_detected, no_ball, _, _, folders_with_detection = scan_extracted(extracted_dir)
+    return ball_detected, no_ball, folders_with_detection
 
 
 def check_pipeline_status():
     """Check and display pipeline status"""
+    global _status_cache
     
-    print("="*70)
-    print("  🏀 BASKETBALL DATASET PIPELINE - STATUS CHECK")
-    print("="*70 + "\n")
+    # Build the report in memory and write it once at the end
+    lines = []
     
-    base_dir = Path(os.path.dirname(os.path.abspath(__file__)))
-    data_dir = base_dir / 'data'
+    def emit(text=""):
+        lines.append(text)
+    
+    emit("="*70)
+    emit("  🏀 BASKETBALL DATASET PIPELINE - STATUS CHECK")
+    emit("="*70 + "\n")
+    
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    data_dir = os.path.join(base_dir, 'data')
     
     # Check directories
-    source_videos_dir = data_dir / 'source_videos'
-    all_video_frames_dir = data_dir / 'all_video_frames'
-    extracted_dir = data_dir / 'extracted_frames'
+    source_videos_dir = os.path.join(data_dir, 'source_videos')
+    all_video_frames_dir = os.path.join(data_dir, 'all_video_frames')
+    extracted_dir = os.path.join(data_dir, 'extracted_frames')
+    
+    # Counts are cached on disk and reused while the directory mtimes are unchanged
+    cache_path = os.path.join(base_dir, STATUS_CACHE_FILENAME)
+    _status_cache = load_status_cache(cache_path)
+    cached_entries = dict(_status_cache)
     
     # Count videos
-    video_extensions = ['.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv']
-    num_source_videos = count_files_in_dir(str(source_videos_dir), video_extensions)
+    num_source_videos = count_files_in_dir(source_videos_dir, VIDEO_EXTS)
     
     # Count trimmed video folders
-    num_trimmed_folders = count_subdirs(str(all_video_frames_dir))
-    num_trimmed_videos = count_files_recursive(str(all_video_frames_dir), video_extensions)
+    num_trimmed_folders = count_subdirs(all_video_frames_dir)
+    num_trimmed_videos = count_files_recursive(all_video_frames_dir, VIDEO_EXTS)
     
     # Count extracted frames (includes frames in Ball_detected/No_ball_detected)
-    num_extracted_folders = count_subdirs(str(extracted_dir))
-    image_extensions = ['.jpg', '.jpeg', '.png', '.bmp']
-    
-    # Check ball detection results first
-    ball_detected, no_ball, folders_with_detection = check_ball_detection_folders()
+    # in a single pass over the frame folders
+    (ball_detected, no_ball, unclassified_frames,
+     num_extracted_folders, folders_with_detection) = scan_extracted(extracted_dir)
     
     # Total frames = classified frames + unclassified frames
-    unclassified_frames = count_files_recursive(str(extracted_dir), image_extensions)
     total_extracted = ball_detected + no_ball + unclassified_frames
     
+    if _status_cache != cached_entries:
+        save_status_cache(cache_path, _status_cache)
+    _status_cache = None
+    
     # Display status
-    print("📊 PIPELINE STATUS:\n")
+    emit("📊 PIPELINE STATUS:\n")
     
     # Stage 1: Source Videos
-    print(f"  📹 STAGE 1: Source Videos")
-    print(f"     Location: {source_videos_dir}")
-    print(f"     Count: {num_source_videos} video(s)")
+    emit(f"  📹 STAGE 1: Source Videos")
+    emit(f"     Location: {source_videos_dir}")
+    emit(f"     Count: {num_source_videos} video(s)")
     
     if num_source_videos == 0:
-        print(f"     ⚠️  No videos found! Add videos to data/source_videos/")
+        emit(f"     ⚠️  No videos found! Add videos to data/source_videos/")
     else:
-        print(f"     ✅ Videos ready for processing")
+        emit(f"     ✅ Videos ready for processing")
     
-    print()
+    emit()
     
     # Stage 2: Trimmed Clips
-    print(f"  ✂️  STAGE 2: Trimmed/Organized Videos")
-    print(f"     Location: {all_video_frames_dir}")
-    print(f"     Video folders: {num_trimmed_folders}")
-    print(f"     Video files: {num_trimmed_videos}")
+    emit(f"  ✂️  STAGE 2: Trimmed/Organized Videos")
+    emit(f"     Location: {all_video_frames_dir}")
+    emit(f"     Video folders: {num_trimmed_folders}")
+    emit(f"     Video files: {num_trimmed_videos}")
     
     if num_trimmed_folders == 0:
-        print(f"     ℹ️  No videos trimmed yet. Run: python run_pipeline.py")
+        emit(f"     ℹ️  No videos trimmed yet. Run: python run_pipeline.py")
     else:
-        print(f"     ✅ {num_trimmed_folders} video folder(s) ready")
+        emit(f"     ✅ {num_trimmed_folders} video folder(s) ready")
     
-    print()
+    emit()
     
     # Stage 3: Extracted Frames
-    print(f"  🎞️  STAGE 3: Extracted Frames")
-    print(f"     Location: {extracted_dir}")
-    print(f"     Frame folders: {num_extracted_folders}")
-    print(f"     Total frames: {total_extracted}")
-    print(f"       • Classified: {ball_detected + no_ball}")
-    print(f"       • Unclassified: {unclassified_frames}")
+    emit(f"  🎞️  STAGE 3: Extracted Frames")
+    emit(f"     Location: {extracted_dir}")
+    emit(f"     Frame folders: {num_extracted_folders}")
+    emit(f"     Total frames: {total_extracted}")
+    emit(f"       • Classified: {ball_detected + no_ball}")
+    emit(f"       • Unclassified: {unclassified_frames}")
     
     if total_extracted == 0:
-        print(f"     ℹ️  No frames extracted yet. Run: python run_pipeline.py")
+        emit(f"     ℹ️  No frames extracted yet. Run: python run_pipeline.py")
     else:
-        print(f"     ✅ {total_extracted} frame(s) extracted")
+        emit(f"     ✅ {total_extracted} frame(s) extracted")
     
-    print()
+    emit()
     
     # Stage 4: Ball Detection
-    print(f"  ⚽ STAGE 4: Ball Detection Results")
-    print(f"     Ball detected: {ball_detected} frames")
-    print(f"     No ball: {no_ball} frames")
-    print(f"     Folders processed: {folders_with_detection}/{num_extracted_folders}")
-    print(f"     Total classified: {ball_detected + no_ball} frames")
+    emit(f"  ⚽ STAGE 4: Ball Detection Results")
+    emit(f"     Ball detected: {ball_detected} frames")
+    emit(f"     No ball: {no_ball} frames")
+    emit(f"     Folders processed: {folders_with_detection}/{num_extracted_folders}")
+    emit(f"     Total classified: {ball_detected + no_ball} frames")
     
     if ball_detected + no_ball == 0:
-        print(f"     ℹ️  No ball detection done yet. Run: python run_pipeline.py")
+        emit(f"     ℹ️  No ball detection done yet. Run: python run_pipeline.py")
     else:
         detection_rate = (ball_detected / (ball_detected + no_ball) * 100) if (ball_detected + no_ball) > 0 else 0
-        print(f"     ✅ Detection complete ({detection_rate:.1f}% with ball)")
+        emit(f"     ✅ Detection complete ({detection_rate:.1f}% with ball)")
     
-    print()
-    print("="*70)
+    emit()
+    emit("="*70)
     
     # Next steps
-    print("  📋 NEXT STEPS:\n")
+    emit("  📋 NEXT STEPS:\n")
     
     if num_source_videos == 0:
-        print("  1. Add basketball videos to: data/source_videos/")
-        print("  2. Run the pipeline: python run_pipeline.py")
+        emit("  1. Add basketball videos to: data/source_videos/")
+        emit("  2. Run the pipeline: python run_pipeline.py")
     elif num_trimmed_folders == 0:
-        print("  1. Run the pipeline: python run_pipeline.py")
-        print("  2. Choose which videos to trim or use full videos")
+        emit("  1. Run the pipeline: python run_pipeline.py")
+        emit("  2. Choose which videos to trim or use full videos")
     elif total_extracted == 0:
-        print("  1. Pipeline will extract frames automatically")
-        print("  2. Run: python run_pipeline.py (if not already running)")
+        emit("  1. Pipeline will extract frames automatically")
+        emit("  2. Run: python run_pipeline.py (if not already running)")
     elif ball_detected + no_ball == 0:
-        print("  1. Pipeline will run ball detection automatically")
-        print("  2. Run: python run_pipeline.py (if not already running)")
+        emit("  1. Pipeline will run ball detection automatically")
+        emit("  2. Run: python run_pipeline.py (if not already running)")
     else:
-        print("  ✅ Pipeline Complete!")
-        print("  1. Review ball detection results:")
-        print(f"     • Ball_detected/ ({ball_detected} frames)")
-        print(f"     • No_ball_detected/ ({no_ball} frames)")
-        print("  2. Annotate frames with ball for YOLO training")
-        print("  3. Run augmentation: python augment_dataset.py")
-        print("  4. Train YOLO model: python train_yolo.py")
+        emit("  ✅ Pipeline Complete!")
+        emit("  1. Review ball detection results:")
+        emit(f"     • Ball_detected/ ({ball_detected} frames)")
+        emit(f"     • No_ball_detected/ ({no_ball} frames)")
+        emit("  2. Annotate frames with ball for YOLO training")
+        emit("  3. Run augmentation: python augment_dataset.py")
+        emit("  4. Train YOLO model: python train_yolo.py")
     
-    print("\n" + "="*70 + "\n")
+    emit("\n" + "="*70 + "\n")
     
     # Configuration check
-    print("  📁 CONFIGURATION FILES:\n")
+    emit("  📁 CONFIGURATION FILES:\n")
     
-    config_file = base_dir / 'config' / 'config.yaml'
-    if config_file.exists():
-        print("  ✅ Frame extraction config: config/config.yaml")
+    config_file = os.path.join(base_dir, 'config', 'config.yaml')
+    if os.path.exists(config_file):
+        emit("  ✅ Frame extraction config: config/config.yaml")
     else:
-        print("  ⚠️  config/config.yaml missing!")
+        emit("  ⚠️  config/config.yaml missing!")
     
-    trim_config = base_dir / 'config' / 'trim_ranges.yaml'
-    if trim_config.exists():
-        print("  ✅ Trim ranges config: config/trim_ranges.yaml")
+    trim_config = os.path.join(base_dir, 'config', 'trim_ranges.yaml')
+    if os.path.exists(trim_config):
+        emit("  ✅ Trim ranges config: config/trim_ranges.yaml")
     else:
-        print("  ℹ️  config/trim_ranges.yaml (optional)")
+        emit("  ℹ️  config/trim_ranges.yaml (optional)")
     
-    req_file = base_dir / 'requirements.txt'
-    if req_file.exists():
-        print("  ✅ Requirements file: requirements.txt")
+    req_file = os.path.join(base_dir, 'requirements.txt')
+    if os.path.exists(req_file):
+        emit("  ✅ Requirements file: requirements.txt")
     else:
-        print("  ⚠️  requirements.txt missing!")
+        emit("  ⚠️  requirements.txt missing!")
+    
+    emit("\n" + "="*70 + "\n")
     
-    print("\n" + "="*70 + "\n")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == '__main__':
@@ -5,35 +5,174 @@ Shows: Resolution, FPS, Duration, Bitrate, Codec, File Size
 """
 
 import os
+import csv
+import bisect
+import json
+import subprocess
 import cv2
+import numpy as np
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from datetime import timedelta
 
+CACHE_FILENAME = '.video_quality_cache.json'
+# Minimum pixel counts for each quality tier, ascending; QUALITY_LABELS[i]
+# applies when i thresholds are met
+QUALITY_THRESHOLDS = (
+    854 * 480,    # SD
+    1280 * 720,   # HD
+    1920 * 1080,  # Full HD
+    2560 * 1440,  # 2K
+    3840 * 2160,  # 4K
+)
+QUALITY_LABELS = ("Low Quality", "SD (480p)", "HD (720p)", "Full HD (1080p)", "2K QHD", "4K UHD")
+VIDEO_EXTENSIONS = frozenset({'.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv'})
 
-def get_video_info(video_path):
-    """Extract comprehensive video quality information"""
+# Numeric columns used for the summary statistics
+SUMMARY_DTYPE = np.dtype([
+    ('duration', 'f8'),
+    ('frames', 'i8'),
+    ('size_gb', 'f8'),
+    ('fps', 'f8'),
+    ('bitrate', 'f8'),
+    ('pixels', 'i8'),
+])
+
+
+def load_info_cache(cache_path):
+    """Load cached video metadata ({path: {size, mtime_ns, info}})"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_info_cache(cache_path, cache):
+    """Atomically write cached video metadata"""
+    tmp_path = f"{cache_path}.tmp"
     try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: could not save metadata cache: {e}")
+
+
+def _parse_rate(rate):
+    """Parse an ffprobe frame rate such as '30000/1001' into a float"""
+    num, _, den = str(rate).partition('/')
+    try:
+        return float(num) / float(den) if den else float(num)
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+
+def probe_with_ffprobe(video_path):
+    """Read container metadata with ffprobe (no decoder initialisation)
+    
+    Returns (width, height, fps, frame_count, duration_seconds, codec),
+    or None if ffprobe is unavailable or fails.
+    """
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'stream=width,height,r_frame_rate,nb_frames,codec_name,duration:format=duration',
+        '-of', 'json',
+        str(video_path)
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    
+    try:
+        data = json.loads(result.stdout)
+        stream = data['streams'][0]
+        fmt = data.get('format', {})
+        width = int(stream['width'])
+        height = int(stream['height'])
+        fps = _parse_rate(stream.get('r_frame_rate', 0))
+        duration_seconds = float(stream.get('duration') or fmt.get('duration') or 0)
+        if stream.get('nb_frames'):
+            frame_count = int(stream['nb_frames'])
+        else:
+            # Some containers (e.g. mkv) don't store a frame count
+            frame_count = int(round(duration_seconds * fps))
+        if not duration_seconds and fps > 0:
+            duration_seconds = frame_count / fps
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+    
+    return width, height, fps, frame_count, duration_seconds, stream.get('codec_name', '')
+
+
+def probe_with_opencv(video_path):
+    """Read video metadata with OpenCV (fallback when ffprobe is missing)
+    
+    Returns (width, height, fps, frame_count, duration_seconds, codec),
+    or None if the video can't be opened.
+    """
+    # Force the FFmpeg backend without hardware decoder probing: only the
+    # header is needed. Fall back to OpenCV's backend auto-selection.
+    params = []
+    if hasattr(cv2, 'CAP_PROP_HW_ACCELERATION') and hasattr(cv2, 'VIDEO_ACCELERATION_NONE'):
+        params = [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_NONE]
+    cap = cv2.VideoCapture(str(video_path), cv2.CAP_FFMPEG, params)
+    if not cap.isOpened():
         cap = cv2.VideoCapture(str(video_path))
+    
+    if not cap.isOpened():
+        return None
+    
+    # Get video properties
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    
+    # Calculate duration
+    duration_seconds = frame_count / fps if fps > 0 else 0
+    
+    # Get codec information
+    fourcc_int = int(cap.get(cv2.CAP_PROP_FOURCC)) & 0xFFFFFFFF
+    fourcc = fourcc_int.to_bytes(4, 'little').decode('ascii', errors='replace').rstrip('\x00')
+    
+    cap.release()
+    
+    return width, height, fps, frame_count, duration_seconds, fourcc
+
+
+def get_video_info(video_path, cache=None):
+    """Extract comprehensive video quality information
+    
+    If a cache dict is given, results are reused while the file's size and
+    mtime are unchanged, and fresh results are stored back into it.
+    """
+    try:
+        st = os.stat(video_path)
+        key = str(video_path)
+        if cache is not None:
+            entry = cache.get(key)
+            if (isinstance(entry, dict) and entry.get('size') == st.st_size
+                    and entry.get('mtime_ns') == st.st_mtime_ns):
+                return entry['info']
         
-        if not cap.isOpened():
+        # Prefer a header-only ffprobe read; fall back to OpenCV without ffprobe
+        props = probe_with_ffprobe(video_path) or probe_with_opencv(video_path)
+        if props is None:
             return None
+        width, height, fps, frame_count, duration_seconds, codec = props
         
-        # Get video properties
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        
-        # Calculate duration
-        duration_seconds = frame_count / fps if fps > 0 else 0
         duration = str(timedelta(seconds=int(duration_seconds)))
         
-        # Get codec information
-        fourcc_int = int(cap.get(cv2.CAP_PROP_FOURCC))
-        fourcc = "".join([chr((fourcc_int >> 8 * i) & 0xFF) for i in range(4)])
-        
-        # Get file size
-        file_size_bytes = os.path.getsize(video_path)
+        # Get file size (from the stat already used for the cache key)
+        file_size_bytes = st.st_size
         file_size_mb = file_size_bytes / (1024 * 1024)
         file_size_gb = file_size_bytes / (1024 * 1024 * 1024)
         
@@ -44,9 +183,7 @@ def get_video_info(video_path):
         else:
             bitrate_mbps = 0
         
-        cap.release()
-        
-        return {
+        info = {
             'resolution': f"{width}x{height}",
             'width': width,
             'height': height,
@@ -54,11 +191,16 @@ def get_video_info(video_path):
             'frame_count': frame_count,
             'duration': duration,
             'duration_seconds': round(duration_seconds, 2),
-            'codec': fourcc.strip(),
+            'codec': codec.strip(),
             'file_size_mb': round(file_size_mb, 2),
             'file_size_gb': round(file_size_gb, 3),
             'bitrate_mbps': round(bitrate_mbps, 2)
         }
+        
+        if cache is not None:
+            cache[key] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'info': info}
+        
+        return info
     
     except Exception as e:
         print(f"Error processing video: {e}")
@@ -67,20 +209,7 @@ def get_video_info(video_path):
 
 def get_quality_category(width, height):
     """Categorize video quality based on resolution"""
-    pixels = width * height
-    
-    if pixels >= 3840 * 2160:  # 4K
-        return "4K UHD"
-    elif pixels >= 2560 * 1440:  # 2K
-        return "2K QHD"
-    elif pixels >= 1920 * 1080:  # Full HD
-        return "Full HD (1080p)"
-    elif pixels >= 1280 * 720:  # HD
-        return "HD (720p)"
-    elif pixels >= 854 * 480:  # SD
-        return "SD (480p)"
-    else:
-        return "Low Quality"
+    return QUALITY_LABELS[bisect.bisect_right(QUALITY_THRESHOLDS, width * height)]
 
 
 def analyze_videos():
@@ -97,14 +226,13 @@ def analyze_videos():
         print(f"❌ Source videos directory not found: {source_dir}")
         return
     
-    # Find all video files
-    video_extensions = ['.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv']
-    videos = []
-    for ext in video_extensions:
-        videos.extend(source_dir.glob(f'*{ext}'))
-        videos.extend(source_dir.glob(f'*{ext.upper()}'))
-    
-    videos = sorted(set(videos), key=lambda p: p.name.lower())
+    # Find all video files (single directory pass, case-insensitive extensions)
+    with os.scandir(source_dir) as it:
+        videos = sorted(
+            (Path(entry.path) for entry in it
+             if entry.is_file() and os.path.splitext(entry.name)[1].lower() in VIDEO_EXTENSIONS),
+            key=lambda p: p.name.lower()
+        )
     
     if not videos:
         print(f"❌ No videos found in {source_dir}")
@@ -113,15 +241,23 @@ def analyze_videos():
     print(f"Found {len(videos)} video(s) in {source_dir}\n")
     print("="*80)
     
-    # Analyze each video
+    # Analyze each video (metadata is cached across runs by size + mtime)
+    cache_path = base_dir / CACHE_FILENAME
+    info_cache = load_info_cache(cache_path)
+    cached_entries = dict(info_cache)
     video_info_list = []
     
-    for idx, video_path in enumerate(videos, 1):
+    # ffprobe runs out of process and OpenCV header parsing releases the GIL,
+    # so read all videos in parallel; keep OpenCV single-threaded per capture
+    # to avoid oversubscribing
+    cv2.setNumThreads(1)
+    with ThreadPoolExecutor(max_workers=min(8, len(videos))) as executor:
+        infos = list(executor.map(partial(get_video_info, cache=info_cache), videos))
+    
+    for idx, (video_path, info) in enumerate(zip(videos, infos), 1):
         print(f"\n📹 [{idx}/{len(videos)}] {video_path.name}")
         print("-" * 80)
         
-        info = get_video_info(video_path)
-        
         if info:
             quality = get_quality_category(info['width'], info['height'])
             
@@ -141,29 +277,33 @@ def analyze_videos():
         else:
             print(f"  ❌ Failed to read video information")
     
+    if info_cache != cached_entries:
+        save_info_cache(cache_path, info_cache)
+    
     # Summary
     if video_info_list:
         print("\n" + "="*80)
         print("  📊 SUMMARY")
         print("="*80 + "\n")
         
-        total_duration = sum(v['info']['duration_seconds'] for v in video_info_list)
-        total_frames = sum(v['info']['frame_count'] for v in video_info_list)
-        total_size_gb = sum(v['info']['file_size_gb'] for v in video_info_list)
-        avg_fps = sum(v['info']['fps'] for v in video_info_list) / len(video_info_list)
-        avg_bitrate = sum(v['info']['bitrate_mbps'] for v in video_info_list) / len(video_info_list)
+        # Load the numeric columns once and reduce them in NumPy
+        stats = np.fromiter(
+            ((v['info']['duration_seconds'], v['info']['frame_count'], v['info']['file_size_gb'],
+              v['info']['fps'], v['info']['bitrate_mbps'], v['info']['width'] * v['info']['height'])
+             for v in video_info_list),
+            dtype=SUMMARY_DTYPE,
+            count=len(video_info_list)
+        )
         
-        # Resolution distribution
-        resolutions = {}
-        for v in video_info_list:
-            res = v['info']['resolution']
-            resolutions[res] = resolutions.get(res, 0) + 1
+        total_duration = float(stats['duration'].sum())
+        total_frames = int(stats['frames'].sum())
+        total_size_gb = float(stats['size_gb'].sum())
+        avg_fps = float(stats['fps'].mean())
+        avg_bitrate = float(stats['bitrate'].mean())
         
-        # Quality distribution
-        qualities = {}
-        for v in video_info_list:
-            qual = v['quality']
-            qualities[qual] = qualities.get(qual, 0) + 1
+        # Resolution / quality distribution
+        resolutions = Counter(v['info']['resolution'] for v in video_info_list)
+        qualities = Counter(v['quality'] for v in video_info_list)
         
         print(f"  Total Videos:        {len(video_info_list)}")
         print(f"  Total Duration:      {str(timedelta(seconds=int(total_duration)))} ({total_duration:.2f}s)")
@@ -181,8 +321,8 @@ def analyze_videos():
             print(f"    • {res}: {count} video(s)")
         
         # Find highest/lowest quality
-        highest_res = max(video_info_list, key=lambda v: v['info']['width'] * v['info']['height'])
-        lowest_res = min(video_info_list, key=lambda v: v['info']['width'] * v['info']['height'])
+        highest_res = video_info_list[int(stats['pixels'].argmax())]
+        lowest_res = video_info_list[int(stats['pixels'].argmin())]
         
         print(f"\n  Highest Quality:     {highest_res['name']} ({highest_res['info']['resolution']})")
         print(f"  Lowest Quality:      {lowest_res['name']} ({lowest_res['info']['resolution']})")
@@ -193,19 +333,22 @@ def analyze_videos():
         
         if export == 'y':
             csv_path = base_dir / 'video_quality_report.csv'
-            with open(csv_path, 'w', encoding='utf-8') as f:
+            with open(csv_path, 'w', encoding='utf-8', newline='', buffering=1 << 20) as f:
+                writer = csv.writer(f, lineterminator='\n')
                 # Header
-                f.write("Filename,Resolution,Width,Height,Quality,FPS,Duration,Frame Count,")
-                f.write("Codec,File Size (MB),File Size (GB),Bitrate (Mbps)\n")
+                writer.writerow([
+                    'Filename', 'Resolution', 'Width', 'Height', 'Quality', 'FPS', 'Duration',
+                    'Frame Count', 'Codec', 'File Size (MB)', 'File Size (GB)', 'Bitrate (Mbps)'
+                ])
                 
                 # Data
-                for v in video_info_list:
-                    info = v['info']
-                    f.write(f"{v['name']},")
-                    f.write(f"{info['resolution']},{info['width']},{info['height']},")
-                    f.write(f"{v['quality']},{info['fps']},{info['duration']},{info['frame_count']},")
-                    f.write(f"{info['codec']},{info['file_size_mb']},{info['file_size_gb']},")
-                    f.write(f"{info['bitrate_mbps']}\n")
+                writer.writerows(
+                    [v['name'], v['info']['resolution'], v['info']['width'], v['info']['height'],
+                     v['quality'], v['info']['fps'], v['info']['duration'], v['info']['frame_count'],
+                     v['info']['codec'], v['info']['file_size_mb'], v['info']['file_size_gb'],
+                     v['info']['bitrate_mbps']]
+                    for v in video_info_list
+                )
             
             print(f"✅ Report saved to: {csv_path}")
     
@@ -10,8 +10,6 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.utils import load_config, setup_logging
-from src.frame_extractor import FrameExtractor
-from src.quality_filter import QualityFilter
 
 
 def example_usage():
@@ -33,8 +31,11 @@ def example_usage():
     
     # Initialize components
     print("3. Initializing components...")
+    # Imported here so the banner and config steps don't wait on OpenCV/NumPy
+    from src.frame_extractor import FrameExtractor
+    from src.quality_filter import QualityFilter
     extractor = FrameExtractor(config)
-    quality_filter = QualityFilter(config)
+    quality_filter = QualityFilter(config, upstream_frame_interval=extractor.determine_frame_interval(0))
     print(f"   ✓ Frame Extractor ready")
     print(f"   ✓ Quality Filter ready\n")
     
@@ -95,7 +95,10 @@ def run_frame_extraction(config, video_dir, output_dir, recursive=True):
     logger.info("="*60)
     
     extractor = FrameExtractor(config)
-    results = extractor.extract_frames_from_videos(video_dir, output_dir, recursive=recursive)
+    try:
+        results = extractor.extract_frames_from_videos(video_dir, output_dir, recursive=recursive)
+    finally:
+        extractor.close()
     
     return results
 
@@ -8,15 +8,34 @@ Usage:
 """
 
 import os
+import re
 import sys
+import json
+import hashlib
+import functools
 import subprocess
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Tuple, Dict
+from typing import Callable, List, Optional, Tuple, Dict
 
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv')
+
+# Extracted frame folders are named "<video>_clipNN__skipN" (or "<video>__skipN" for untrimmed videos)
+FRAME_FOLDER_SUFFIX = re.compile(r'(?:_clip\d+)?__skip\d+$')
+
+# Per-folder marker written when a stage finishes a folder (used by --resume)
+STAGE_MARKER = '.stage{}_done'
+
+# Videos copied concurrently by copy_untrimmed_videos
+COPY_WORKERS = 8
+
+# Default number of concurrent trim jobs (each one drives its own ffmpeg)
+DEFAULT_JOBS = max(1, (os.cpu_count() or 2) // 2)
+
 
 def print_header(text: str):
     """Print formatted header"""
@@ -25,18 +44,20 @@ def print_header(text: str):
     print("="*70 + "\n")
 
 
-def list_source_videos(source_dir: str = "data/source_videos") -> List[Path]:
-    """List all video files in source directory"""
-    if not os.path.exists(source_dir):
-        return []
-    
-    video_extensions = ['.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv']
-    videos = []
-    for ext in video_extensions:
-        videos.extend(Path(source_dir).glob(f'*{ext}'))
-        videos.extend(Path(source_dir).glob(f'*{ext.upper()}'))
+@functools.lru_cache(maxsize=8)
+def list_source_videos(source_dir: str = "data/source_videos") -> Tuple[Path, ...]:
+    """List all video files in source directory (memoized for the run)"""
+    # One directory pass with a case-insensitive suffix test instead of a glob per extension/case.
+    # is_file() is answered from the dirent type, and callers only use the names (stem/name),
+    # so listing the source videos costs no per-file stat at all
+    try:
+        with os.scandir(source_dir) as entries:
+            videos = [Path(entry.path) for entry in entries
+                      if entry.name.lower().endswith(VIDEO_EXTENSIONS) and entry.is_file()]
+    except FileNotFoundError:
+        return ()
     
-    return sorted(set(videos), key=lambda p: p.name.lower())
+    return tuple(sorted(videos, key=lambda p: p.name.lower()))
 
 
 def get_time_ranges_interactive() -> List[str]:
@@ -59,26 +80,208 @@ def get_time_ranges_interactive() -> List[str]:
     return ranges if ranges else None
 
 
-def run_command(cmd: List[str], description: str) -> bool:
-    """Run a command and return success status"""
+def list_subdirs(directory) -> List[Path]:
+    """Subdirectories of a directory from one scandir pass (is_dir() is answered
+    from the cached dirent type, so there is no extra stat per entry)"""
+    with os.scandir(directory) as entries:
+        return [Path(entry.path) for entry in entries if entry.is_dir(follow_symlinks=False)]
+
+
+def _folder_fingerprint(folder) -> Optional[str]:
+    """File count and newest mtime of every file under a folder.
+    
+    Walks subfolders too, so a clip overwritten in place is noticed when a
+    whole tree (e.g. data/all_video_frames) is fingerprinted. Directory mtimes
+    and dot-files are ignored, so writing stage markers doesn't invalidate it.
+    Returns None if the folder can't be read (e.g. it was deleted), which no
+    marker matches.
+    """
+    if not os.path.isdir(folder):
+        return None
+    
+    def _raise(error):
+        raise error
+    
+    count = 0
+    newest = 0
+    try:
+        for root, dirs, files in os.walk(folder, onerror=_raise):
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            for name in files:
+                if not name.startswith('.'):
+                    count += 1
+                    newest = max(newest, os.stat(os.path.join(root, name)).st_mtime_ns)
+    except OSError:
+        return None
+    return f"{count}:{newest}"
+
+
+def _file_sha256(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def read_stage_marker(folder, stage: int, state: Dict) -> Dict:
+    """Return a folder's marker for a stage if it was written with the same state, else None"""
+    try:
+        with open(os.path.join(folder, STAGE_MARKER.format(stage)), 'r') as f:
+            marker = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if all(marker.get(key) == value for key, value in state.items()):
+        return marker
+    return None
+
+
+def write_stage_marker(folder, stage: int, state: Dict) -> None:
+    """Record that a stage finished a folder with the given state"""
+    try:
+        with open(os.path.join(folder, STAGE_MARKER.format(stage)), 'w') as f:
+            json.dump(state, f)
+    except OSError as e:
+        logger.warning(f"Could not write stage {stage} marker in {folder}: {e}")
+
+
+def _spawnable(cmd: List[str]) -> List[str]:
+    """Resolve the program to an absolute path so subprocess can start it with
+    os.posix_spawn (together with close_fds=False) instead of fork+exec,
+    which avoids copying the parent's page tables once models are loaded.
+    
+    close_fds=False is safe here: Python creates its own descriptors
+    non-inheritable (PEP 446), so nothing leaks into the child.
+    """
+    import shutil
+    
+    program = shutil.which(cmd[0]) if not os.path.dirname(cmd[0]) else None
+    return [program or cmd[0]] + list(cmd[1:])
+
+
+# Only the tail of a failed command's output is logged
+OUTPUT_TAIL_CHARS = 4096
+
+
+def run_command(cmd: List[str], description: str, capture: bool = True) -> bool:
+    """Run a command and return success status
+    
+    Args:
+        capture: Buffer the command's output instead of streaming it to the
+            terminal; it is logged at DEBUG on success and its tail at ERROR
+            on failure
+    """
     logger.info(f"Running: {description}")
     logger.info(f"Command: {' '.join(cmd)}")
     
     try:
-        result = subprocess.run(cmd, check=True, capture_output=False)
-        logger.info(f"✓ {description} completed successfully")
-        return True
-    except subprocess.CalledProcessError as e:
-        logger.error(f"✗ {description} failed with exit code {e.returncode}")
+        result = subprocess.run(_spawnable(cmd), capture_output=capture, text=capture,
+                                errors='replace' if capture else None, close_fds=False)
+    except Exception as e:
+        logger.error(f"✗ Error running {description}: {e}")
+        return False
+    
+    if result.returncode != 0:
+        if capture and (result.stdout or result.stderr):
+            output = (result.stdout or '') + (result.stderr or '')
+            logger.error(f"Output of {description}:\n{output[-OUTPUT_TAIL_CHARS:].rstrip()}")
+        logger.error(f"✗ {description} failed with exit code {result.returncode}")
+        return False
+    
+    if capture and result.stdout:
+        logger.debug(f"Output of {description}:\n{result.stdout.rstrip()}")
+    logger.info(f"✓ {description} completed successfully")
+    return True
+
+
+def run_script(script: str, args: List[str], description: str) -> bool:
+    """Run a Python script as __main__ inside this interpreter and return success status
+    
+    Avoids a fresh interpreter start (and re-importing its dependencies) for
+    scripts that run once per pipeline; the script still gets its own globals.
+    """
+    import runpy
+    
+    logger.info(f"Running: {description}")
+    logger.info(f"Command: {' '.join([script] + args)}")
+    
+    saved_argv = sys.argv
+    sys.argv = [script] + args
+    try:
+        runpy.run_path(script, run_name='__main__')
+        code = 0
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception as e:
+        logger.error(f"✗ Error running {description}: {e}")
+        return False
+    finally:
+        sys.argv = saved_argv
+    
+    if code != 0:
+        logger.error(f"✗ {description} failed with exit code {code}")
         return False
+    logger.info(f"✓ {description} completed successfully")
+    return True
+
+
+def _trim_state(video_path: str, ranges: List[str]) -> Dict:
+    return {'ranges': list(ranges), 'src_mtime': os.stat(video_path).st_mtime_ns}
+
+
+def _trim_video(video_path: str, ranges: List[str]) -> bool:
+    """Trim one video in this thread (the thread just waits on ffmpeg)"""
+    from trim_videos import trim_one_video
+    
+    description = f"Trim {Path(video_path).name}"
+    logger.info(f"Running: {description}")
+    try:
+        # One ffmpeg per job, so at most `jobs` run at once
+        clips = trim_one_video(video_path, ranges, "data/all_video_frames", workers=1)
     except Exception as e:
         logger.error(f"✗ Error running {description}: {e}")
         return False
+    
+    if not clips:
+        logger.error(f"✗ {description} produced no clips")
+        return False
+    if len(clips) < len(ranges):
+        # Keep the clips that were cut, but leave no marker so --resume retries the video
+        logger.warning(f"⚠ {description} created {len(clips)}/{len(ranges)} clips")
+        return True
+    write_stage_marker(f"data/all_video_frames/{Path(video_path).stem}", 1, _trim_state(video_path, ranges))
+    logger.info(f"✓ {description} completed successfully")
+    return True
+
+
+def _trim_videos(videos_to_trim: Dict[str, List[str]], jobs: int, resume: bool = False) -> List[bool]:
+    """Trim the videos in-process, at most `jobs` at a time"""
+    results = {}
+    pending = []
+    for video_path, ranges in videos_to_trim.items():
+        if resume and read_stage_marker(f"data/all_video_frames/{Path(video_path).stem}", 1,
+                                        _trim_state(video_path, ranges)):
+            logger.info(f"\n⏭️  Already trimmed with the same ranges: {Path(video_path).name}")
+            results[video_path] = True
+            continue
+        
+        logger.info(f"\nTrimming: {Path(video_path).name}")
+        logger.info(f"Ranges: {ranges}")
+        pending.append(video_path)
+    
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for video_path, ok in zip(pending, executor.map(lambda v: _trim_video(v, videos_to_trim[v]), pending)):
+            results[video_path] = ok
+    
+    return [results[video_path] for video_path in videos_to_trim]
 
 
-def stage1_trim_videos(videos_to_trim: Dict[str, List[str]]) -> Tuple[bool, List[str]]:
+def stage1_trim_videos(videos_to_trim: Dict[str, List[str]], jobs: int = DEFAULT_JOBS,
+                       resume: bool = False) -> Tuple[bool, List[str]]:
     """Stage 1: Trim videos to create clips
     
+    Args:
+        videos_to_trim: Mapping of video path -> list of time ranges
+        jobs: Number of videos trimmed concurrently
+        resume: Skip videos already trimmed with the same ranges from an unchanged source
+    
     Returns:
         Tuple of (success: bool, trimmed_video_folders: List[str])
     """
@@ -88,34 +291,34 @@ def stage1_trim_videos(videos_to_trim: Dict[str, List[str]]) -> Tuple[bool, List
         logger.warning("No videos selected for trimming. Skipping Stage 1.")
         return True, []
     
-    success_count = 0
-    trimmed_folders = []
+    # Each video is trimmed by an independent ffmpeg process, so run them concurrently
+    jobs = max(1, min(jobs, len(videos_to_trim)))
+    results = _trim_videos(videos_to_trim, jobs, resume=resume)
     
-    for video_path, ranges in videos_to_trim.items():
-        logger.info(f"\nTrimming: {Path(video_path).name}")
-        logger.info(f"Ranges: {ranges}")
-        
-        cmd = [
-            'python', 'trim_videos.py',
-            '--input', video_path,
-            '--ranges'
-        ] + ranges
-        
-        if run_command(cmd, f"Trim {Path(video_path).name}"):
-            success_count += 1
-            # Track the folder name for this video
-            video_name = Path(video_path).stem
-            trimmed_folders.append(f"data/all_video_frames/{video_name}")
+    # Track the folder names in the original video order
+    trimmed_folders = [f"data/all_video_frames/{Path(video_path).stem}"
+                       for video_path, ok in zip(videos_to_trim, results) if ok]
+    success_count = len(trimmed_folders)
+    
+    # Trimming created new folders in all_video_frames
+    get_already_trimmed_videos.cache_clear()
     
     logger.info(f"\n✓ Stage 1 Complete: {success_count}/{len(videos_to_trim)} videos trimmed successfully")
     return success_count > 0, trimmed_folders
 
 
-def stage2_extract_frames(only_from_folders: List[str] = None) -> bool:
+def stage2_extract_frames(only_from_folders: List[str] = None, legacy_subprocess: bool = False,
+                          on_folder_extracted: Callable[[List[str]], None] = None,
+                          resume: bool = False) -> bool:
     """Stage 2: Extract frames from clips
     
     Args:
         only_from_folders: If provided, only process videos in these specific folders
+        legacy_subprocess: Run main.py once per folder instead of extracting in-process
+        on_folder_extracted: Called with the frame output directories of each folder
+            as soon as it is extracted (in-process mode only)
+        resume: Skip folders already extracted with the same config from unchanged clips
+            (in-process mode only)
     """
     print_header("STAGE 2: FRAME EXTRACTION")
     
@@ -125,6 +328,73 @@ def stage2_extract_frames(only_from_folders: List[str] = None) -> bool:
         logger.error(f"Clips directory not found: {clips_dir}")
         return False
     
+    if legacy_subprocess:
+        return _stage2_extract_frames_subprocess(only_from_folders)
+    
+    # Load the config and build the extractor once, then reuse them for every folder
+    # instead of paying an interpreter start and module imports per folder
+    try:
+        from src.utils import load_config
+        from src.frame_extractor import FrameExtractor
+        config = load_config('config/config.yaml')
+        config_sha = _file_sha256('config/config.yaml')
+        extractor = FrameExtractor(config)
+    except Exception as e:
+        logger.error(f"✗ Failed to initialize frame extraction: {e}")
+        return False
+    
+    extracted_dir = "data/extracted_frames"
+    os.makedirs(extracted_dir, exist_ok=True)
+    
+    if not only_from_folders:
+        # Process all videos (legacy behavior)
+        logger.info("Processing all videos in all_video_frames/")
+        only_from_folders = [clips_dir]
+    else:
+        logger.info(f"Processing only newly trimmed videos ({len(only_from_folders)} folder(s))")
+    
+    success_count = 0
+    try:
+        for folder in only_from_folders:
+            if not os.path.exists(folder):
+                logger.warning(f"Folder not found, skipping: {folder}")
+                continue
+            
+            state = {'config_sha': config_sha, 'src_state': _folder_fingerprint(folder)}
+            marker = read_stage_marker(folder, 2, state) if resume else None
+            if marker:
+                logger.info(f"\n⏭️  Frames already extracted from: {Path(folder).name}")
+                success_count += 1
+                if on_folder_extracted:
+                    on_folder_extracted(marker.get('output_dirs', []))
+                continue
+            
+            logger.info(f"\nExtracting frames from: {Path(folder).name}")
+            try:
+                results = extractor.extract_frames_from_videos(folder, extracted_dir, recursive=True)
+            except Exception as e:
+                logger.error(f"✗ Extract frames from {Path(folder).name} failed: {e}")
+                continue
+            
+            if results:
+                logger.info(f"✓ Extract frames from {Path(folder).name} completed successfully")
+                success_count += 1
+                output_dirs = list(dict.fromkeys(r['output_dir'] for r in results if r.get('success')))
+                if all(r.get('success') for r in results):
+                    write_stage_marker(folder, 2, dict(state, output_dirs=output_dirs))
+                if on_folder_extracted:
+                    on_folder_extracted(output_dirs)
+            else:
+                logger.error(f"✗ No videos found to extract in {Path(folder).name}")
+    finally:
+        extractor.close()
+    
+    logger.info(f"\n✓ Extracted frames from {success_count}/{len(only_from_folders)} folder(s)")
+    return success_count > 0
+
+
+def _stage2_extract_frames_subprocess(only_from_folders: List[str] = None) -> bool:
+    """Stage 2 via one main.py process per folder (pre in-process behavior)"""
     # If specific folders provided, process only those
     if only_from_folders:
         logger.info(f"Processing only newly trimmed videos ({len(only_from_folders)} folder(s))")
@@ -150,13 +420,16 @@ def stage2_extract_frames(only_from_folders: List[str] = None) -> bool:
         return run_command(cmd, "Extract frames from clips")
 
 
-def stage3_ball_detection(only_from_folders: List[str] = None, batch_size: int = 32, device: int = 0) -> bool:
+def stage3_ball_detection(only_from_folders: List[str] = None, batch_size: int = 32, device: int = 0,
+                          resume: bool = False, compile_model: bool = False) -> bool:
     """Stage 3: Run ball detection on extracted frames
     
     Args:
         only_from_folders: If provided, only process frames from these specific video folders
         batch_size: Batch size for inference
         device: GPU device (0) or 'cpu'
+        resume: Skip frame folders that ball detection already finished
+        compile_model: Fuse and torch.compile the detector before inference
     """
     print_header("STAGE 3: BALL DETECTION")
     
@@ -169,13 +442,14 @@ def stage3_ball_detection(only_from_folders: List[str] = None, batch_size: int =
     if only_from_folders:
         # Convert video folder names to extracted frame folder names
         # e.g., "data/all_video_frames/game1" -> "data/extracted_frames/game1_clip01__skip30"
+        # Group every extracted folder by its source video name in a single directory pass
+        folders_by_video = {}
+        for f in list_subdirs(extracted_dir):
+            folders_by_video.setdefault(FRAME_FOLDER_SUFFIX.sub('', f.name), []).append(f)
+        
         frame_folders = []
         for video_folder in only_from_folders:
-            video_name = Path(video_folder).name
-            # Find all extracted frame folders that start with this video name
-            matching = [f for f in extracted_dir.iterdir() 
-                       if f.is_dir() and f.name.startswith(video_name)]
-            frame_folders.extend(matching)
+            frame_folders.extend(folders_by_video.get(Path(video_folder).name, []))
         
         if not frame_folders:
             logger.warning(f"No extracted frame folders found for the trimmed videos")
@@ -184,35 +458,186 @@ def stage3_ball_detection(only_from_folders: List[str] = None, batch_size: int =
         logger.info(f"Processing only newly extracted frames ({len(frame_folders)} folder(s))")
     else:
         # Process all frame folders
-        frame_folders = [f for f in extracted_dir.iterdir() if f.is_dir()]
+        frame_folders = list_subdirs(extracted_dir)
         logger.info(f"Processing all frame folders ({len(frame_folders)} folder(s))")
     
     if not frame_folders:
         logger.warning("No frame folders found for ball detection")
         return False
     
-    success_count = 0
-    for folder in frame_folders:
-        logger.info(f"\nProcessing: {folder.name}")
+    # All folders go through one global batcher so small folders don't leave underfilled batches;
+    # the model is only loaded if some folder still needs detection
+    success_count = detect_ball_in_folders(frame_folders, None, batch_size, device, resume=resume,
+                                           compile_model=compile_model)
+    
+    logger.info(f"\n✓ Stage 3 Complete: {success_count}/{len(frame_folders)} folders processed")
+    return success_count > 0
+
+
+def load_ball_detector(device, compile_model: bool = False, batch_size: int = None):
+    """Load the ball detection model once so every folder is batched through it
+    in-process, instead of spawning one interpreter (and one model load) per folder.
+    
+    Returns:
+        The loaded model, or None if it could not be loaded
+    """
+    try:
+        from seperation.separate_images_by_ball import DEFAULT_WEIGHTS, load_model
+        # A TensorRT engine exported for this batch size is picked up automatically
+        return load_model(DEFAULT_WEIGHTS, device, compile_model=compile_model, batch_size=batch_size)
+    except Exception as e:
+        logger.error(f"✗ Failed to load ball detection model: {e}")
+        return None
+
+
+def detect_ball_in_folders(folders: List[Path], model, batch_size: int, device, resume: bool = False,
+                           compile_model: bool = False) -> int:
+    """Separate frame folders into Ball_detected / No_ball_detected, batching the
+    images of all folders together
+    
+    Images already classified were moved out of each folder's top level, so only
+    new frames are found again. With model=None the detector is loaded on demand,
+    i.e. not at all when resume finds every folder done.
+    
+    Returns:
+        Number of folders processed (or skipped as already done) successfully
+    """
+    from seperation.separate_images_by_ball import DEFAULT_WEIGHTS, DEFAULT_CONF, run_detection
+    
+    pending = []
+    missing = 0
+    for folder in folders:
+        state = {'weights': DEFAULT_WEIGHTS, 'conf': DEFAULT_CONF, 'src_state': _folder_fingerprint(folder)}
+        if state['src_state'] is None:
+            logger.warning(f"Folder not readable, skipping ball detection: {folder}")
+            missing += 1
+        elif resume and read_stage_marker(folder, 3, state):
+            logger.info(f"\n⏭️  Ball detection already done: {folder.name}")
+        else:
+            pending.append((folder, state))
+    
+    if not pending:
+        return len(folders) - missing
+    
+    if model is None:
+        model = load_ball_detector(device, compile_model=compile_model, batch_size=batch_size)
+        if model is None:
+            return len(folders) - missing - len(pending)
+    
+    names = ', '.join(folder.name for folder, _ in pending)
+    logger.info(f"\nProcessing: {names}")
+    try:
+        run_detection([folder for folder, _ in pending], model, batch_size=batch_size, device=device)
+    except Exception as e:
+        logger.error(f"✗ Ball detection for {names} failed: {e}")
+        return len(folders) - missing - len(pending)
+    
+    for folder, state in pending:
+        # Record the folder state after the moves so an untouched folder is skipped next time
+        state['src_state'] = _folder_fingerprint(folder)
+        if state['src_state'] is not None:
+            write_stage_marker(folder, 3, state)
+        logger.info(f"✓ Ball detection for {folder.name} completed successfully")
+    return len(folders) - missing
+
+
+def stage2_3_extract_and_detect(only_from_folders: List[str] = None, batch_size: int = 32, device: int = 0,
+                                resume: bool = False, compile_model: bool = False) -> bool:
+    """Stages 2 and 3 overlapped: each folder's frames are handed to ball detection
+    as soon as they are extracted, so GPU inference on one folder runs while the
+    next folder is being decoded.
+    
+    Args:
+        only_from_folders: If provided, only process videos in these specific folders
+        batch_size: Batch size for inference
+        device: GPU device (0) or 'cpu'
+        resume: Skip folders whose extraction / detection already finished
+        compile_model: Fuse and torch.compile the detector before inference
+    """
+    model = load_ball_detector(device, compile_model=compile_model, batch_size=batch_size)
+    if model is None:
+        return False
+    
+    # A single worker keeps detection serialized on the one model instance
+    with ThreadPoolExecutor(max_workers=1) as detector:
+        futures = []
+        folder_count = 0
+        
+        def queue_detection(output_dirs: List[str]):
+            nonlocal folder_count
+            folder_count += len(output_dirs)
+            # All clips of one video are batched together
+            futures.append(detector.submit(detect_ball_in_folders, [Path(d) for d in output_dirs], model,
+                                           batch_size, device, resume=resume))
         
-        cmd = [
-            'python', 'seperation/separate_images_by_ball.py',
-            '--input', str(folder),
-            '--batch-size', str(batch_size),
-            '--device', str(device)
-        ]
+        if not stage2_extract_frames(only_from_folders, on_folder_extracted=queue_detection, resume=resume):
+            return False
         
-        if run_command(cmd, f"Ball detection for {folder.name}"):
-            success_count += 1
+        print_header("STAGE 3: BALL DETECTION")
+        logger.info(f"Waiting for ball detection on {folder_count} folder(s)")
+        success_count = sum(future.result() for future in as_completed(futures))
     
-    logger.info(f"\n✓ Stage 3 Complete: {success_count}/{len(frame_folders)} folders processed")
+    logger.info(f"\n✓ Stage 3 Complete: {success_count}/{folder_count} folders processed")
     return success_count > 0
 
 
-def copy_untrimmed_videos(source_videos: List[Path], videos_to_trim: Dict[str, List[str]]) -> bool:
-    """Copy videos that weren't trimmed to all_video_frames/videoname/"""
+def copy_video_file(src: Path, dst: Path, link: bool = False) -> None:
+    """Copy a video using the cheapest mechanism available.
+    
+    Tries, in order: a hard link (only with link=True, since the copy then
+    shares its inode with the source), a symlink when the hard link fails
+    because the source is on another filesystem, an in-kernel
+    os.copy_file_range copy (reflinked on filesystems that support it), and
+    finally shutil.copy2.
+    """
     import shutil
     
+    # dst may be a hard link or symlink to src left by an earlier --link run;
+    # writing through it would truncate the source video
+    if os.path.lexists(dst):
+        if link and os.path.exists(dst) and os.path.samefile(src, dst):
+            return
+        dst.unlink()
+    
+    if link:
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            try:
+                # Hard links can't cross filesystems; the videos are only read
+                # downstream, so pointing at the source is just as good
+                os.symlink(src.resolve(), dst)
+                return
+            except OSError:
+                pass
+    
+    if hasattr(os, 'copy_file_range'):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                shutil.copystat(src, dst)
+                return
+        except OSError:
+            pass
+    
+    shutil.copy2(str(src), str(dst))
+
+
+def copy_untrimmed_videos(source_videos: List[Path], videos_to_trim: Dict[str, List[str]], link: bool = False) -> bool:
+    """Copy videos that weren't trimmed to all_video_frames/videoname/
+    
+    Args:
+        link: Link the videos instead of copying them (hard link on the same
+            filesystem, symlink otherwise)
+    """
+    
     # Get list of videos that already have folders (were trimmed previously)
     already_trimmed = get_already_trimmed_videos()
     
@@ -241,32 +666,61 @@ def copy_untrimmed_videos(source_videos: List[Path], videos_to_trim: Dict[str, L
     all_video_frames_dir = Path("data/all_video_frames")
     all_video_frames_dir.mkdir(parents=True, exist_ok=True)
     
-    for video in untrimmed_videos:
-        video_name = video.stem  # Get filename without extension
-        dest_folder = all_video_frames_dir / video_name
-        dest_folder.mkdir(parents=True, exist_ok=True)
-        
-        dest_file = dest_folder / video.name
+    # Copies are I/O bound and independent, so overlap them across videos
+    with ThreadPoolExecutor(max_workers=min(COPY_WORKERS, len(untrimmed_videos))) as executor:
+        copies = []
+        for video in untrimmed_videos:
+            video_name = video.stem  # Get filename without extension
+            dest_folder = all_video_frames_dir / video_name
+            dest_folder.mkdir(parents=True, exist_ok=True)
+            
+            dest_file = dest_folder / video.name
+            
+            logger.info(f"  {'Linking' if link else 'Copying'} {video.name} -> {dest_folder.name}/{video.name}")
+            copies.append(executor.submit(copy_video_file, video, dest_file, link=link))
         
-        logger.info(f"  Copying {video.name} -> {dest_folder.name}/{video.name}")
-        shutil.copy2(str(video), str(dest_file))
+        for copy in copies:
+            copy.result()  # re-raise any copy error
     
+    get_already_trimmed_videos.cache_clear()
     logger.info(f"✓ Copied {len(untrimmed_videos)} untrimmed video(s)")
     return True
 
 
-def get_already_trimmed_videos() -> set:
-    """Get list of videos that were already trimmed (have folders in all_video_frames)"""
-    all_video_frames_dir = Path("data/all_video_frames")
-    if not all_video_frames_dir.exists():
-        return set()
+@functools.lru_cache(maxsize=8)
+def get_already_trimmed_videos() -> frozenset:
+    """Get list of videos that were already trimmed (have folders in all_video_frames)
     
-    # Get all folder names in all_video_frames
-    trimmed_folders = {folder.name for folder in all_video_frames_dir.iterdir() if folder.is_dir()}
-    return trimmed_folders
+    Memoized for the run; call get_already_trimmed_videos.cache_clear() after
+    creating folders in all_video_frames.
+    """
+    # Get all folder names in all_video_frames, streamed from one scandir pass
+    try:
+        with os.scandir("data/all_video_frames") as entries:
+            return frozenset(entry.name for entry in entries if entry.is_dir())
+    except FileNotFoundError:
+        return frozenset()
+
+
+def load_ranges_file(ranges_file: str) -> Dict[str, List[str]]:
+    """Load trim ranges for many videos at once
+    
+    Expected format (keys are video file names, with or without extension):
+    ```yaml
+    courtMumbai_vid12.mp4:
+      - "0:00-15:00"
+      - "25:00-35:00"
+    courtDelhi_vid07:
+      - "2:00-18:00"
+    ```
+    """
+    from src.utils import load_config
+    ranges = load_config(ranges_file) or {}
+    return {str(name): [str(r) for r in video_ranges] for name, video_ranges in ranges.items() if video_ranges}
 
 
-def interactive_mode():
+def interactive_mode(jobs: int = DEFAULT_JOBS, legacy_subprocess: bool = False, link: bool = False,
+                     ranges_file: str = None, resume: bool = False, compile_model: bool = False):
     """Run pipeline in interactive mode"""
     print_header("BASKETBALL PIPELINE - INTERACTIVE MODE")
     
@@ -309,30 +763,44 @@ def interactive_mode():
     # Ask which videos to trim
     videos_to_trim = {}
     
-    for video in untrimmed_videos:
-        video_stem = video.stem
-        is_already_trimmed = video_stem in already_trimmed
-        
-        print(f"\n📹 Video: {video.name}")
-        if is_already_trimmed:
-            print(f"   ⚠️  Already trimmed (folder exists: data/all_video_frames/{video_stem}/)")
-            choice = input("   Re-trim this video? (y/n): ").strip().lower()
-        else:
-            choice = input("   Trim this video? (y/n): ").strip().lower()
-        
-        if choice == 'y':
-            ranges = get_time_ranges_interactive()
+    if ranges_file:
+        # Take every video's ranges from the file instead of prompting per video
+        file_ranges = load_ranges_file(ranges_file)
+        logger.info(f"Loaded ranges for {len(file_ranges)} video(s) from {ranges_file}")
+        for video in untrimmed_videos:
+            ranges = file_ranges.get(video.name) or file_ranges.get(video.stem)
             if ranges:
                 videos_to_trim[str(video)] = ranges
                 logger.info(f"✓ Added {video.name} with {len(ranges)} range(s)")
-            else:
-                logger.info(f"  Skipped {video.name} (no ranges provided)")
-        else:
-            if not is_already_trimmed:
+            elif video.stem not in already_trimmed:
                 logger.info(f"  Will use full video for {video.name}")
             else:
                 logger.info(f"  Skipping {video.name} (already trimmed)")
-    
+    else:
+        for video in untrimmed_videos:
+            video_stem = video.stem
+            is_already_trimmed = video_stem in already_trimmed
+            
+            print(f"\n📹 Video: {video.name}")
+            if is_already_trimmed:
+                print(f"   ⚠️  Already trimmed (folder exists: data/all_video_frames/{video_stem}/)")
+                choice = input("   Re-trim this video? (y/n): ").strip().lower()
+            else:
+                choice = input("   Trim this video? (y/n): ").strip().lower()
+            
+            if choice == 'y':
+                ranges = get_time_ranges_interactive()
+                if ranges:
+                    videos_to_trim[str(video)] = ranges
+                    logger.info(f"✓ Added {video.name} with {len(ranges)} range(s)")
+                else:
+                    logger.info(f"  Skipped {video.name} (no ranges provided)")
+            else:
+                if not is_already_trimmed:
+                    logger.info(f"  Will use full video for {video.name}")
+                else:
+                    logger.info(f"  Skipping {video.name} (already trimmed)")
+        
     if len(untrimmed_videos) == 0 and len(videos_to_trim) == 0:
         logger.warning("\nNo videos to process.")
         return 0
@@ -373,14 +841,14 @@ def interactive_mode():
     
     # Stage 0: Copy untrimmed videos to all_video_frames
     logger.info("\n=== Organizing Videos ===")
-    if not copy_untrimmed_videos(source_videos, videos_to_trim):
+    if not copy_untrimmed_videos(source_videos, videos_to_trim, link=link):
         logger.error("Failed to copy untrimmed videos")
         return 1
     
     # Stage 1: Trim videos (returns success status and list of trimmed folders)
     trimmed_folders = []
     if videos_to_trim:
-        success, trimmed_folders = stage1_trim_videos(videos_to_trim)
+        success, trimmed_folders = stage1_trim_videos(videos_to_trim, jobs=jobs, resume=resume)
         if not success:
             logger.error("Stage 1 failed. Stopping pipeline.")
             return 1
@@ -397,7 +865,14 @@ def interactive_mode():
         logger.info(f"\n=== Processing {len(folders_to_process)} video folder(s) ===")
         logger.info(f"  - Trimmed: {len(trimmed_folders)}")
         logger.info(f"  - Copied (full videos): {len(copied_folders)}")
-        if not stage2_extract_frames(only_from_folders=folders_to_process):
+        if not legacy_subprocess:
+            # Stages 2+3: ball detection overlaps with extraction of the next folder
+            if not stage2_3_extract_and_detect(only_from_folders=folders_to_process,
+                                               batch_size=batch_size, device=device, resume=resume,
+                                               compile_model=compile_model):
+                logger.error("Stage 2/3 failed. Stopping pipeline.")
+                return 1
+        elif not stage2_extract_frames(only_from_folders=folders_to_process, legacy_subprocess=legacy_subprocess):
             logger.error("Stage 2 failed. Stopping pipeline.")
             return 1
     else:
@@ -406,8 +881,9 @@ def interactive_mode():
         return 0
     
     # Stage 3: Ball detection (only on newly extracted frames)
-    if not stage3_ball_detection(only_from_folders=folders_to_process if folders_to_process else None, 
-                                  batch_size=batch_size, device=device):
+    if legacy_subprocess and not stage3_ball_detection(only_from_folders=folders_to_process if folders_to_process else None, 
+                                                       batch_size=batch_size, device=device, resume=resume,
+                                                       compile_model=compile_model):
         logger.error("Stage 3 failed. Stopping pipeline.")
         return 1
     
@@ -421,7 +897,7 @@ def interactive_mode():
     return 0
 
 
-def auto_mode():
+def auto_mode(legacy_subprocess: bool = False, resume: bool = False, compile_model: bool = False):
     """Run pipeline automatically using config file
     
     Note: Auto mode currently processes all videos. 
@@ -433,18 +909,26 @@ def auto_mode():
     logger.info("Note: Auto mode processes ALL videos in all_video_frames/")
     
     # Stage 1: Trim using config
-    cmd = ['python', 'trim_videos.py', '--config', 'config/trim_ranges.yaml']
-    if not run_command(cmd, "Trim videos from config"):
+    if not run_script('trim_videos.py', ['--config', 'config/trim_ranges.yaml'], "Trim videos from config"):
         logger.error("Stage 1 failed")
         return 1
     
+    if not legacy_subprocess:
+        # Stages 2+3: extract all videos, detecting on each folder as it finishes
+        if not stage2_3_extract_and_detect(batch_size=32, device=0, resume=resume, compile_model=compile_model):
+            logger.error("Stage 2/3 failed")
+            return 1
+        
+        print_header("✓ PIPELINE COMPLETED SUCCESSFULLY!")
+        return 0
+    
     # Stage 2: Extract frames (processes all videos in auto mode)
-    if not stage2_extract_frames():
+    if not stage2_extract_frames(legacy_subprocess=legacy_subprocess):
         logger.error("Stage 2 failed")
         return 1
     
     # Stage 3: Ball detection (processes all extracted frames in auto mode)
-    if not stage3_ball_detection(batch_size=32, device=0):
+    if not stage3_ball_detection(batch_size=32, device=0, resume=resume, compile_model=compile_model):
         logger.error("Stage 3 failed")
         return 1
     
@@ -473,6 +957,37 @@ def main():
         default='0',
         help='Device for ball detection (auto mode only, default: 0)'
     )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f'Number of videos to trim in parallel (default: {DEFAULT_JOBS})'
+    )
+    parser.add_argument(
+        '--legacy-subprocess',
+        action='store_true',
+        help='Extract frames by running main.py once per folder instead of in-process'
+    )
+    parser.add_argument(
+        '--ranges-file',
+        default=None,
+        help='YAML file mapping video names to trim ranges; skips the per-video prompts (interactive mode only)'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Skip folders a previous run already finished (tracked with per-folder .stageN_done markers)'
+    )
+    parser.add_argument(
+        '--compile',
+        action='store_true',
+        help='Fuse the ball detection model and run it through torch.compile (PyTorch >= 2.0)'
+    )
+    parser.add_argument(
+        '--link',
+        action='store_true',
+        help='Link untrimmed videos into all_video_frames/ instead of copying them (hard link, or symlink across filesystems)'
+    )
     
     args = parser.parse_args()
     
@@ -480,9 +995,10 @@ def main():
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
     
     if args.auto:
-        return auto_mode()
+        return auto_mode(legacy_subprocess=args.legacy_subprocess, resume=args.resume, compile_model=args.compile)
     else:
-        return interactive_mode()
+        return interactive_mode(jobs=args.jobs, legacy_subprocess=args.legacy_subprocess, link=args.link,
+                                ranges_file=args.ranges_file, resume=args.resume, compile_model=args.compile)
 
 
 if __name__ == '__main__':
@@ -13,9 +13,15 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import os
 import re
 from pathlib import Path
 
+# Pattern to match: video_name_frame_NNNNNN.ext or video_name_frame_NNNNNN_N.ext
+# We want to insert '_skipped_5' before '_frame_'
+# Handles both: aps_vs_agsv_frame_029161.jpg and aps_vs_agsv_frame_029161_1.jpg
+FRAME_NAME_PATTERN = re.compile(r'^(.+?)(_frame_\d+)((?:_\d+)?(?:\.\w+))$')
+
 
 def rename_with_skipped(folder: Path, dry_run: bool = False) -> tuple[int, int]:
 	"""Rename files in folder to add '_skipped_5' before frame number.
@@ -25,17 +31,16 @@ def rename_with_skipped(folder: Path, dry_run: bool = False) -> tuple[int, int]:
 	renamed = 0
 	skipped = 0
 	
-	# Pattern to match: video_name_frame_NNNNNN.ext or video_name_frame_NNNNNN_N.ext
-	# We want to insert '_skipped_5' before '_frame_'
-	# Handles both: aps_vs_agsv_frame_029161.jpg and aps_vs_agsv_frame_029161_1.jpg
-	pattern = re.compile(r'^(.+?)(_frame_\d+)((?:_\d+)?(?:\.\w+))$')
+	# scandir's is_file() comes from the directory entry itself, no stat per file;
+	# every name in the folder is kept so target collisions are a set lookup
+	with os.scandir(folder) as it:
+		entries = [(e.name, e.is_file(follow_symlinks=False)) for e in it]
+	existing = {name for name, _ in entries}
+	filenames = sorted(name for name, is_file in entries if is_file)
+	folder_str = str(folder)
 	
-	for file_path in sorted(folder.iterdir()):
-		if not file_path.is_file():
-			continue
-		
-		filename = file_path.name
-		match = pattern.match(filename)
+	for filename in filenames:
+		match = FRAME_NAME_PATTERN.match(filename)
 		
 		if not match:
 			print(f"SKIP (no match): {filename}")
@@ -53,9 +58,8 @@ def rename_with_skipped(folder: Path, dry_run: bool = False) -> tuple[int, int]:
 		frame_part = match.group(2)
 		suffix_and_ext = match.group(3)  # includes _1.jpg or just .jpg
 		new_name = f"{prefix}_skipped_5{frame_part}{suffix_and_ext}"
-		new_path = folder / new_name
 		
-		if new_path.exists():
+		if new_name in existing:
 			print(f"ERROR: Target already exists: {new_name}")
 			skipped += 1
 			continue
@@ -63,7 +67,9 @@ def rename_with_skipped(folder: Path, dry_run: bool = False) -> tuple[int, int]:
 		if dry_run:
 			print(f"DRY-RUN: {filename} -> {new_name}")
 		else:
-			file_path.rename(new_path)
+			os.rename(os.path.join(folder_str, filename), os.path.join(folder_str, new_name))
+			existing.discard(filename)
+			existing.add(new_name)
 			print(f"RENAMED: {filename} -> {new_name}")
 		
 		renamed += 1
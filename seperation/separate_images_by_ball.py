@@ -19,7 +19,8 @@ avoid overwriting files by appending a numeric suffix if needed.
 Performance options:
 - --batch-size N (default 16) batches multiple images per inference call.
 - --workers N (default 0) enables multiprocessing with N worker processes.
-	Each worker loads the model once and returns detection booleans; the parent
+	Each worker loads the model once, runs batched inference on --batch-size
+	images per task and returns detection booleans; the parent
 	process performs the actual file moves. Note: if using a single GPU, batching
 	(workers=0) is usually faster and more memory-efficient than multiprocessing.
 """
@@ -32,23 +33,56 @@ import shutil
 from pathlib import Path
 from typing import Iterable, List, Tuple
 import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor
+
+# Optional libjpeg-turbo decoder (pip install PyTurboJPEG); cv2 is used otherwise
+try:
+	from turbojpeg import TurboJPEG, TJPF_BGR
+	_TURBOJPEG = TurboJPEG()
+except Exception:
+	_TURBOJPEG = None
+
+
+IMAGE_SUFFIXES = frozenset({".jpg", ".jpeg", ".png", ".bmp", ".gif", ".tif", ".tiff"})
 
 
 def is_image_file(p: Path) -> bool:
-	return p.suffix.lower() in {".jpg", ".jpeg", ".png", ".bmp", ".gif", ".tif", ".tiff"}
+	return p.suffix.lower() in IMAGE_SUFFIXES
 
 
 def find_images(folder: Path) -> Iterable[Path]:
-	for p in sorted(folder.iterdir()):
-		if p.is_file() and is_image_file(p):
-			yield p
+	# scandir's is_file() comes from the directory entry itself, no stat per file
+	with os.scandir(folder) as it:
+		names = sorted(e.name for e in it
+					   if os.path.splitext(e.name)[1].lower() in IMAGE_SUFFIXES and e.is_file(follow_symlinks=False))
+	for name in names:
+		yield folder / name
+
+
+def _move_no_clobber(src: str, dst: str) -> bool:
+	"""Move src to dst unless dst exists; returns False if it does.
+
+	Same-filesystem moves are a hard link + unlink (metadata only, and the link
+	fails atomically if dst exists, so concurrent movers can't overwrite each
+	other). Cross-device moves fall back to shutil.move.
+	"""
+	try:
+		os.link(src, dst)
+	except FileExistsError:
+		return False
+	except OSError:
+		if os.path.exists(dst):
+			return False
+		shutil.move(src, dst)
+		return True
+	os.unlink(src)
+	return True
 
 
 def safe_move(src: Path, dst_dir: Path) -> Path:
 	dst_dir.mkdir(parents=True, exist_ok=True)
 	dst = dst_dir / src.name
-	if not dst.exists():
-		shutil.move(str(src), str(dst))
+	if _move_no_clobber(str(src), str(dst)):
 		return dst
 
 	# avoid overwrite: append _1, _2, ...
@@ -57,8 +91,7 @@ def safe_move(src: Path, dst_dir: Path) -> Path:
 	i = 1
 	while True:
 		candidate = dst_dir / f"{stem}_{i}{suffix}"
-		if not candidate.exists():
-			shutil.move(str(src), str(candidate))
+		if _move_no_clobber(str(src), str(candidate)):
 			return candidate
 		i += 1
 
@@ -70,34 +103,67 @@ def chunked(seq: List[Path], size: int) -> Iterable[List[Path]]:
 		yield seq[i:i + size]
 
 
-def _ball_detected_from_result(model, res) -> bool:
-	"""Return True if the result contains a basketball detection.
+# id(model) -> class ids counted as a basketball (None: any class counts)
+_BALL_CLASS_IDS = {}
 
-	If model.names is available, only count detections whose class name contains
-	'ball', 'basket', or 'basketball'. Otherwise, any detection counts.
-	"""
-	detected = False
-	boxes = getattr(res, "boxes", None)
-	if boxes is not None and len(boxes) > 0:
-		names = getattr(model, "names", None)
-		try:
-			cls_ids = [int(x) for x in boxes.cls.tolist()]
-		except Exception:
-			cls_ids = list(range(len(boxes)))
 
+def _ball_class_ids(model):
+	"""Class ids of model whose name contains 'ball' or 'basket', computed once per model."""
+	key = id(model)
+	if key not in _BALL_CLASS_IDS:
+		names = getattr(model, "names", None)
 		if names:
-			for cid in cls_ids:
-				nm = str(names.get(cid, "")).lower()
-				if "ball" in nm or "basket" in nm or "basketball" in nm:
-					detected = True
-					break
-			else:
-				detected = False
+			_BALL_CLASS_IDS[key] = [int(cid) for cid, nm in names.items()
+									if "ball" in str(nm).lower() or "basket" in str(nm).lower()]
 		else:
-			detected = len(cls_ids) > 0
+			_BALL_CLASS_IDS[key] = None
+	return _BALL_CLASS_IDS[key]
+
+
+# (id(model), device) -> ball class ids as a tensor on that device, built once
+_BALL_ID_TENSORS = {}
+
+
+def _ball_id_tensor(model, like):
+	"""Ball class ids of model as a tensor on the device (and dtype) of `like`."""
+	key = (id(model), str(like.device))
+	ids = _BALL_ID_TENSORS.get(key)
+	if ids is None:
+		ids = _BALL_ID_TENSORS[key] = like.new_tensor(_ball_class_ids(model))
+	return ids
+
+
+def _ball_detected_from_results(model, results) -> List[bool]:
+	"""Return, per result, whether it contains a basketball detection.
+
+	If model.names is available, only count detections whose class name contains
+	'ball', 'basket', or 'basketball'. Otherwise, any detection counts. The class
+	ids of the whole batch are matched in one device op with one sync to the CPU.
+	"""
+	all_boxes = [getattr(res, "boxes", None) for res in results]
+	counts = [0 if boxes is None else len(boxes) for boxes in all_boxes]
+	ball_ids = _ball_class_ids(model)
+	if ball_ids is None or not any(counts):
+		return [n > 0 for n in counts]
+	try:
+		import torch
+		cls = torch.cat([boxes.cls for boxes, n in zip(all_boxes, counts) if n])
+		hits = torch.isin(cls, _ball_id_tensor(model, cls)).tolist()
+	except Exception:
+		hits = [int(x) in ball_ids for boxes, n in zip(all_boxes, counts) if n for x in boxes.cls.tolist()]
+	detected = []
+	start = 0
+	for n in counts:
+		detected.append(any(hits[start:start + n]))
+		start += n
 	return detected
 
 
+def _ball_detected_from_result(model, res) -> bool:
+	"""Return True if the result contains a basketball detection (see _ball_detected_from_results)."""
+	return _ball_detected_from_results(model, [res])[0]
+
+
 # --- Multiprocessing helpers (Windows-safe: top-level definitions) ---
 _MP_MODEL = None
 
@@ -109,18 +175,247 @@ def _mp_init(weights: str, device: str):
 	_MP_MODEL.to(device)
 
 
-def _mp_detect_one(args: Tuple[str, float, str]) -> Tuple[str, bool, str | None]:
-	"""Detect one image in a worker process.
-	Returns (img_path_str, detected_bool, error_message_or_None)
+def _mp_detect_batch(args: Tuple[List[str], float, str]) -> List[Tuple[str, bool, str | None]]:
+	"""Detect a batch of images with one predict call in a worker process.
+	Returns a list of (img_path_str, detected_bool, error_message_or_None)
 	"""
-	img_path_str, conf, device = args
+	img_path_strs, conf, device = args
 	try:
-		results = _MP_MODEL.predict(source=img_path_str, conf=conf, device=device, verbose=False)
-		res = results[0]
-		detected = _ball_detected_from_result(_MP_MODEL, res)
-		return (img_path_str, detected, None)
+		results = _MP_MODEL.predict(source=img_path_strs, conf=conf, device=device, batch=len(img_path_strs),
+									half=resolve_device(device) != "cpu", verbose=False)
+		detected = _ball_detected_from_results(_MP_MODEL, results)
+		return [(p, hit, None) for p, hit in zip(img_path_strs, detected)]
 	except Exception as e:
-		return (img_path_str, False, str(e))
+		return [(p, False, str(e)) for p in img_path_strs]
+
+
+DEFAULT_WEIGHTS = r"D:\Brainy Neurals\basketball pipeline\best_det.pt"
+DEFAULT_CONF = 0.05
+
+# Models already loaded in this process, keyed by (weights, device, compile_model, fixed batch)
+_MODEL_CACHE = {}
+
+# TensorRT engines are built for, and compiled models specialized to, one batch
+# size; id(model) -> that batch size
+_FIXED_BATCH = {}
+ENGINE_IMGSZ = 640
+
+
+def engine_path_for(weights: str, batch_size: int) -> Path:
+	"""Path of the FP16 TensorRT engine exported next to the weights for a batch size."""
+	weights = Path(weights)
+	return weights.with_name(f"{weights.stem}_b{int(batch_size)}.engine")
+
+
+def export_engine(weights: str, device, batch_size: int) -> Path:
+	"""Export the weights once to an FP16 TensorRT engine specialized for batch_size."""
+	from ultralytics import YOLO
+	exported = YOLO(weights).export(format="engine", half=True, imgsz=ENGINE_IMGSZ, batch=int(batch_size),
+									device=resolve_device(device))
+	target = engine_path_for(weights, batch_size)
+	os.replace(exported, target)
+	return target
+
+
+def resolve_device(device):
+	"""Normalize a device argument to what YOLO expects (int GPU index or 'cpu')."""
+	if isinstance(device, str):
+		if device.lower() == "cpu" or device.strip() == "-1":
+			return "cpu"
+		return int(device)
+	return "cpu" if device is not None and device < 0 else device
+
+
+def load_model(weights: str, device, compile_model: bool = False, batch_size: int | None = None,
+			   build_engine: bool = False):
+	"""Load the YOLO detector once so it can be reused across folders.
+	
+	Models are kept for the life of the process, so every caller asking for the
+	same weights/device shares one instance (and one CUDA context warmup).
+	
+	When batch_size is given and an FP16 TensorRT engine for it exists next to
+	the weights (see engine_path_for), the engine is loaded instead of the .pt;
+	build_engine=True exports it first if missing.
+	
+	With compile_model=True the Conv+BN layers are fused and the network is
+	wrapped with torch.compile (PyTorch >= 2.0) after one warmup prediction.
+	Given a batch_size, batches are then padded to it so the compiled graph
+	never sees a new shape (and never recompiles) on a short tail batch.
+	"""
+	from ultralytics import YOLO  # imported lazily so the module parses without ultralytics
+	
+	engine = engine_path_for(weights, batch_size) if batch_size and not compile_model else None
+	if engine is not None and not engine.exists() and build_engine:
+		try:
+			export_engine(weights, device, batch_size)
+		except Exception as e:
+			print(f"TensorRT export failed, using the PyTorch weights: {e}")
+	if engine is not None and engine.exists():
+		key = (str(engine), resolve_device(device), False, int(batch_size))
+		if key not in _MODEL_CACHE:
+			model = YOLO(str(engine), task="detect")
+			_FIXED_BATCH[id(model)] = int(batch_size)
+			_MODEL_CACHE[key] = model
+		return _MODEL_CACHE[key]
+	
+	fixed_batch = int(batch_size) if compile_model and batch_size else None
+	key = (str(weights), resolve_device(device), bool(compile_model), fixed_batch)
+	if key in _MODEL_CACHE:
+		return _MODEL_CACHE[key]
+	
+	model = YOLO(weights)
+	model.to(resolve_device(device))  # Explicitly set device for GPU usage
+	if compile_model:
+		try:
+			import numpy as np
+			import torch
+			model.fuse()
+			# The first predict builds model.predictor, whose backend holds its own reference
+			# to the network; that reference is the one every later predict runs, so it is
+			# the one that gets swapped for the compiled module
+			model.predict(np.zeros((640, 640, 3), dtype=np.uint8), device=resolve_device(device), verbose=False)
+			backend = model.predictor.model
+			compiled = torch.compile(backend.model, mode="reduce-overhead", dynamic=False)
+			backend.model = compiled
+			if model.predictor.model.model is not compiled:
+				raise RuntimeError("predictor did not pick up the compiled module")
+			if fixed_batch:
+				_FIXED_BATCH[id(model)] = fixed_batch
+		except Exception as e:
+			print(f"torch.compile unavailable, running the uncompiled model: {e}")
+	_MODEL_CACHE[key] = model
+	return model
+
+
+def classify_images(model, images: List[Path], base_dir: Path, conf: float = DEFAULT_CONF,
+					device=0, batch_size: int = 16, dry_run: bool = False) -> Tuple[int, int, int]:
+	"""Run batched inference on images and move each into base_dir/Ball_detected or
+	base_dir/No_ball_detected.
+	
+	Returns (total, moved_ball, moved_no_ball).
+	"""
+	stats = _classify_into(model, [(p, base_dir) for p in images], conf, device, batch_size, dry_run)
+	return tuple(stats.get(base_dir, (0, 0, 0)))
+
+
+# Threads decoding the next batch's images while the current batch is on the GPU
+PREFETCH_WORKERS = max(1, min(8, (os.cpu_count() or 2) // 2))
+# Threads performing file moves in the background while inference continues
+MOVE_WORKERS = 16
+
+
+def _read_image(path: str):
+	"""Decode an image to a BGR array (None if it can't be decoded)."""
+	if _TURBOJPEG is not None and path.lower().endswith((".jpg", ".jpeg")):
+		try:
+			with open(path, "rb") as f:
+				return _TURBOJPEG.decode(f.read(), pixel_format=TJPF_BGR)
+		except Exception:
+			pass  # fall back to OpenCV below
+	try:
+		import cv2
+		return cv2.imread(path)
+	except Exception:
+		return None
+
+
+def _classify_into(model, items: List[Tuple[Path, Path]], conf: float, device, batch_size: int,
+				   dry_run: bool) -> dict:
+	"""Batch (image, base_dir) pairs through the model regardless of which folder
+	they come from, and move each image into its own base_dir's output folder.
+	
+	Returns {base_dir: [total, moved_ball, moved_no_ball]}.
+	"""
+	device = resolve_device(device)
+	stats = {}
+	for base_dir in dict.fromkeys(base_dir for _, base_dir in items):
+		(base_dir / "Ball_detected").mkdir(parents=True, exist_ok=True)
+		(base_dir / "No_ball_detected").mkdir(parents=True, exist_ok=True)
+		stats[base_dir] = [0, 0, 0]
+	
+	# A TensorRT engine only accepts the batch size it was built for, and a
+	# compiled model would recompile for any other
+	fixed_batch = _FIXED_BATCH.get(id(model))
+	bs = fixed_batch or max(1, int(batch_size))
+	# FP16 inference on the GPU (engines are already built in FP16, and compiled
+	# models keep the dtype they were compiled with)
+	half = device != "cpu" and not fixed_batch
+	batches = list(chunked(items, bs))
+	loader = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS)
+	mover = ThreadPoolExecutor(max_workers=MOVE_WORKERS)
+	moves = []
+	
+	def prefetch(batch):
+		paths = [str(p) for p, _ in batch]
+		if fixed_batch and len(paths) < fixed_batch:
+			# Pad the tail batch with repeats of its last image; extra results are dropped by zip below
+			paths += [paths[-1]] * (fixed_batch - len(paths))
+		return paths, [loader.submit(_read_image, p) for p in paths]
+	
+	pending = prefetch(batches[0]) if batches else None
+	for i, batch in enumerate(batches):
+		paths, decoding = pending
+		# Start decoding the next batch before running inference on this one
+		if i + 1 < len(batches):
+			pending = prefetch(batches[i + 1])
+		try:
+			frames = [f.result() for f in decoding]
+			# Let YOLO read the files itself if any image failed to decode here
+			source = frames if all(f is not None for f in frames) else paths
+			results = model.predict(source=source, conf=conf, device=device, batch=bs, half=half, verbose=False)
+		except Exception as e:
+			# On batch failure, fall back to per-image to continue progress
+			for p, base_dir in batch:
+				counts = stats[base_dir]
+				counts[0] += 1
+				print(f"Error running model on {p}: {e}")
+				target = base_dir / "No_ball_detected"
+				if dry_run:
+					print(f"DRY-RUN: would move {p} -> {target}")
+				else:
+					moves.append(mover.submit(safe_move, p, target))
+					counts[2] += 1
+			continue
+		
+		for (p, base_dir), detected in zip(batch, _ball_detected_from_results(model, results)):
+			counts = stats[base_dir]
+			counts[0] += 1
+			target = base_dir / ("Ball_detected" if detected else "No_ball_detected")
+			if dry_run:
+				print(f"DRY-RUN: would move {p} -> {target} (detected={detected})")
+			else:
+				moves.append(mover.submit(safe_move, p, target))
+				if detected:
+					counts[1] += 1
+				else:
+					counts[2] += 1
+
+	loader.shutdown()
+	mover.shutdown(wait=True)
+	for move in moves:
+		move.result()  # re-raise any move error
+	return stats
+
+
+def run_detection(folders: Iterable[Path], model, batch_size: int = 16, device=0,
+				  conf: float = DEFAULT_CONF, dry_run: bool = False) -> List[Tuple[Path, int, int, int]]:
+	"""Separate the images of several folders with one preloaded model.
+	
+	Images from all folders are fed through one global batcher, so only the very
+	last batch can be smaller than batch_size (instead of one tail per folder).
+	
+	Returns a list of (folder, total, moved_ball, moved_no_ball) per folder.
+	"""
+	folders = [Path(folder) for folder in folders]
+	items = [(p, folder) for folder in folders for p in find_images(folder)]
+	counts = _classify_into(model, items, conf, device, batch_size, dry_run)
+	
+	stats = []
+	for folder in folders:
+		total, moved_ball, moved_no_ball = counts.get(folder, (0, 0, 0))
+		print(f"{folder.name}: processed {total} images: moved to Ball_detected={moved_ball}, No_ball_detected={moved_no_ball}")
+		stats.append((folder, total, moved_ball, moved_no_ball))
+	return stats
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -128,21 +423,20 @@ def main(argv: list[str] | None = None) -> int:
 	parser.add_argument("--input", "-i", required=False,
 						default=r"D:\\Brainy Neurals\\basketball pipeline\\data\\extracted_frames\\video_aps_vs_agsv",
 						help="Input: folder containing images (non-recursive) OR a single image file path.")
-	parser.add_argument("--weights", "-w", default=r"D:\Brainy Neurals\basketball pipeline\best_det.pt",
+	parser.add_argument("--weights", "-w", default=DEFAULT_WEIGHTS,
 						help="Path to YOLO weights (default: best_det.pt in project root).")
-	parser.add_argument("--conf", "-c", type=float, default=0.05,
+	parser.add_argument("--conf", "-c", type=float, default=DEFAULT_CONF,
 						help="Confidence threshold for detections (default: 0.05).")
 	parser.add_argument("--dry-run", action="store_true", help="Print what would be moved but don't move files.")
 	parser.add_argument("--batch-size", type=int, default=16, help="Batch size for inference when processing folders.")
 	parser.add_argument("--workers", type=int, default=0, help="Number of worker processes for multiprocessing. 0 disables multiprocessing.")
+	parser.add_argument("--engine", action="store_true", help="Export (once) and use an FP16 TensorRT engine built for --batch-size.")
+	parser.add_argument("--compile", action="store_true", help="Fuse the model and run it through torch.compile (PyTorch >= 2.0).")
 	parser.add_argument("--device", default=0, type=int, help="Device to run inference on. 0 for GPU, -1 or 'cpu' for CPU (default: 0).")
 	args = parser.parse_args(argv)
 	
 	# Convert device to proper format for YOLO
-	if isinstance(args.device, str) and args.device.lower() == 'cpu':
-		device = 'cpu'
-	else:
-		device = int(args.device) if args.device != 'cpu' else 'cpu'
+	device = resolve_device(args.device)
 
 	input_path = Path(args.input)
 	if not input_path.exists():
@@ -169,8 +463,9 @@ def main(argv: list[str] | None = None) -> int:
 		print("Import error:", exc)
 		return 3
 
-	model = YOLO(args.weights)
-	model.to(device)  # Explicitly set device for GPU usage
+	# Worker processes load their own copies, so the parent doesn't need one
+	model = None if args.workers > 0 else load_model(args.weights, device, compile_model=args.compile,
+													 batch_size=args.batch_size, build_engine=args.engine)
 
 	# Automatically determine output directories based on input path
 	# If input is a file, use its parent directory; if folder, use the folder itself
@@ -186,7 +481,7 @@ def main(argv: list[str] | None = None) -> int:
 	moved_ball = 0
 	moved_no_ball = 0
 
-	if len(images_to_process) == 1 and args.workers == 0:
+	if len(images_to_process) == 1 and args.workers == 0 and id(model) not in _FIXED_BATCH:
 		# single image fast path
 		img_path = images_to_process[0]
 		total = 1
@@ -209,9 +504,14 @@ def main(argv: list[str] | None = None) -> int:
 				moved_no_ball += 1
 	else:
 		if args.workers and args.workers > 0:
-			# Multiprocessing: workers return booleans; parent moves files
+			# Multiprocessing: each task is a whole batch, so workers run batched inference
+			# and return booleans; parent moves files
+			bs = max(1, int(args.batch_size))
+			tasks = [([str(p) for p in batch], args.conf, device) for batch in chunked(images_to_process, bs)]
+			mover = ThreadPoolExecutor(max_workers=MOVE_WORKERS)
+			moves = []
 			with mp.get_context("spawn").Pool(processes=args.workers, initializer=_mp_init, initargs=(str(args.weights), device)) as pool:
-				for img_path_str, detected, err in pool.imap_unordered(_mp_detect_one, [(str(p), args.conf, device) for p in images_to_process]):
+				for img_path_str, detected, err in (r for batch in pool.imap_unordered(_mp_detect_batch, tasks) for r in batch):
 					total += 1
 					img_path = Path(img_path_str)
 					if err is not None:
@@ -221,43 +521,21 @@ def main(argv: list[str] | None = None) -> int:
 					if args.dry_run:
 						print(f"DRY-RUN: would move {img_path} -> {target} (detected={detected})")
 					else:
-						safe_move(img_path, target)
+						# Move in the background so the next batch's results are picked up right away
+						moves.append(mover.submit(safe_move, img_path, target))
 						if detected:
 							moved_ball += 1
 						else:
 							moved_no_ball += 1
+			mover.shutdown(wait=True)
+			for move in moves:
+				move.result()  # re-raise any move error
 		else:
 			# Batched single-process inference
-			bs = max(1, int(args.batch_size))
-			for batch in chunked(images_to_process, bs):
-				paths = [str(p) for p in batch]
-				try:
-					results = model.predict(source=paths, conf=args.conf, device=device, verbose=False)
-				except Exception as e:
-					# On batch failure, fall back to per-image to continue progress
-					for p in batch:
-						total += 1
-						print(f"Error running model on {p}: {e}")
-						target = no_ball_dir
-						if args.dry_run:
-							print(f"DRY-RUN: would move {p} -> {target}")
-						else:
-							safe_move(p, target)
-							moved_no_ball += 1
-					continue
-
-				for p, res in zip(batch, results):
-					total += 1
-					detected = _ball_detected_from_result(model, res)
-					target = ball_dir if detected else no_ball_dir
-					if args.dry_run:
-						print(f"DRY-RUN: would move {p} -> {target} (detected={detected})")
-					else:
-						safe_move(p, target)
-						if detected:
-							moved_ball += 1
-						else:
-							moved_no_ball += 1
+			total, moved_ball, moved_no_ball = classify_images(
+				model, images_to_process, base_dir, conf=args.conf, device=device,
+				batch_size=args.batch_size, dry_run=args.dry_run
+			)
 
 	print(f"Processed {total} images: moved to Ball_detected={moved_ball}, No_ball_detected={moved_no_ball}")
 	return 0
@@ -5,21 +5,73 @@ Uses ffmpeg for fast, lossless splitting (no re-encoding)
 """
 
 import os
+import re
+import shutil
 import subprocess
+import threading
+import functools
+import time
+import tempfile
 from pathlib import Path
 import argparse
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from typing import Optional
 import cv2
 
+# Optional: PyAV reads the duration from the container header in-process
+try:
+    import av as _av
+except Exception:
+    _av = None
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Concurrent ffmpeg runs when segments are cut one at a time; also the cap on
+# ffmpeg processes across all videos of split_multiple_videos
+SPLIT_WORKERS = min(8, os.cpu_count() or 1)
+
+# Videos split concurrently by split_multiple_videos
+VIDEO_WORKERS = 4
+
+# Seconds between progress messages of the OpenCV fallback
+PROGRESS_INTERVAL = 2.0
+
+
+@functools.lru_cache(maxsize=1)
+def _ffmpeg_exe() -> Optional[str]:
+    """Path of the ffmpeg binary, looked up once per process without spawning it
+    
+    Prefers ffmpeg on PATH, then the static build bundled with the optional
+    imageio-ffmpeg package; None if neither is available.
+    """
+    path = shutil.which('ffmpeg')
+    if path is None:
+        try:
+            import imageio_ffmpeg
+            path = imageio_ffmpeg.get_ffmpeg_exe()
+        except Exception:
+            path = None
+    return path
+
+
+@functools.lru_cache(maxsize=1)
+def _opencv_fourcc() -> int:
+    """FourCC for the OpenCV fallback: H.264 ('avc1') if this OpenCV build can
+    write it (through a hardware encoder where its FFmpeg backend has one), else 'mp4v'"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        writer = cv2.VideoWriter(os.path.join(tmp_dir, 'probe.mp4'), cv2.VideoWriter_fourcc(*'avc1'), 30, (64, 64))
+        h264_ok = writer.isOpened()
+        writer.release()
+    return cv2.VideoWriter_fourcc(*('avc1' if h264_ok else 'mp4v'))
+
 
 class VideoSplitter:
     """
     Splits long videos into smaller segments using ffmpeg (fast, no re-encoding)
-    Falls back to OpenCV if ffmpeg is not available
+    Falls back to PyAV (also no re-encoding), then OpenCV, if ffmpeg is not available
     """
     
     def __init__(self, segment_duration: int = 600, use_ffmpeg: bool = True):
@@ -32,30 +84,90 @@ class VideoSplitter:
         """
         self.segment_duration = segment_duration
         self.use_ffmpeg = use_ffmpeg and self._check_ffmpeg()
+        self.ffmpeg_bin = _ffmpeg_exe() or 'ffmpeg'
+        # Shared by every split this instance runs, so concurrent videos that each
+        # fall back to per-segment cuts still run at most SPLIT_WORKERS ffmpegs
+        self._ffmpeg_slots = threading.BoundedSemaphore(SPLIT_WORKERS)
         
         if self.use_ffmpeg:
             logger.info(f"VideoSplitter initialized with ffmpeg (FAST mode)")
+        elif _av is not None:
+            logger.info(f"VideoSplitter initialized with PyAV (FAST mode - ffmpeg not found)")
         else:
             logger.info(f"VideoSplitter initialized with OpenCV (SLOW mode - ffmpeg not found)")
         logger.info(f"Segment duration: {segment_duration}s ({segment_duration/60:.1f} min)")
     
     def _check_ffmpeg(self) -> bool:
         """Check if ffmpeg is available"""
+        return _ffmpeg_exe() is not None
+    
+    def _probe_duration(self, input_video: str) -> Optional[float]:
+        """Get the video duration in seconds (None on failure)
+        
+        Uses PyAV when installed (container header only, no subprocess) and
+        falls back to ffprobe, then to the Duration line of `ffmpeg -i` (for
+        ffmpeg builds shipped without ffprobe, e.g. imageio-ffmpeg's).
+        """
+        if _av is not None:
+            try:
+                with _av.open(input_video) as container:
+                    if container.duration is not None:
+                        return float(container.duration) / _av.time_base
+            except Exception:
+                pass  # let ffprobe have a go
+        
+        # Get video duration using ffprobe
         try:
-            result = subprocess.run(['ffmpeg', '-version'], 
-                                  capture_output=True, 
-                                  text=True, 
-                                  timeout=5)
-            return result.returncode == 0
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            return False
+            result = subprocess.run(
+                ['ffprobe', '-v', 'error', '-show_entries', 
+                 'format=duration', '-of', 
+                 'default=noprint_wrappers=1:nokey=1', input_video],
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
+            return float(result.stdout.strip())
+        except Exception as e:
+            probe_error = e
+        
+        try:
+            result = subprocess.run(
+                [self.ffmpeg_bin, '-hide_banner', '-i', input_video],
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
+            match = re.search(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)", result.stderr)
+            if match:
+                hours, minutes, seconds = match.groups()
+                return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+        except Exception as e:
+            probe_error = e
+        logger.error(f"Failed to get video duration: {probe_error}")
+        return None
     
-    def _format_time(self, seconds: float) -> str:
-        """Convert seconds to HH:MM:SS format for ffmpeg"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = seconds % 60
-        return f"{hours:02d}:{minutes:02d}:{secs:06.3f}"
+    def _log_summary(self, segment_paths: list, output_dir: str, sizes_mb: Optional[dict] = None) -> None:
+        """Log the end-of-split summary as one message (stat-ing segments only if it is shown)
+        
+        Args:
+            sizes_mb: Segment sizes already known from creation, by path
+        """
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        lines = [
+            f"\n{'='*60}",
+            f"SPLITTING COMPLETE",
+            f"{'='*60}",
+            f"Total segments created: {len(segment_paths)}",
+            f"Output directory: {output_dir}",
+            f"Segments:",
+        ]
+        sizes_mb = sizes_mb or {}
+        for i, path in enumerate(segment_paths, 1):
+            size_mb = sizes_mb[path] if path in sizes_mb else os.stat(path).st_size / (1024 * 1024)
+            lines.append(f"  {i}. {Path(path).name} ({size_mb:.1f} MB)")
+        lines.append(f"{'='*60}\n")
+        logger.info("\n".join(lines))
     
     def split_video(
         self, 
@@ -85,9 +197,11 @@ class VideoSplitter:
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
         
-        # Use ffmpeg if available, otherwise fall back to OpenCV
+        # Use ffmpeg if available, otherwise fall back to PyAV or OpenCV
         if self.use_ffmpeg:
             return self._split_with_ffmpeg(input_video, output_dir, segment_duration)
+        elif _av is not None:
+            return self._split_with_pyav(input_video, output_dir, segment_duration)
         else:
             return self._split_with_opencv(input_video, output_dir, segment_duration)
     
@@ -98,90 +212,286 @@ class VideoSplitter:
         segment_duration: int
     ) -> list:
         """Split video using ffmpeg (FAST - no re-encoding)"""
-        # Get video duration using ffprobe
-        try:
-            result = subprocess.run(
-                ['ffprobe', '-v', 'error', '-show_entries', 
-                 'format=duration', '-of', 
-                 'default=noprint_wrappers=1:nokey=1', input_video],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            duration = float(result.stdout.strip())
-        except Exception as e:
-            logger.error(f"Failed to get video duration: {e}")
+        duration = self._probe_duration(input_video)
+        if duration is None:
             return []
         
-        video_name = Path(input_video).stem
         num_segments = int(duration / segment_duration) + (1 if duration % segment_duration > 0 else 0)
         
-        logger.info(f"\n{'='*60}")
-        logger.info(f"Processing video: {Path(input_video).name}")
-        logger.info(f"{'='*60}")
-        logger.info(f"Duration: {duration/60:.1f} minutes ({duration:.1f}s)")
-        logger.info(f"Segment duration: {segment_duration}s ({segment_duration/60:.1f} min)")
-        logger.info(f"Estimated segments: {num_segments}")
-        logger.info(f"Method: ffmpeg (FAST - no re-encoding)")
-        logger.info(f"{'='*60}\n")
+        logger.info("\n".join([
+            f"\n{'='*60}",
+            f"Processing video: {Path(input_video).name}",
+            f"{'='*60}",
+            f"Duration: {duration/60:.1f} minutes ({duration:.1f}s)",
+            f"Segment duration: {segment_duration}s ({segment_duration/60:.1f} min)",
+            f"Estimated segments: {num_segments}",
+            f"Method: ffmpeg (FAST - no re-encoding)",
+            f"{'='*60}\n",
+        ]))
         
-        segment_paths = []
+        if num_segments <= 1 and Path(input_video).suffix.lower() == '.mp4':
+            # The whole video is the only segment: link it instead of remuxing
+            segments = self._passthrough_segment(input_video, output_dir)
+        else:
+            segments = self._split_with_segment_muxer(input_video, output_dir, segment_duration, num_segments)
+        if segments is None:
+            logger.warning("Segment muxer failed, falling back to one ffmpeg run per segment")
+            segments = self._split_per_segment(input_video, output_dir, segment_duration, num_segments)
+        segment_paths = [segment_path for segment_path, _ in segments]
         
-        # Split using ffmpeg
-        for i in range(num_segments):
-            start_time = i * segment_duration
-            segment_num = i + 1
-            
+        # Summary
+        self._log_summary(segment_paths, output_dir, dict(segments))
+        
+        return segment_paths
+    
+    def _passthrough_segment(self, input_video: str, output_dir: str) -> list:
+        """Make a video no longer than one segment its own single segment
+        
+        The input is hard-linked as segment 001 (copied if it's on another
+        filesystem), so no ffmpeg process is needed at all.
+        
+        Returns:
+            List with the (segment path, size in MB) of the one segment
+        """
+        segment_path = os.path.join(output_dir, f"{Path(input_video).stem}_segment_001.mp4")
+        if os.path.lexists(segment_path):
+            os.remove(segment_path)
+        try:
+            os.link(input_video, segment_path)
+        except OSError:
+            shutil.copy2(input_video, segment_path)
+        
+        size_mb = os.stat(segment_path).st_size / (1024 * 1024)
+        logger.info(f"Created segment 1: {Path(segment_path).name} ({size_mb:.1f} MB, linked - shorter than one segment)")
+        return [(segment_path, size_mb)]
+    
+    def _split_with_segment_muxer(
+        self,
+        input_video: str,
+        output_dir: str,
+        segment_duration: int,
+        num_segments: int
+    ) -> Optional[list]:
+        """Cut every segment in one ffmpeg run using the segment muxer
+        
+        The input is opened and demuxed once instead of once per segment.
+        Segments start on the first keyframe at or after each boundary.
+        
+        Returns:
+            List of (segment path, size in MB) for the created segments, or
+            None if ffmpeg failed
+        """
+        video_name = Path(input_video).stem
+        list_path = os.path.join(output_dir, f".{video_name}_segments.txt")
+        
+        # ffmpeg command: -c copy for no re-encoding, -f segment to cut on the fly
+        cmd = [
+            self.ffmpeg_bin,
+            '-loglevel', 'error', '-nostats',  # only errors on stderr, no progress lines
+            '-fflags', '+genpts',  # fill in missing pts (e.g. AVI/FLV) so cuts can be placed
+            '-i', input_video,
+            '-map', '0:v', '-map', '0:a?',
+            '-c', 'copy',  # Copy codec (no re-encoding)
+            '-f', 'segment',
+            '-segment_time', str(segment_duration),
+            '-segment_start_number', '1',
+            '-segment_list', list_path,
+            '-segment_list_type', 'flat',
+            '-reset_timestamps', '1',  # every segment starts at t=0; no extra timestamp shifting needed
+            '-y',  # Overwrite output files
+            os.path.join(output_dir, f"{video_name}_segment_%03d.mp4")
+        ]
+        
+        try:
+            with self._ffmpeg_slots:
+                result = subprocess.run(
+                    cmd,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    timeout=300 * max(1, num_segments)
+                )
+            if result.returncode != 0:
+                logger.error(f"  {result.stderr}")
+                return None
+            with open(list_path) as f:
+                names = [line.strip() for line in f if line.strip()]
+        except subprocess.TimeoutExpired:
+            logger.error(f"  ✗ Timeout while splitting")
+            return None
+        except Exception as e:
+            logger.error(f"  ✗ Error: {e}")
+            return None
+        finally:
+            if os.path.exists(list_path):
+                os.remove(list_path)
+        
+        segments = []
+        for name in names:
+            segment_path = os.path.join(output_dir, os.path.basename(name))
+            size_mb = os.stat(segment_path).st_size / (1024 * 1024)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"Created segment {len(segments) + 1}: {Path(segment_path).name} ({size_mb:.1f} MB)")
+            segments.append((segment_path, size_mb))
+        return segments
+    
+    def _split_per_segment(
+        self,
+        input_video: str,
+        output_dir: str,
+        segment_duration: int,
+        num_segments: int
+    ) -> list:
+        """Cut segments one ffmpeg run at a time (fallback for the segment muxer)
+        
+        Stream copies are I/O bound, so the ffmpeg runs are overlapped on a
+        small thread pool (ffmpeg itself runs out of process).
+        
+        Returns:
+            List of (segment path, size in MB) for the created segments
+        """
+        video_name = Path(input_video).stem
+        jobs = []
+        
+        for segment_num, start_time in enumerate(range(0, num_segments * segment_duration, segment_duration), 1):
             # Create segment filename
             segment_filename = f"{video_name}_segment_{segment_num:03d}.mp4"
             segment_path = os.path.join(output_dir, segment_filename)
             
-            logger.info(f"Creating segment {segment_num}/{num_segments}: {segment_filename}")
-            logger.info(f"  Time range: {self._format_time(start_time)} - {self._format_time(start_time + segment_duration)}")
-            
-            # ffmpeg command: -c copy for no re-encoding (super fast!)
-            cmd = [
-                'ffmpeg',
-                '-i', input_video,
-                '-ss', self._format_time(start_time),
-                '-t', str(segment_duration),
-                '-c', 'copy',  # Copy codec (no re-encoding)
-                '-avoid_negative_ts', 'make_zero',
-                '-y',  # Overwrite output file
-                segment_path
-            ]
-            
-            try:
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"Creating segment {segment_num}/{num_segments}: {segment_filename}\n"
+                            f"  Time range: {timedelta(seconds=start_time)} - {timedelta(seconds=start_time + segment_duration)}")
+            jobs.append((input_video, start_time, segment_duration, segment_path))
+        
+        # Split using ffmpeg
+        with ThreadPoolExecutor(max_workers=min(SPLIT_WORKERS, max(1, num_segments))) as executor:
+            sizes_mb = list(executor.map(lambda job: self._make_segment(*job), jobs))
+        
+        return [(segment_path, size_mb) for (_, _, _, segment_path), size_mb in zip(jobs, sizes_mb)
+                if size_mb is not None]
+    
+    def _make_segment(
+        self,
+        input_video: str,
+        start_time: float,
+        segment_duration: int,
+        segment_path: str
+    ) -> Optional[float]:
+        """Cut one segment with ffmpeg; returns its size in MB, or None if it wasn't created"""
+        segment_filename = Path(segment_path).name
+        
+        # ffmpeg command: -c copy for no re-encoding (super fast!); -ss before -i
+        # seeks the input to the nearest keyframe instead of reading up to start_time
+        cmd = [
+            self.ffmpeg_bin,
+            '-loglevel', 'error', '-nostats',  # only errors on stderr, no progress lines
+            # Seek by index/keyframe only: segments may start up to one GOP early
+            '-fflags', '+genpts+fastseek',
+            '-noaccurate_seek',
+            '-ss', f"{start_time:.3f}",  # ffmpeg takes plain seconds
+            '-i', input_video,
+            '-t', str(segment_duration),
+            '-c', 'copy',  # Copy codec (no re-encoding)
+            '-avoid_negative_ts', 'make_zero',
+            '-y',  # Overwrite output file
+            segment_path
+        ]
+        
+        try:
+            with self._ffmpeg_slots:
                 result = subprocess.run(
                     cmd,
-                    capture_output=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
                     text=True,
                     timeout=300
                 )
+            
+            if result.returncode == 0 and os.path.exists(segment_path):
+                size_mb = os.stat(segment_path).st_size / (1024 * 1024)
+                logger.info(f"  ✓ Created {segment_filename} ({size_mb:.1f} MB)")
+                return size_mb
+            logger.error(f"  ✗ Failed to create segment {segment_filename}")
+            logger.error(f"  {result.stderr}")
+        except subprocess.TimeoutExpired:
+            logger.error(f"  ✗ Timeout while creating segment {segment_filename}")
+        except Exception as e:
+            logger.error(f"  ✗ Error creating {segment_filename}: {e}")
+        return None
+    
+    def _split_with_pyav(
+        self,
+        input_video: str,
+        output_dir: str,
+        segment_duration: int
+    ) -> list:
+        """Split video by remuxing packets with PyAV (FAST - no re-encoding)
+        
+        Packets are copied from the container straight into the segment files,
+        never decoded. Like ffmpeg's segment muxer, a new segment starts on the
+        first video keyframe at or after each segment boundary.
+        """
+        video_name = Path(input_video).stem
+        
+        logger.info("\n".join([
+            f"\n{'='*60}",
+            f"Processing video: {Path(input_video).name}",
+            f"{'='*60}",
+            f"Segment duration: {segment_duration}s ({segment_duration/60:.1f} min)",
+            f"Method: PyAV (FAST - no re-encoding)",
+            f"{'='*60}\n",
+        ]))
+        
+        segment_paths = []
+        out = None
+        try:
+            with _av.open(input_video) as container:
+                video = container.streams.video[0]
+                streams = [video] + list(container.streams.audio[:1])
+                next_boundary = 0.0
                 
-                if result.returncode == 0 and os.path.exists(segment_path):
-                    size_mb = os.path.getsize(segment_path) / (1024 * 1024)
-                    logger.info(f"  ✓ Created ({size_mb:.1f} MB)")
-                    segment_paths.append(segment_path)
-                else:
-                    logger.error(f"  ✗ Failed to create segment")
-                    logger.error(f"  {result.stderr}")
-            except subprocess.TimeoutExpired:
-                logger.error(f"  ✗ Timeout while creating segment")
-            except Exception as e:
-                logger.error(f"  ✗ Error: {e}")
+                for packet in container.demux(streams):
+                    if packet.dts is None:
+                        continue  # flush packet at end of stream
+                    
+                    # Start new segment
+                    if packet.stream is video and packet.is_keyframe and packet.dts * packet.time_base >= next_boundary:
+                        if out is not None:
+                            out.close()
+                        
+                        start_sec = float(packet.dts * packet.time_base)
+                        next_boundary = (int(start_sec // segment_duration) + 1) * segment_duration
+                        
+                        # Create segment filename
+                        segment_filename = f"{video_name}_segment_{len(segment_paths) + 1:03d}.mp4"
+                        segment_path = os.path.join(output_dir, segment_filename)
+                        logger.info(f"Creating segment {len(segment_paths) + 1}: {segment_filename}")
+                        
+                        out = _av.open(segment_path, 'w')
+                        add_stream = getattr(out, 'add_stream_from_template', None) or (lambda s: out.add_stream(template=s))
+                        out_streams = {s.index: add_stream(s) for s in streams}
+                        # Shift each stream so the segment starts at t=0 (like -reset_timestamps)
+                        offsets = {s.index: int(start_sec / s.time_base) for s in streams}
+                        segment_paths.append(segment_path)
+                    
+                    if out is None:
+                        continue  # packets before the first keyframe
+                    
+                    index = packet.stream.index
+                    offset = offsets[index] = min(offsets[index], packet.dts)
+                    packet.dts -= offset
+                    if packet.pts is not None:
+                        packet.pts -= offset
+                    packet.stream = out_streams[index]
+                    out.mux(packet)
+        except Exception as e:
+            logger.error(f"  ✗ Error: {e}")
+        finally:
+            if out is not None:
+                out.close()
         
         # Summary
-        logger.info(f"\n{'='*60}")
-        logger.info(f"SPLITTING COMPLETE")
-        logger.info(f"{'='*60}")
-        logger.info(f"Total segments created: {len(segment_paths)}")
-        logger.info(f"Output directory: {output_dir}")
-        logger.info(f"Segments:")
-        for i, path in enumerate(segment_paths, 1):
-            size_mb = os.path.getsize(path) / (1024 * 1024)
-            logger.info(f"  {i}. {Path(path).name} ({size_mb:.1f} MB)")
-        logger.info(f"{'='*60}\n")
+        self._log_summary(segment_paths, output_dir)
         
         return segment_paths
     
@@ -206,25 +516,27 @@ class VideoSplitter:
         height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         duration = total_frames / fps if fps > 0 else 0
         
-        logger.info(f"\n{'='*60}")
-        logger.info(f"Processing video: {Path(input_video).name}")
-        logger.info(f"{'='*60}")
-        logger.info(f"Duration: {duration/60:.1f} minutes ({duration:.1f}s)")
-        logger.info(f"FPS: {fps}")
-        logger.info(f"Total frames: {total_frames:,}")
-        logger.info(f"Resolution: {width}x{height}")
-        logger.info(f"Segment duration: {segment_duration}s ({segment_duration/60:.1f} min)")
-        logger.info(f"Method: OpenCV (SLOW - frame by frame)")
-        logger.info(f"WARNING: This will be slow! Install ffmpeg for 10-100x speed boost")
-        
         # Calculate segments
         frames_per_segment = int(fps * segment_duration)
         estimated_segments = int(total_frames / frames_per_segment) + 1
-        logger.info(f"Estimated segments: {estimated_segments}")
-        logger.info(f"{'='*60}\n")
         
-        # Get video codec
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        logger.info("\n".join([
+            f"\n{'='*60}",
+            f"Processing video: {Path(input_video).name}",
+            f"{'='*60}",
+            f"Duration: {duration/60:.1f} minutes ({duration:.1f}s)",
+            f"FPS: {fps}",
+            f"Total frames: {total_frames:,}",
+            f"Resolution: {width}x{height}",
+            f"Segment duration: {segment_duration}s ({segment_duration/60:.1f} min)",
+            f"Method: OpenCV (SLOW - frame by frame)",
+            f"WARNING: This will be slow! Install ffmpeg for 10-100x speed boost",
+            f"Estimated segments: {estimated_segments}",
+            f"{'='*60}\n",
+        ]))
+        
+        # Get video codec (H.264 when available, probed once per process)
+        fourcc = _opencv_fourcc()
         
         # Split video
         segment_paths = []
@@ -234,6 +546,7 @@ class VideoSplitter:
         
         video_name = Path(input_video).stem
         writer = None
+        last_log = time.monotonic()
         
         while True:
             ret, frame = cap.read()
@@ -265,9 +578,11 @@ class VideoSplitter:
                 current_segment_frames = 0
                 segment_num += 1
             
-            # Progress update
-            if frame_count % 1000 == 0:
-                progress = (frame_count / total_frames) * 100
+            # Progress update (time-based, at most every PROGRESS_INTERVAL seconds)
+            now = time.monotonic()
+            if now - last_log >= PROGRESS_INTERVAL:
+                last_log = now
+                progress = (frame_count / total_frames) * 100 if total_frames > 0 else 0.0
                 logger.info(f"Progress: {progress:.1f}% ({frame_count:,}/{total_frames:,} frames)")
         
         # Release resources
@@ -276,16 +591,7 @@ class VideoSplitter:
         cap.release()
         
         # Summary
-        logger.info(f"\n{'='*60}")
-        logger.info(f"SPLITTING COMPLETE")
-        logger.info(f"{'='*60}")
-        logger.info(f"Total segments created: {len(segment_paths)}")
-        logger.info(f"Output directory: {output_dir}")
-        logger.info(f"Segments:")
-        for i, path in enumerate(segment_paths, 1):
-            size_mb = os.path.getsize(path) / (1024 * 1024)
-            logger.info(f"  {i}. {Path(path).name} ({size_mb:.1f} MB)")
-        logger.info(f"{'='*60}\n")
+        self._log_summary(segment_paths, output_dir)
         
         return segment_paths
     
@@ -306,22 +612,17 @@ class VideoSplitter:
         Returns:
             Dictionary mapping input video to list of segment paths
         """
-        # Find video files
-        video_extensions = ['.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv']
-        video_files = []
-        for ext in video_extensions:
-            video_files.extend(Path(input_dir).glob(f'*{ext}'))
-            video_files.extend(Path(input_dir).glob(f'*{ext.upper()}'))
-        
-        # Deduplicate
-        unique_map = {}
-        for f in video_files:
-            try:
-                key = str(f.resolve())
-            except Exception:
-                key = str(f)
-            unique_map[key] = f
-        video_files = sorted(unique_map.values(), key=lambda p: p.name.lower())
+        # Find video files in one directory pass (case-insensitive extensions)
+        video_extensions = ('.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv')
+        try:
+            with os.scandir(input_dir) as it:
+                video_files = sorted(
+                    (Path(entry.path) for entry in it
+                     if entry.name.lower().endswith(video_extensions) and entry.is_file()),
+                    key=lambda p: p.name.lower()
+                )
+        except (FileNotFoundError, NotADirectoryError):
+            video_files = []
         
         if not video_files:
             logger.warning(f"No video files found in: {input_dir}")
@@ -329,31 +630,38 @@ class VideoSplitter:
         
         logger.info(f"Found {len(video_files)} video(s) to split\n")
         
-        # Process each video
-        results = {}
-        for idx, video_path in enumerate(video_files, 1):
+        def split_one(idx, video_path):
             logger.info(f"\n[{idx}/{len(video_files)}] Processing: {video_path.name}")
             
             # Create output subdirectory for this video
             video_output_dir = os.path.join(output_dir, video_path.stem + "_segments")
             
             # Split video
-            segments = self.split_video(
+            return self.split_video(
                 str(video_path),
                 video_output_dir,
                 segment_duration
             )
-            results[str(video_path)] = segments
+        
+        # Process videos concurrently; each split is an out-of-process ffmpeg
+        # stream copy, so the limit is disk bandwidth rather than the GIL
+        results = {}
+        with ThreadPoolExecutor(max_workers=min(VIDEO_WORKERS, len(video_files))) as executor:
+            futures = [executor.submit(split_one, idx, video_path) for idx, video_path in enumerate(video_files, 1)]
+            for video_path, future in zip(video_files, futures):
+                results[str(video_path)] = future.result()
         
         # Final summary
         total_segments = sum(len(segs) for segs in results.values())
-        logger.info(f"\n{'='*60}")
-        logger.info(f"ALL VIDEOS PROCESSED")
-        logger.info(f"{'='*60}")
-        logger.info(f"Videos processed: {len(video_files)}")
-        logger.info(f"Total segments created: {total_segments}")
-        logger.info(f"Output directory: {output_dir}")
-        logger.info(f"{'='*60}\n")
+        logger.info("\n".join([
+            f"\n{'='*60}",
+            f"ALL VIDEOS PROCESSED",
+            f"{'='*60}",
+            f"Videos processed: {len(video_files)}",
+            f"Total segments created: {total_segments}",
+            f"Output directory: {output_dir}",
+            f"{'='*60}\n",
+        ]))
         
         return results
 
@@ -9,10 +9,49 @@ import os
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 import logging
-import random
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# Optional libjpeg-turbo codec (pip install PyTurboJPEG); cv2 is used otherwise
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    _TURBOJPEG = TurboJPEG()
+except Exception:
+    _TURBOJPEG = None
+
+# Augmentor of a worker process in DataAugmentor.augment_dataset
+_WORKER_AUGMENTOR = None
+
+
+def _init_worker(config: Dict) -> None:
+    """Build the worker's augmentor (variants are seeded per image, not per worker)"""
+    global _WORKER_AUGMENTOR
+    _WORKER_AUGMENTOR = DataAugmentor(config)
+
+
+def _augment_one(args: Tuple[Path, Path, Path]) -> Optional[int]:
+    """Worker entry point: augment one image (see DataAugmentor.augment_image)"""
+    return _WORKER_AUGMENTOR.augment_image(*args)
+
+
+def _iter_images(root: str, extensions: Tuple[str, ...] = ('.jpg', '.jpeg', '.png')):
+    """Yield image paths under root (recursive) with one os.scandir pass per folder"""
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.lower().endswith(extensions):
+                    yield Path(entry.path)
+
 
 class DataAugmentor:
     """
@@ -33,6 +72,14 @@ class DataAugmentor:
         self.enabled = self.aug_config.get('enabled', True)
         self.aug_per_image = self.aug_config.get('augmentations_per_image', 3)
         
+        # Optional GPU warps (torch + kornia); each worker would hold its own CUDA context
+        self.device = str(self.aug_config.get('device', 'cpu'))
+        self._torch = self._kornia = None
+        if self.device != 'cpu':
+            self._init_gpu()
+        default_workers = 1 if self._torch is not None else (os.cpu_count() or 1)
+        self.workers = self.aug_config.get('workers', default_workers)
+        
         # Augmentation probabilities
         self.brightness_prob = self.aug_config.get('brightness_probability', 0.7)
         self.contrast_prob = self.aug_config.get('contrast_probability', 0.5)
@@ -47,6 +94,25 @@ class DataAugmentor:
         self.rotation_range = self.aug_config.get('rotation_range', [-10, 10])
         self.zoom_range = self.aug_config.get('zoom_range', [0.9, 1.1])
         self.noise_std = self.aug_config.get('noise_std', 10)
+        self.seed = int(self.aug_config.get('seed', 0))
+        
+        # Reusable int16 noise buffers, keyed by image shape
+        self._noise_bufs = {}
+        
+        # Output folders already created and relative folders per input parent
+        self._created_dirs = set()
+        self._relative_folders = {}
+        
+        # cv2.imwrite's default JPEG quality unless configured
+        self.jpeg_quality = int(self.output_config.get('frame_quality', 95))
+        self._jpeg_params = [int(cv2.IMWRITE_JPEG_QUALITY), self.jpeg_quality]
+        
+        # Fingerprint of the settings that shape the variants (see augment_image);
+        # 'rng' marks the sampling scheme so variants from an older one are redone
+        self._settings_key = hashlib.blake2b(
+            json.dumps({**self.aug_config, 'rng': 'pcg64', 'jpeg_quality': self.jpeg_quality},
+                       sort_keys=True, default=str).encode(), digest_size=8
+        ).hexdigest()
         
         logger.info(f"DataAugmentor initialized (enabled={self.enabled}, "
                    f"augmentations_per_image={self.aug_per_image})")
@@ -62,23 +128,57 @@ class DataAugmentor:
         Returns:
             Brightness-adjusted image
         """
-        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV).astype(np.float32)
-        hsv[:, :, 2] = np.clip(hsv[:, :, 2] + delta, 0, 255)
-        return cv2.cvtColor(hsv.astype(np.uint8), cv2.COLOR_HSV2BGR)
+        # Shift only the V channel through a 256-entry lookup table (no float copies)
+        lut = np.clip(np.arange(256, dtype=np.int16) + int(delta), 0, 255).astype(np.uint8)
+        h, s, v = cv2.split(cv2.cvtColor(image, cv2.COLOR_BGR2HSV))
+        return cv2.cvtColor(cv2.merge((h, s, cv2.LUT(v, lut))), cv2.COLOR_HSV2BGR)
     
-    def adjust_contrast(self, image: np.ndarray, factor: float) -> np.ndarray:
+    def adjust_contrast(self, image: np.ndarray, factor: float, inplace: bool = False) -> np.ndarray:
         """
         Adjust image contrast
         
         Args:
             image: Input image
             factor: Contrast factor (0.5 = less contrast, 1.5 = more contrast)
+            inplace: Write the result into image instead of a new array
             
         Returns:
             Contrast-adjusted image
         """
-        mean = np.mean(image)
-        return np.clip((image - mean) * factor + mean, 0, 255).astype(np.uint8)
+        # cv2.mean is a single SIMD pass per channel (np.mean upcasts uint8 to float64)
+        channels = 1 if image.ndim == 2 else image.shape[2]
+        mean = sum(cv2.mean(image)[:channels]) / channels
+        # Same mapping for every pixel value, so apply it as a 256-entry lookup table
+        lut = np.clip((np.arange(256, dtype=np.float64) - mean) * factor + mean, 0, 255).astype(np.uint8)
+        return cv2.LUT(image, lut, dst=image) if inplace else cv2.LUT(image, lut)
+    
+    def adjust_brightness_contrast(
+        self,
+        image: np.ndarray,
+        delta: Optional[int],
+        factor: Optional[float]
+    ) -> np.ndarray:
+        """
+        Apply brightness and/or contrast with a single output buffer
+        
+        Brightness shifts V in HSV space, so it can't be folded into the
+        contrast LUT; instead the contrast LUT is applied in place on the
+        brightness output rather than into another full-size copy.
+        
+        Args:
+            image: Input image (not modified)
+            delta: Brightness adjustment, or None to skip
+            factor: Contrast factor, or None to skip
+            
+        Returns:
+            Adjusted image
+        """
+        if delta is None:
+            return image if factor is None else self.adjust_contrast(image, factor)
+        adjusted = self.adjust_brightness(image, delta)
+        if factor is not None:
+            self.adjust_contrast(adjusted, factor, inplace=True)
+        return adjusted
     
     def horizontal_flip(self, image: np.ndarray, bboxes: List[List[float]]) -> Tuple[np.ndarray, List[List[float]]]:
         """
@@ -93,12 +193,9 @@ class DataAugmentor:
         """
         flipped = cv2.flip(image, 1)
         
-        # Adjust YOLO bboxes (flip x_center)
-        flipped_bboxes = []
-        for bbox in bboxes:
-            cls, x_center, y_center, width, height = bbox
-            new_x = 1.0 - x_center  # Flip x coordinate
-            flipped_bboxes.append([cls, new_x, y_center, width, height])
+        # Adjust YOLO bboxes (flip x_center) for all boxes at once
+        flipped_bboxes = np.array(bboxes, dtype=np.float64).reshape(-1, 5)
+        flipped_bboxes[:, 1] = 1.0 - flipped_bboxes[:, 1]
         
         return flipped, flipped_bboxes
     
@@ -115,22 +212,8 @@ class DataAugmentor:
             Rotated image and adjusted bboxes
         """
         h, w = image.shape[:2]
-        center = (w / 2, h / 2)
-        
-        # Get rotation matrix
-        M = cv2.getRotationMatrix2D(center, angle, 1.0)
-        
-        # Rotate image
-        rotated = cv2.warpAffine(image, M, (w, h), 
-                                 borderMode=cv2.BORDER_CONSTANT,
-                                 borderValue=(0, 0, 0))
-        
-        # Adjust bboxes (approximate - for small angles, bboxes stay roughly valid)
-        # For small rotations (<15 degrees), we keep bboxes as-is
-        # For production, you'd want to rotate the corners and recalculate
-        rotated_bboxes = bboxes.copy()
-        
-        return rotated, rotated_bboxes
+        M = self._rotation_matrix(w, h, angle)
+        return self._warp(image, M), self._transform_bboxes(bboxes, M, w, h)
     
     def zoom_image(self, image: np.ndarray, zoom_factor: float, bboxes: List[List[float]]) -> Tuple[np.ndarray, List[List[float]]]:
         """
@@ -147,66 +230,146 @@ class DataAugmentor:
         h, w = image.shape[:2]
         
         if zoom_factor > 1.0:
-            # Zoom in (crop center and resize)
-            new_h, new_w = int(h / zoom_factor), int(w / zoom_factor)
-            top = (h - new_h) // 2
-            left = (w - new_w) // 2
-            
-            cropped = image[top:top+new_h, left:left+new_w]
-            zoomed = cv2.resize(cropped, (w, h))
-            
-            # Adjust bboxes
-            zoomed_bboxes = []
-            for bbox in bboxes:
-                cls, x_center, y_center, width, height = bbox
-                
-                # Convert to pixel coordinates
-                x_pix = x_center * w
-                y_pix = y_center * h
-                w_pix = width * w
-                h_pix = height * h
-                
-                # Adjust for crop
-                new_x = (x_pix - left) * zoom_factor
-                new_y = (y_pix - top) * zoom_factor
-                new_w = w_pix * zoom_factor
-                new_h = h_pix * zoom_factor
-                
-                # Convert back to YOLO format
-                if 0 <= new_x <= w and 0 <= new_y <= h:  # Keep only visible bboxes
-                    zoomed_bboxes.append([
-                        cls,
-                        new_x / w,
-                        new_y / h,
-                        new_w / w,
-                        new_h / h
-                    ])
-        else:
-            # Zoom out (add padding)
-            zoomed = image.copy()
-            zoomed_bboxes = bboxes.copy()
+            # Zoom in (scale about the center, equivalent to a center crop + resize)
+            M = self._zoom_matrix(w, h, zoom_factor)
+            return self._warp(image, M), self._transform_bboxes(bboxes, M, w, h)
+        
+        # Zoom out (add padding)
+        return image.copy(), np.array(bboxes, dtype=np.float64).reshape(-1, 5)
+    
+    @staticmethod
+    def _rotation_matrix(w: int, h: int, angle: float, scale: float = 1.0) -> np.ndarray:
+        """3x3 homogeneous rotation (and optional scale) about the image center"""
+        M = np.eye(3)
+        M[:2] = cv2.getRotationMatrix2D((w / 2, h / 2), angle, scale)
+        return M
+    
+    @staticmethod
+    def _zoom_matrix(w: int, h: int, zoom_factor: float) -> np.ndarray:
+        """3x3 homogeneous scale about the image center"""
+        cx, cy = w / 2, h / 2
+        return np.array([
+            [zoom_factor, 0.0, cx * (1.0 - zoom_factor)],
+            [0.0, zoom_factor, cy * (1.0 - zoom_factor)],
+            [0.0, 0.0, 1.0]
+        ])
+    
+    @staticmethod
+    def _flip_matrix(w: int) -> np.ndarray:
+        """3x3 homogeneous horizontal flip (same pixel mapping as cv2.flip(image, 1))"""
+        return np.array([
+            [-1.0, 0.0, w - 1.0],
+            [0.0, 1.0, 0.0],
+            [0.0, 0.0, 1.0]
+        ])
+    
+    def _init_gpu(self) -> None:
+        """Enable Kornia warps on self.device, or fall back to OpenCV"""
+        try:
+            import torch
+            import kornia
+        except ImportError:
+            logger.warning(f"augmentation.device={self.device} needs torch and kornia; using OpenCV on CPU")
+            return
+        if self.device.startswith('cuda') and not torch.cuda.is_available():
+            logger.warning(f"augmentation.device={self.device} but CUDA is unavailable; using OpenCV on CPU")
+            return
+        self._torch, self._kornia = torch, kornia
+    
+    def _warp(self, image: np.ndarray, M: np.ndarray) -> np.ndarray:
+        """Apply a 3x3 affine matrix with a single warp (black border)"""
+        h, w = image.shape[:2]
+        if self._torch is not None:
+            return self._warp_gpu(image, M)
+        return cv2.warpAffine(image, M[:2], (w, h),
+                              borderMode=cv2.BORDER_CONSTANT,
+                              borderValue=(0, 0, 0))
+    
+    def _warp_gpu(self, image: np.ndarray, M: np.ndarray) -> np.ndarray:
+        """Kornia equivalent of the warpAffine in _warp, run on self.device"""
+        torch = self._torch
+        h, w = image.shape[:2]
+        with torch.inference_mode():
+            src = torch.from_numpy(image).to(self.device).permute(2, 0, 1).unsqueeze(0).float()
+            A = torch.from_numpy(M[:2]).to(self.device, torch.float32).unsqueeze(0)
+            out = self._kornia.geometry.transform.warp_affine(
+                src, A, dsize=(h, w), mode='bilinear', padding_mode='zeros', align_corners=True
+            )
+            out = out.squeeze(0).permute(1, 2, 0).round_().clamp_(0, 255).to(torch.uint8)
+            return out.cpu().numpy()
+    
+    @staticmethod
+    def _transform_bboxes(bboxes, M: np.ndarray, w: int, h: int) -> np.ndarray:
+        """
+        Map YOLO bboxes through a 3x3 affine matrix
+        
+        All four corners of every box are transformed at once and the
+        axis-aligned box around them is taken, clipped to the image. Boxes
+        whose center leaves the image are dropped.
         
-        return zoomed, zoomed_bboxes
+        Returns:
+            Nx5 array [class, x_center, y_center, width, height]
+        """
+        boxes = np.array(bboxes, dtype=np.float64).reshape(-1, 5)
+        if len(boxes) == 0:
+            return boxes
+        
+        x, y = boxes[:, 1] * w, boxes[:, 2] * h
+        half_w, half_h = boxes[:, 3] * w / 2, boxes[:, 4] * h / 2
+        
+        # Corners (N, 4, 3) in homogeneous pixel-index coordinates (warpAffine's convention)
+        corners = np.ones((len(boxes), 4, 3))
+        corners[:, :, 0] = np.stack([x - half_w, x + half_w, x + half_w, x - half_w], axis=1) - 0.5
+        corners[:, :, 1] = np.stack([y - half_h, y - half_h, y + half_h, y + half_h], axis=1) - 0.5
+        mapped = corners @ M[:2].T + 0.5
+        
+        x0, y0 = mapped[..., 0].min(axis=1), mapped[..., 1].min(axis=1)
+        x1, y1 = mapped[..., 0].max(axis=1), mapped[..., 1].max(axis=1)
+        
+        # Keep only boxes whose center is still visible
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        keep = (cx >= 0) & (cx <= w) & (cy >= 0) & (cy <= h)
+        
+        x0, x1 = np.clip(x0[keep], 0, w), np.clip(x1[keep], 0, w)
+        y0, y1 = np.clip(y0[keep], 0, h), np.clip(y1[keep], 0, h)
+        
+        out = np.empty((int(keep.sum()), 5))
+        out[:, 0] = boxes[keep, 0]
+        out[:, 1] = (x0 + x1) / (2 * w)
+        out[:, 2] = (y0 + y1) / (2 * h)
+        out[:, 3] = (x1 - x0) / w
+        out[:, 4] = (y1 - y0) / h
+        return out
     
-    def add_noise(self, image: np.ndarray) -> np.ndarray:
+    def add_noise(self, image: np.ndarray, rng: Optional[np.random.Generator] = None) -> np.ndarray:
         """
         Add Gaussian noise to image
         
         Args:
             image: Input image
+            rng: Generator that seeds the noise (OpenCV's global RNG state is used if None)
             
         Returns:
             Noisy image
         """
-        noise = np.random.normal(0, self.noise_std, image.shape).astype(np.float32)
-        noisy = np.clip(image.astype(np.float32) + noise, 0, 255).astype(np.uint8)
-        return noisy
+        noise = self._noise_bufs.get(image.shape)
+        if noise is None:
+            noise = self._noise_bufs[image.shape] = np.empty(image.shape, dtype=np.int16)
+        if rng is not None:
+            # cv2.randn fills int16 directly; seed it from the variant's stream
+            cv2.setRNGSeed(int(rng.integers(2**31)))
+        # Scalars would only apply to channel 0, so give every channel its mean/stddev
+        channels = image.shape[2] if image.ndim == 3 else 1
+        cv2.randn(noise, (0,) * channels, (self.noise_std,) * channels)
+        # Saturating uint8 add: no float32 copies of the image
+        return cv2.add(image, noise, dtype=cv2.CV_8U)
     
     def apply_augmentations(
         self, 
         image: np.ndarray, 
         bboxes: List[List[float]],
-        augmentation_id: int = 0
+        augmentation_id: int = 0,
+        rng: Optional[np.random.Generator] = None
     ) -> Tuple[np.ndarray, List[List[float]], str]:
         """
         Apply random augmentations to image and bboxes
@@ -215,51 +378,78 @@ class DataAugmentor:
             image: Input image
             bboxes: YOLO format bboxes
             augmentation_id: ID for this augmentation variant
+            rng: Source of every random draw (a fresh unseeded Generator if None)
             
         Returns:
             Augmented image, adjusted bboxes, and augmentation description
         """
-        aug_image = image.copy()
-        aug_bboxes = bboxes.copy()
+        if rng is None:
+            rng = np.random.default_rng()
+        
+        # Every op below returns a new array, so the input is never modified and needs no copy
+        aug_image = image
+        # Nx5 array [class, x_center, y_center, width, height] so bbox updates are vectorized
+        aug_bboxes = np.array(bboxes, dtype=np.float64).reshape(-1, 5)
         aug_desc = []
         
         # Brightness adjustment
-        if random.random() < self.brightness_prob:
-            delta = random.randint(self.brightness_range[0], self.brightness_range[1])
-            aug_image = self.adjust_brightness(aug_image, delta)
+        delta = None
+        if rng.random() < self.brightness_prob:
+            delta = int(rng.integers(self.brightness_range[0], self.brightness_range[1], endpoint=True))
             aug_desc.append(f"bright{delta:+d}")
         
         # Contrast adjustment
-        if random.random() < self.contrast_prob:
-            factor = random.uniform(self.contrast_range[0], self.contrast_range[1])
-            aug_image = self.adjust_contrast(aug_image, factor)
+        factor = None
+        if rng.random() < self.contrast_prob:
+            factor = float(rng.uniform(self.contrast_range[0], self.contrast_range[1]))
             aug_desc.append(f"contrast{factor:.2f}")
         
+        # Both photometric changes share one output buffer
+        aug_image = self.adjust_brightness_contrast(aug_image, delta, factor)
+        
+        # Geometric transforms are composed into one matrix and applied with a single warp
+        h, w = aug_image.shape[:2]
+        M = np.eye(3)
+        warp = False
+        angle, scale = 0.0, 1.0
+        
         # Horizontal flip (basketball: OK to flip horizontally, NOT vertically)
-        if random.random() < self.flip_prob:
-            aug_image, aug_bboxes = self.horizontal_flip(aug_image, aug_bboxes)
+        flipped = rng.random() < self.flip_prob
+        if flipped:
+            M = self._flip_matrix(w) @ M
             aug_desc.append("hflip")
         
         # Rotation (small angles only for basketball)
-        if random.random() < self.rotation_prob:
-            angle = random.uniform(self.rotation_range[0], self.rotation_range[1])
-            aug_image, aug_bboxes = self.rotate_image(aug_image, angle, aug_bboxes)
+        if rng.random() < self.rotation_prob:
+            angle = float(rng.uniform(self.rotation_range[0], self.rotation_range[1]))
+            warp = True
             aug_desc.append(f"rot{angle:.1f}")
         
-        # Zoom
-        if random.random() < self.zoom_prob:
-            zoom_factor = random.uniform(self.zoom_range[0], self.zoom_range[1])
-            aug_image, aug_bboxes = self.zoom_image(aug_image, zoom_factor, aug_bboxes)
+        # Zoom (zoom out is a no-op)
+        if rng.random() < self.zoom_prob:
+            zoom_factor = float(rng.uniform(self.zoom_range[0], self.zoom_range[1]))
+            if zoom_factor > 1.0:
+                scale = zoom_factor
+                warp = True
             aug_desc.append(f"zoom{zoom_factor:.2f}")
         
+        if warp:
+            # Rotation and zoom share the image center, so one matrix covers both
+            M = self._rotation_matrix(w, h, angle, scale) @ M
+            aug_image = self._warp(aug_image, M)
+            aug_bboxes = self._transform_bboxes(aug_bboxes, M, w, h)
+        elif flipped:
+            # Pure flip: cv2.flip is exact and cheaper than a warp
+            aug_image, aug_bboxes = self.horizontal_flip(aug_image, aug_bboxes)
+        
         # Noise
-        if random.random() < self.noise_prob:
-            aug_image = self.add_noise(aug_image)
+        if rng.random() < self.noise_prob:
+            aug_image = self.add_noise(aug_image, rng)
             aug_desc.append("noise")
         
         aug_name = f"aug{augmentation_id}_" + "_".join(aug_desc) if aug_desc else f"aug{augmentation_id}"
         
-        return aug_image, aug_bboxes, aug_name
+        return aug_image, np.asarray(aug_bboxes, dtype=np.float64).reshape(-1, 5).tolist(), aug_name
     
     def parse_yolo_annotation(self, annotation_path: str) -> List[List[float]]:
         """
@@ -271,34 +461,180 @@ class DataAugmentor:
         Returns:
             List of bboxes [[class, x_center, y_center, width, height], ...]
         """
-        if not os.path.exists(annotation_path):
+        # One read and one pass over the lines; a missing file means no boxes
+        try:
+            with open(annotation_path, 'r') as f:
+                rows = [line.split() for line in f.read().splitlines()]
+        except FileNotFoundError:
             return []
         
-        bboxes = []
-        with open(annotation_path, 'r') as f:
-            for line in f:
-                parts = line.strip().split()
-                if len(parts) >= 5:
-                    cls = int(parts[0])
-                    x, y, w, h = map(float, parts[1:5])
-                    bboxes.append([cls, x, y, w, h])
-        
-        return bboxes
+        return [[int(parts[0]), *map(float, parts[1:5])] for parts in rows if len(parts) >= 5]
     
     def save_yolo_annotation(self, annotation_path: str, bboxes: List[List[float]]) -> None:
         """
-        Save YOLO annotation file
+        Save YOLO annotation file (its folder must already exist, see _ensure_dir)
         
         Args:
             annotation_path: Path to save .txt annotation
             bboxes: List of bboxes
         """
-        os.makedirs(os.path.dirname(annotation_path), exist_ok=True)
-        
+        # Format the whole file first and write it in one call
+        lines = [f"{int(cls)} {x:.6f} {y:.6f} {w:.6f} {h:.6f}\n" for cls, x, y, w, h in bboxes]
         with open(annotation_path, 'w') as f:
-            for bbox in bboxes:
-                cls, x, y, w, h = bbox
-                f.write(f"{int(cls)} {x:.6f} {y:.6f} {w:.6f} {h:.6f}\n")
+            f.write("".join(lines))
+    
+    def augment_image(self, img_path: Path, input_path: Path, output_path: Path) -> Optional[int]:
+        """
+        Copy one image (and its annotation) to the output tree and write its augmented variants
+        
+        Each variant's random draws are seeded from the image content, so its
+        output is reproducible. A hidden .<name>.aug.json manifest next to the
+        outputs records the image and label hashes, settings and per-variant
+        seeds; when it still matches on a re-run, the image is skipped.
+        
+        Args:
+            img_path: Image to augment
+            input_path: Root of the input tree (for the relative output folder)
+            output_path: Root of the output tree
+            
+        Returns:
+            Number of augmented variants written, or None if the image couldn't be read
+        """
+        # Read image bytes once: they key the cache and are decoded below
+        try:
+            with open(img_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            data = b''
+        
+        # Calculate relative path to preserve folder structure (once per input folder)
+        parent_key = (img_path.parent, input_path)
+        relative_folder = self._relative_folders.get(parent_key)
+        if relative_folder is None:
+            try:
+                relative_folder = img_path.parent.relative_to(input_path)
+            except ValueError:
+                # Fallback if path is not relative
+                relative_folder = Path("")
+            self._relative_folders[parent_key] = relative_folder
+        
+        # Create output subfolder matching input structure
+        output_subfolder = output_path / relative_folder
+        self._ensure_dir(output_subfolder)
+        
+        # The annotation shapes the outputs too (boxes are transformed per variant)
+        ann_path = img_path.with_suffix('.txt')
+        try:
+            with open(ann_path, 'rb') as f:
+                label_data = f.read()
+        except FileNotFoundError:
+            label_data = b''
+        
+        # Skip images whose variants are already on disk for the same content, labels and settings
+        orig_name = img_path.stem
+        content_key = hashlib.blake2b(data, digest_size=16).hexdigest()
+        label_key = hashlib.blake2b(label_data, digest_size=16).hexdigest()
+        manifest_path = output_subfolder / f".{orig_name}.aug.json"
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            if (manifest.get('source') == content_key and manifest.get('labels') == label_key
+                    and manifest.get('settings') == self._settings_key
+                    and all((output_subfolder / name).exists() for name in manifest.get('files', []))):
+                return len(manifest.get('variants', []))
+        except (OSError, ValueError):
+            pass
+        
+        # JPEG originals are copied byte-for-byte, so only decode when variants are needed
+        is_jpeg = img_path.suffix.lower() in ('.jpg', '.jpeg')
+        needs_pixels = self.aug_per_image > 0 or not is_jpeg
+        image = self._decode_image(data, img_path.suffix) if data and needs_pixels else None
+        if not data or (needs_pixels and image is None):
+            logger.warning(f"Failed to read: {img_path}")
+            return None
+        
+        # Parse annotation
+        bboxes = self.parse_yolo_annotation(str(ann_path))
+        
+        # Copy original with same name (JPEG bytes as-is: no re-encode, no quality loss)
+        orig_output_path = output_subfolder / f"{orig_name}.jpg"
+        if is_jpeg:
+            with open(orig_output_path, 'wb') as f:
+                f.write(data)
+        else:
+            self._write_jpeg(orig_output_path, image)
+        files = [orig_output_path.name]
+        
+        orig_ann_path = output_subfolder / f"{orig_name}.txt"
+        if bboxes:
+            self.save_yolo_annotation(str(orig_ann_path), bboxes)
+        else:
+            # Drop a label left by an earlier run from before a relabel
+            orig_ann_path.unlink(missing_ok=True)
+        
+        # Generate augmentations in the same subfolder
+        variants = []
+        for aug_id in range(self.aug_per_image):
+            seed = (int(content_key[:16], 16) + aug_id) % 2**32
+            rng = np.random.default_rng((self.seed, seed))
+            aug_image, aug_bboxes, aug_desc = self.apply_augmentations(
+                image, bboxes, aug_id + 1, rng
+            )
+            
+            # Save augmented image in same subfolder
+            aug_name = f"{orig_name}_{aug_desc}"
+            aug_output_path = output_subfolder / f"{aug_name}.jpg"
+            self._write_jpeg(aug_output_path, aug_image)
+            files.append(aug_output_path.name)
+            variants.append({'name': aug_name, 'seed': seed})
+            
+            # Save augmented annotation in same subfolder
+            aug_ann_path = output_subfolder / f"{aug_name}.txt"
+            if aug_bboxes:
+                self.save_yolo_annotation(str(aug_ann_path), aug_bboxes)
+            else:
+                aug_ann_path.unlink(missing_ok=True)
+        
+        # Written last, so an interrupted image is redone on the next run
+        tmp_path = manifest_path.with_name(f"{manifest_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({'source': content_key, 'labels': label_key, 'settings': self._settings_key,
+                       'files': files, 'variants': variants}, f)
+        os.replace(tmp_path, manifest_path)
+        
+        return len(variants)
+    
+    def _ensure_dir(self, path: Path) -> None:
+        """Create an output folder once per process"""
+        if path not in self._created_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._created_dirs.add(path)
+    
+    def _decode_image(self, data: bytes, suffix: str) -> Optional[np.ndarray]:
+        """Decode image bytes to BGR, with libjpeg-turbo for JPEGs when available"""
+        if _TURBOJPEG is not None and suffix.lower() in ('.jpg', '.jpeg'):
+            try:
+                return _TURBOJPEG.decode(data, pixel_format=TJPF_BGR)
+            except Exception:
+                pass  # fall back to OpenCV below
+        return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    
+    def _write_jpeg(self, path: Path, image: np.ndarray) -> None:
+        """Encode a BGR image as JPEG in memory (libjpeg-turbo when available) and write it in one call"""
+        encoded = None
+        if _TURBOJPEG is not None:
+            try:
+                encoded = _TURBOJPEG.encode(image, quality=self.jpeg_quality, pixel_format=TJPF_BGR)
+            except Exception:
+                pass  # fall back to OpenCV below
+        if encoded is None:
+            ok, encoded = cv2.imencode('.jpg', image, self._jpeg_params)
+            if not ok:
+                logger.warning(f"Failed to encode: {path}")
+                return
+        # Unbuffered: the encoded buffer goes straight to a single write syscall
+        with open(path, 'wb', buffering=0) as f:
+            f.write(encoded)
     
     def augment_dataset(
         self, 
@@ -325,10 +661,7 @@ class DataAugmentor:
         os.makedirs(output_dir, exist_ok=True)
         
         # Find images
-        image_extensions = ['.jpg', '.jpeg', '.png']
-        image_files = []
-        for ext in image_extensions:
-            image_files.extend(Path(input_dir).glob(f'**/*{ext}'))
+        image_files = list(_iter_images(input_dir))
         
         if not image_files:
             logger.warning(f"No images found in: {input_dir}")
@@ -342,61 +675,30 @@ class DataAugmentor:
         input_path = Path(input_dir)
         output_path = Path(output_dir)
         
-        for img_path in image_files:
-            # Read image
-            image = cv2.imread(str(img_path))
-            if image is None:
-                logger.warning(f"Failed to read: {img_path}")
-                continue
-            
-            # Calculate relative path to preserve folder structure
-            try:
-                relative_path = img_path.relative_to(input_path)
-                relative_folder = relative_path.parent
-            except ValueError:
-                # Fallback if path is not relative
-                relative_folder = Path("")
-            
-            # Create output subfolder matching input structure
-            output_subfolder = output_path / relative_folder
-            os.makedirs(output_subfolder, exist_ok=True)
-            
-            # Find annotation file
-            ann_path = img_path.with_suffix('.txt')
-            bboxes = self.parse_yolo_annotation(str(ann_path))
-            
-            # Copy original with same name
-            orig_name = img_path.stem
-            orig_output_path = output_subfolder / f"{orig_name}.jpg"
-            cv2.imwrite(str(orig_output_path), image)
-            
-            if bboxes:
-                orig_ann_path = output_subfolder / f"{orig_name}.txt"
-                self.save_yolo_annotation(str(orig_ann_path), bboxes)
-            
-            total_original += 1
-            
-            # Generate augmentations in the same subfolder
-            for aug_id in range(self.aug_per_image):
-                aug_image, aug_bboxes, aug_desc = self.apply_augmentations(
-                    image, bboxes, aug_id + 1
-                )
-                
-                # Save augmented image in same subfolder
-                aug_name = f"{orig_name}_{aug_desc}"
-                aug_output_path = output_subfolder / f"{aug_name}.jpg"
-                cv2.imwrite(str(aug_output_path), aug_image)
+        tasks = [(img_path, input_path, output_path) for img_path in image_files]
+        if self.workers > 1 and len(tasks) > 1:
+            # Images are independent: decode, augment and encode them in parallel
+            executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                           initargs=(self.config,))
+            results = executor.map(_augment_one, tasks, chunksize=16)
+        else:
+            executor = None
+            results = (self.augment_image(*task) for task in tasks)
+        
+        try:
+            for augmented in results:
+                if augmented is None:
+                    continue
                 
-                # Save augmented annotation in same subfolder
-                if aug_bboxes:
-                    aug_ann_path = output_subfolder / f"{aug_name}.txt"
-                    self.save_yolo_annotation(str(aug_ann_path), aug_bboxes)
+                total_original += 1
+                total_augmented += augmented
                 
-                total_augmented += 1
-            
-            if (total_original + total_augmented) % 100 == 0:
-                logger.info(f"Processed {total_original} images, "
-                          f"generated {total_augmented} augmented variants")
+                if (total_original + total_augmented) % 100 == 0:
+                    logger.info(f"Processed {total_original} images, "
+                              f"generated {total_augmented} augmented variants")
+        finally:
+            if executor is not None:
+                executor.shutdown()
         
         logger.info(f"\n{'='*50}")
         logger.info(f"AUGMENTATION SUMMARY")
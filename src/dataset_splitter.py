@@ -17,13 +17,27 @@ import os
 import shutil
 import random
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Tuple
 
 import logging
 
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
+# Linux ioctl that makes dst a copy-on-write clone of src (Btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+COPY_MODES = ("auto", "reflink", "link", "copy")
+
+# Image/label pairs copied concurrently (copies are I/O bound and release the GIL)
+COPY_WORKERS = 16
+
 
 class DatasetSplitter:
     def __init__(self, config: Dict):
@@ -37,6 +51,10 @@ class DatasetSplitter:
         self.seed = int(self.split_cfg.get("seed", 42))
         self.split_by = str(self.split_cfg.get("split_by", "video"))
         self.create_empty_labels = bool(self.split_cfg.get("create_empty_labels", True))
+        self.copy_mode = str(self.split_cfg.get("copy_mode", "auto"))
+        if self.copy_mode not in COPY_MODES:
+            logger.warning(f"Unknown copy_mode={self.copy_mode}. Defaulting to 'copy'.")
+            self.copy_mode = "copy"
 
         # IO
         self.input_dir = Path(self.split_cfg.get("input_dir", "data/augmented"))
@@ -52,11 +70,13 @@ class DatasetSplitter:
             logger.error(f"Input directory not found: {self.input_dir}")
             return videos
 
-        for sub in sorted(self.input_dir.iterdir()):
-            if sub.is_dir():
-                count = len([p for p in sub.glob("*.jpg")])
-                if count > 0:
-                    videos.append((sub, count))
+        with os.scandir(self.input_dir) as entries:
+            subdirs = sorted(e.path for e in entries if e.is_dir())
+        for sub in subdirs:
+            with os.scandir(sub) as entries:
+                count = sum(1 for e in entries if e.name.endswith(".jpg"))
+            if count > 0:
+                videos.append((Path(sub), count))
 
         if not videos:
             logger.error(f"No video folders with images found in: {self.input_dir}")
@@ -98,29 +118,70 @@ class DatasetSplitter:
             (base / split / "images").mkdir(parents=True, exist_ok=True)
             (base / split / "labels").mkdir(parents=True, exist_ok=True)
 
+    def _copy_file(self, src: Path, dst: Path):
+        """Place src at dst according to copy_mode, falling back to a plain copy."""
+        # The output dir is reused across runs: dst may be a hard link or symlink to
+        # src from an earlier run, and opening it for writing would truncate src
+        if os.path.lexists(dst):
+            if os.path.exists(dst) and os.path.samefile(src, dst):
+                return
+            dst.unlink()
+
+        if self.copy_mode in ("auto", "reflink") and fcntl is not None:
+            try:
+                with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                    fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                shutil.copystat(src, dst)
+                return
+            except OSError:
+                pass  # filesystem without reflinks or across devices
+        elif self.copy_mode == "link":
+            try:
+                # Trainers only read the split, so sharing the inode is safe
+                os.link(src, dst)
+                return
+            except OSError:
+                pass  # across filesystems
+
+        shutil.copy2(src, dst)
+
     def _copy_image_and_label(self, src_img: Path, dst_images_dir: Path, dst_labels_dir: Path):
         # Copy image
         dst_img = dst_images_dir / src_img.name
-        shutil.copy2(src_img, dst_img)
+        self._copy_file(src_img, dst_img)
 
         # Label handling
         src_lbl = src_img.with_suffix(".txt")
         dst_lbl = dst_labels_dir / src_lbl.name
         if src_lbl.exists():
-            shutil.copy2(src_lbl, dst_lbl)
+            self._copy_file(src_lbl, dst_lbl)
         elif self.create_empty_labels:
             dst_lbl.write_text("")
         else:
             # Skip creating label file; some trainers require empty files
             pass
 
-    def _copy_video_folder(self, video_folder: Path, split_name: str):
+    def _copy_jobs(self, video_folder: Path, split_name: str) -> List[Tuple[Path, Path, Path]]:
+        """Return (src_img, dst_images_dir, dst_labels_dir) for every image in a video folder."""
         dst_images = self.output_dir / split_name / "images"
         dst_labels = self.output_dir / split_name / "labels"
 
-        imgs = sorted(video_folder.glob("*.jpg"))
-        for img in imgs:
-            self._copy_image_and_label(img, dst_images, dst_labels)
+        return [(img, dst_images, dst_labels) for img in sorted(video_folder.glob("*.jpg"))]
+
+    def _copy_video_folder(self, video_folder: Path, split_name: str):
+        for job in self._copy_jobs(video_folder, split_name):
+            self._copy_image_and_label(*job)
+
+    def _copy_splits(self, train, val, test):
+        jobs = []
+        for split_name, folders in (("train", train), ("val", val), ("test", test)):
+            for p, _ in folders:
+                jobs.extend(self._copy_jobs(p, split_name))
+
+        with ThreadPoolExecutor(max_workers=COPY_WORKERS) as executor:
+            # Drain the iterator so copy errors propagate
+            for _ in executor.map(lambda job: self._copy_image_and_label(*job), jobs):
+                pass
 
     def _write_data_yaml(self):
         data_yaml = self.output_dir / "data.yaml"
@@ -176,12 +237,7 @@ class DatasetSplitter:
         self._ensure_dirs(self.output_dir)
 
         # Copy files
-        for p, _ in train:
-            self._copy_video_folder(p, "train")
-        for p, _ in val:
-            self._copy_video_folder(p, "val")
-        for p, _ in test:
-            self._copy_video_folder(p, "test")
+        self._copy_splits(train, val, test)
 
         # Write artifacts
         self._write_data_yaml()
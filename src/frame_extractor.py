@@ -9,13 +9,104 @@ Extracts frames from basketball videos with adaptive sampling based on dataset s
 '''
 
 import cv2
+import numpy as np
 import os
+import json
+import shutil
+import subprocess
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Optional libjpeg-turbo codec (pip install PyTurboJPEG); cv2 is used otherwise
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    _TURBOJPEG = TurboJPEG()
+except Exception:
+    _TURBOJPEG = None
+
+# Background JPEG encoders per video, and frames allowed to wait for them
+WRITE_THREADS = 4
+WRITE_QUEUE_SIZE = 32
+
+# Extractor of a worker process in FrameExtractor.extract_frames_from_videos
+_WORKER_EXTRACTOR = None
+
+
+def _init_worker(config: Dict) -> None:
+    """Set up logging and build the worker's extractor once"""
+    global _WORKER_EXTRACTOR
+    # Spawned children start without the parent's logging handlers
+    from .utils import setup_logging
+    setup_logging(config)
+    _WORKER_EXTRACTOR = FrameExtractor(config)
+
+
+def _write_frame(path: str, frame, jpeg_quality: Optional[int]) -> bool:
+    """Write a BGR frame; JPEGs are encoded with libjpeg-turbo when available"""
+    if jpeg_quality is None:
+        return cv2.imwrite(path, frame)
+    if _TURBOJPEG is not None:
+        try:
+            encoded = _TURBOJPEG.encode(frame, quality=jpeg_quality, pixel_format=TJPF_BGR)
+            with open(path, 'wb') as f:
+                f.write(encoded)
+            return True
+        except Exception:
+            pass  # fall back to OpenCV below
+    return cv2.imwrite(path, frame, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
+
+
+class _FrameWriter:
+    """Encode and write frames on background threads so decoding doesn't wait on imwrite"""
+    
+    def __init__(self, threads: int = WRITE_THREADS, queue_size: int = WRITE_QUEUE_SIZE):
+        # Bounded, so a slow disk throttles the decoder instead of piling up frames
+        self._queue = queue.Queue(maxsize=queue_size)
+        self.failed = []
+        self._threads = [threading.Thread(target=self._run, daemon=True) for _ in range(threads)]
+        for thread in self._threads:
+            thread.start()
+    
+    def put(self, path: str, frame, jpeg_quality: Optional[int]) -> None:
+        self._queue.put((path, frame, jpeg_quality))
+    
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            path, frame, jpeg_quality = item
+            # Any error only fails this frame: a dead writer thread would leave
+            # put() blocked forever on the full queue
+            try:
+                ok = _write_frame(path, frame, jpeg_quality)
+            except Exception as e:
+                logger.debug(f"Failed to write {path}: {e}")
+                ok = False
+            if not ok:
+                self.failed.append(path)
+    
+    def close(self) -> None:
+        """Wait for every queued frame to be written"""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+
+def _extract_one(task: Tuple[str, str, int, str, str]) -> Dict:
+    """Worker entry point: extract one video (see FrameExtractor.extract_frames_from_video)"""
+    progress, video_path, frame_interval, video_name, output_dir = task
+    logger.info(f"\n{progress} Processing: {video_name}")
+    return _WORKER_EXTRACTOR.extract_frames_from_video(video_path, output_dir, frame_interval, video_name)
+
 
 class FrameExtractor:
     """
@@ -37,10 +128,38 @@ class FrameExtractor:
         self.small_interval = self.frame_config.get('small_dataset_interval', 3)
         self.large_interval = self.frame_config.get('large_dataset_interval', 7)
         self.max_frames = self.frame_config.get('max_frames_per_video', None)
+        self.use_gpu_decode = bool(self.frame_config.get('use_gpu_decode', False))
+        self.decoder = str(self.frame_config.get('decoder', 'opencv')).lower()
+        
+        # Videos decoded in parallel processes; each decode is already multithreaded,
+        # and with GPU decode every process would hold its own CUDA context
+        default_workers = 1 if self.use_gpu_decode else max(1, (os.cpu_count() or 1) // 2)
+        self.workers = int(self.frame_config.get('workers', default_workers))
+        self._pool = None
+        
+        # FFmpeg decoder threads per video, splitting the CPUs between the workers
+        self.decode_threads = int(self.frame_config.get(
+            'decode_threads', max(1, (os.cpu_count() or 1) // max(1, self.workers))
+        ))
         
         logger.info(f"FrameExtractor initialized with small_interval={self.small_interval}, "
                    f"large_interval={self.large_interval}")
     
+    def _worker_pool(self) -> ProcessPoolExecutor:
+        """Worker processes, started on first use and kept until close()"""
+        if self._pool is None:
+            # Spawned, not forked: callers may already hold CUDA state and running threads
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context('spawn'),
+                                             initializer=_init_worker, initargs=(self.config,))
+        return self._pool
+    
+    def close(self) -> None:
+        """Shut down the worker processes, if any were started"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+    
     def determine_frame_interval(self, num_videos: int) -> int:
         """
         Always extract every 30th frame, regardless of dataset size or config.
@@ -49,12 +168,125 @@ class FrameExtractor:
         logger.info(f"Frame extraction interval forced to: {interval}")
         return interval
     
+    def _open_gpu_reader(self, video_path: str):
+        """Open an NVDEC reader (cv2.cudacodec), or None to decode on the CPU"""
+        try:
+            if cv2.cuda.getCudaEnabledDeviceCount() == 0:
+                raise RuntimeError("no CUDA device")
+            return cv2.cudacodec.createVideoReader(video_path)
+        except (AttributeError, RuntimeError, cv2.error) as e:
+            logger.warning(f"GPU decode unavailable ({e}), decoding on the CPU")
+            self.use_gpu_decode = False
+            return None
+    
+    def _iter_frames(self, cap, video_path: str, frame_interval: int):
+        """
+        Yield (frame_number, frame) for every frame_interval-th frame, up to max_frames
+        
+        On the CPU every frame is grab()bed but only the kept ones are
+        retrieve()d. With use_gpu_decode, frames are decoded by NVDEC and only
+        the kept ones are downloaded to host memory.
+        """
+        if self.decoder == 'ffmpeg':
+            frames = self._ffmpeg_frames(cap, video_path, frame_interval)
+            if frames is not None:
+                kept = yield from frames
+                if kept is not None:
+                    return
+        
+        reader = self._open_gpu_reader(video_path) if self.use_gpu_decode else None
+        frame_count = 0
+        kept = 0
+        
+        while True:
+            if reader is not None:
+                ret, gpu_frame = reader.nextFrame()
+            else:
+                ret = cap.grab()
+            if not ret:
+                return
+            
+            if frame_count % frame_interval == 0:
+                # Check max frames limit
+                if self.max_frames and kept >= self.max_frames:
+                    logger.info(f"Reached max frames limit: {self.max_frames}")
+                    return
+                
+                if reader is not None:
+                    frame = gpu_frame.download()
+                    if frame.ndim == 3 and frame.shape[2] == 4:  # NVDEC output is BGRA
+                        frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+                else:
+                    ret, frame = cap.retrieve()
+                    if not ret:
+                        return
+                
+                yield frame_count, frame
+                kept += 1
+            
+            frame_count += 1
+    
+    def _ffmpeg_frames(self, cap, video_path: str, frame_interval: int):
+        """
+        Frame generator reading kept frames from an ffmpeg pipe, or None if it can't be used
+        
+        ffmpeg's select filter drops the other frames before pixel-format
+        conversion, so only every Nth frame is converted to BGR and piped.
+        """
+        ffmpeg = shutil.which('ffmpeg')
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        if ffmpeg is None or width <= 0 or height <= 0:
+            logger.warning("ffmpeg decoder unavailable, decoding with OpenCV")
+            return None
+        # OpenCV auto-rotates; keep it for rotated videos so outputs don't change
+        if cap.get(getattr(cv2, 'CAP_PROP_ORIENTATION_META', -1)) not in (0, -1):
+            return None
+        
+        cmd = [ffmpeg, '-hide_banner', '-loglevel', 'error', '-nostats']
+        if self.use_gpu_decode:
+            cmd += ['-hwaccel', 'cuda']
+        cmd += ['-i', video_path, '-an', '-sn',
+                '-vf', f"select=not(mod(n\\,{frame_interval}))", '-vsync', 'vfr']
+        if self.max_frames:
+            # One extra frame tells whether the limit cut the video short
+            cmd += ['-frames:v', str(self.max_frames + 1)]
+        cmd += ['-f', 'rawvideo', '-pix_fmt', 'bgr24', 'pipe:1']
+        return self._read_raw_frames(cmd, width, height, frame_interval)
+    
+    def _read_raw_frames(self, cmd: List[str], width: int, height: int, frame_interval: int):
+        """Yield (frame_number, frame) from ffmpeg rawvideo output; return the count, or None if ffmpeg failed"""
+        frame_bytes = width * height * 3
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=frame_bytes)
+        kept = 0
+        try:
+            while True:
+                buf = proc.stdout.read(frame_bytes)
+                if len(buf) < frame_bytes:
+                    break
+                if self.max_frames and kept >= self.max_frames:
+                    logger.info(f"Reached max frames limit: {self.max_frames}")
+                    break
+                yield kept * frame_interval, np.frombuffer(buf, dtype=np.uint8).reshape(height, width, 3)
+                kept += 1
+        finally:
+            proc.stdout.close()
+            if proc.poll() is None:
+                proc.kill()
+            proc.wait()
+        
+        if kept == 0 and proc.returncode != 0:
+            logger.warning(f"ffmpeg decode failed (exit code {proc.returncode}), decoding with OpenCV")
+            return None
+        return kept
+    
     def extract_frames_from_video(
         self, 
         video_path: str, 
         output_dir: str, 
         frame_interval: int,
-        video_name: str = None
+        video_name: str = None,
+        quality_filter=None
     ) -> Dict:
         """
         Extract frames from a single video
@@ -64,6 +296,8 @@ class FrameExtractor:
             output_dir: Directory to save extracted frames
             frame_interval: Extract every Nth frame
             video_name: Optional custom name for the video
+            quality_filter: Optional QualityFilter; decoded frames are scored in
+                memory and only passing ones are written
             
         Returns:
             Dictionary with extraction statistics
@@ -75,11 +309,19 @@ class FrameExtractor:
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
         
-        # Open video
-        cap = cv2.VideoCapture(video_path)
+        # Open video with the decoder thread count passed per capture, not through
+        # the process-wide environment; an explicit OPENCV_FFMPEG_CAPTURE_OPTIONS wins.
+        # Fall back to OpenCV's backend auto-selection
+        cap = None
+        if hasattr(cv2, 'CAP_PROP_N_THREADS') and 'OPENCV_FFMPEG_CAPTURE_OPTIONS' not in os.environ:
+            cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG, [cv2.CAP_PROP_N_THREADS, self.decode_threads])
+        if cap is None or not cap.isOpened():
+            cap = cv2.VideoCapture(video_path)
         if not cap.isOpened():
             logger.error(f"Failed to open video: {video_path}")
             return {'success': False, 'error': 'Failed to open video'}
+        # Keep at most one decoded frame queued in the backend
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
         
         # Get video properties
         fps = cap.get(cv2.CAP_PROP_FPS)
@@ -90,27 +332,35 @@ class FrameExtractor:
         logger.info(f"FPS: {fps}, Total frames: {total_frames}, Duration: {duration:.2f}s")
         
         # Extract frames
-        frame_count = 0
         saved_count = 0
-        metadata = []
         
         if video_name is None:
             video_name = Path(video_path).stem
         
+        # Per-frame records are streamed to a JSONL file next to the frames rather
+        # than kept in memory (named per video, since folders may be shared)
+        metadata_path = None
+        metadata_file = None
+        if self.output_config.get('save_metadata', True):
+            metadata_path = os.path.join(output_dir, f"{video_name}_frames.jsonl")
+            metadata_file = open(metadata_path, 'w')
+        
         frame_format = self.output_config.get('frame_format', 'jpg')
         frame_quality = self.output_config.get('frame_quality', 95)
+        jpeg_quality = int(frame_quality) if frame_format.lower() in ['jpg', 'jpeg'] else None
         
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
+        # Every frame handed over is a fresh array, so the writers need no copies
+        writer = _FrameWriter()
+        if quality_filter is not None:
+            # Each video starts a new reference sequence
+            quality_filter.previous_frame = None
+            quality_filter.previous_metric_frame = None
+            quality_filter.previous_hash = None
+        try:
             # Extract every Nth frame
-            if frame_count % frame_interval == 0:
-                # Check max frames limit
-                if self.max_frames and saved_count >= self.max_frames:
-                    logger.info(f"Reached max frames limit: {self.max_frames}")
-                    break
+            for frame_count, frame in self._iter_frames(cap, video_path, frame_interval):
+                if quality_filter is not None and not quality_filter.filter_frame(frame):
+                    continue
                 
                 # Generate frame filename
                 timestamp = frame_count / fps if fps > 0 else 0
@@ -118,28 +368,30 @@ class FrameExtractor:
                 frame_path = os.path.join(output_dir, frame_filename)
                 
                 # Save frame
-                if frame_format.lower() in ['jpg', 'jpeg']:
-                    cv2.imwrite(frame_path, frame, [cv2.IMWRITE_JPEG_QUALITY, frame_quality])
-                else:
-                    cv2.imwrite(frame_path, frame)
+                writer.put(frame_path, frame, jpeg_quality)
                 
                 # Store metadata
-                metadata.append({
-                    'frame_number': frame_count,
-                    'saved_index': saved_count,
-                    'timestamp': timestamp,
-                    'filename': frame_filename,
-                    'path': frame_path
-                })
+                if metadata_file is not None:
+                    metadata_file.write(json.dumps({
+                        'frame_number': frame_count,
+                        'saved_index': saved_count,
+                        'timestamp': timestamp,
+                        'filename': frame_filename,
+                        'path': frame_path
+                    }) + '\n')
                 
                 saved_count += 1
                 
                 if saved_count % 100 == 0:
                     logger.info(f"Extracted {saved_count} frames...")
-            
-            frame_count += 1
+        finally:
+            writer.close()
+            cap.release()
+            if metadata_file is not None:
+                metadata_file.close()
         
-        cap.release()
+        if writer.failed:
+            logger.warning(f"Failed to write {len(writer.failed)} frame(s), e.g. {writer.failed[0]}")
         
         logger.info(f"Extraction complete: {saved_count} frames saved from {total_frames} total frames")
         
@@ -153,7 +405,7 @@ class FrameExtractor:
             'duration': duration,
             'frame_interval': frame_interval,
             'output_dir': output_dir,
-            'metadata': metadata
+            'metadata_path': metadata_path
         }
     
     def extract_frames_from_videos(
@@ -174,31 +426,21 @@ class FrameExtractor:
             List of extraction results for each video
         """
         # Find all video files
-        video_extensions = ['.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv']
+        video_extensions = frozenset({'.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv'})
         found_files = []
         
-        video_dir_path = Path(video_dir)
-        
-        if recursive:
-            # Search recursively (for all_video_frames structure with subdirectories)
-            for ext in video_extensions:
-                found_files.extend(video_dir_path.glob(f'**/*{ext}'))
-                found_files.extend(video_dir_path.glob(f'**/*{ext.upper()}'))
-        else:
-            # Search only top level (old behavior)
-            for ext in video_extensions:
-                found_files.extend(video_dir_path.glob(f'*{ext}'))
-                found_files.extend(video_dir_path.glob(f'*{ext.upper()}'))
-
-        # Deduplicate by resolved absolute path
-        unique_map = {}
-        for f in found_files:
-            try:
-                key = str(f.resolve())
-            except Exception:
-                key = str(f)
-            unique_map[key] = f
-        video_files = sorted(unique_map.values(), key=lambda p: p.name.lower())
+        # Walk the tree once and match extensions case-insensitively; without
+        # recursive only the top level is searched (old behavior). os.walk lists
+        # every file exactly once, so no resolve()-based deduplication is needed
+        for root, dirs, files in os.walk(video_dir):
+            found_files.extend(
+                Path(root) / name for name in files
+                if os.path.splitext(name)[1].lower() in video_extensions
+            )
+            if not recursive:
+                break
+
+        video_files = sorted(found_files, key=lambda p: p.name.lower())
 
         if not video_files:
             logger.warning(f"No video files found in: {video_dir}")
@@ -210,12 +452,11 @@ class FrameExtractor:
         frame_interval = self.determine_frame_interval(len(video_files))
         
         # Process each video
-        results = []
         organize_by_video = self.output_config.get('organize_by_video', True)
         
+        tasks = []
         for idx, video_path in enumerate(video_files, 1):
             video_name = video_path.stem
-            logger.info(f"\n[{idx}/{len(video_files)}] Processing: {video_name}")
             
             # Create output directory with new naming: clipname__skip25/
             if organize_by_video:
@@ -223,14 +464,17 @@ class FrameExtractor:
             else:
                 output_dir = output_base_dir
             
-            # Extract frames
-            result = self.extract_frames_from_video(
-                str(video_path), 
-                output_dir, 
-                frame_interval,
-                video_name
-            )
-            results.append(result)
+            tasks.append((f"[{idx}/{len(video_files)}]", str(video_path), frame_interval, video_name, output_dir))
+        
+        if self.workers > 1 and len(tasks) > 1:
+            # Videos are independent: decode them in parallel processes, reusing the
+            # pool across calls so each worker imports cv2 only once
+            results = list(self._worker_pool().map(_extract_one, tasks))
+        else:
+            results = []
+            for progress, video_path, _, video_name, output_dir in tasks:
+                logger.info(f"\n{progress} Processing: {video_name}")
+                results.append(self.extract_frames_from_video(video_path, output_dir, frame_interval, video_name))
         
         # Summary
         total_extracted = sum(r.get('frames_extracted', 0) for r in results if r.get('success'))
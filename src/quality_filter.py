@@ -6,10 +6,16 @@ Filters frames based on quality metrics and basketball-specific criteria
 import cv2
 import numpy as np
 import os
+import json
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import logging
 
+from .frame_extractor import _write_frame
+
 # Try to import scikit-image, fall back to custom implementation if not available
 SSIM_AVAILABLE = False
 try:
@@ -22,18 +28,31 @@ except (ImportError, ValueError) as e:
 
 logger = logging.getLogger(__name__)
 
+# filter_frames decodes and scores frames on threads (OpenCV releases the GIL),
+# a window at a time so only FILTER_WINDOW decoded frames are held
+FILTER_THREADS = 4
+FILTER_WINDOW = 16
+
+# Side of the thumbnails SSIM is computed on (frame dedup doesn't need full resolution)
+SSIM_THUMB_SIZE = 64
+
+# Frames extracted at least this far apart are practically never near-duplicates
+SPARSE_FRAME_INTERVAL = 15
+
 
 class QualityFilter:
     """
     Filters frames based on image quality and basketball-specific criteria
     """
     
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, upstream_frame_interval: Optional[int] = None):
         """
         Initialize QualityFilter with configuration
         
         Args:
             config: Configuration dictionary containing quality filter settings
+            upstream_frame_interval: Extraction interval of the frames to be filtered; when
+                sparse and skip_similar_frames isn't set explicitly, the similarity check is skipped
         """
         self.config = config
         self.filter_config = config.get('quality_filter', {})
@@ -44,7 +63,14 @@ class QualityFilter:
         self.max_brightness = self.filter_config.get('max_brightness', 225)
         self.min_sharpness = self.filter_config.get('min_sharpness', 100)
         self.skip_similar = self.filter_config.get('skip_similar_frames', True)
+        if (upstream_frame_interval is not None and upstream_frame_interval > SPARSE_FRAME_INTERVAL
+                and 'skip_similar_frames' not in self.filter_config):
+            self.skip_similar = False
+            logger.info(f"Similarity check disabled: frames are {upstream_frame_interval} apart "
+                        f"(set skip_similar_frames to force it)")
         self.similarity_threshold = self.filter_config.get('similarity_threshold', 0.95)
+        # 'dhash' (64-bit difference hash, Hamming distance) or 'ssim' (full SSIM, much slower)
+        self.similarity_method = str(self.filter_config.get('similarity_method', 'dhash')).lower()
         self.detect_motion = self.filter_config.get('detect_motion', True)
         self.min_motion_score = self.filter_config.get('min_motion_score', 500)
 
@@ -52,10 +78,22 @@ class QualityFilter:
         fm_cfg = self.filter_config.get('fast_metrics', {})
         self.fast_metrics_enabled = fm_cfg.get('enabled', True)
         self.fast_metrics_max_dim = int(fm_cfg.get('max_dim', 640))
+        # Laplacian on a pyrDown'd half-size frame (4x fewer pixels). Variance is
+        # lower there, so min_sharpness has to be retuned when enabling this
+        self.sharpness_pyr_down = bool(fm_cfg.get('sharpness_pyr_down', False))
+
+        # Checks whose thresholds can never reject a frame are skipped outright
+        self._check_brightness = self.min_brightness > 0 or self.max_brightness < 255
+        self._check_sharpness = self.min_sharpness > 0
+        self._check_motion = self.detect_motion and self.min_motion_score > 0
 
         # Previous frames for temporal comparisons
-        self.previous_frame = None  # original-resolution frame (if needed later)
-        self.previous_metric_frame = None  # downsized frame used for metrics
+        self.previous_frame = None  # last accepted frame as read (half size for JPEGs with fast metrics)
+        self.previous_metric_frame = None  # downsized grayscale frame used for metrics
+        self.previous_hash = None  # dHash of previous_metric_frame
+        
+        # Scratch buffers reused across frames, per thread (filter_frames scores on a pool)
+        self._scratch = threading.local()
 
         logger.info(f"QualityFilter initialized (enabled={self.enabled})")
 
@@ -73,8 +111,21 @@ class QualityFilter:
         scale = self.fast_metrics_max_dim / float(max_dim)
         new_w = max(1, int(round(w * scale)))
         new_h = max(1, int(round(h * scale)))
+        if frame.ndim == 3:
+            # Color input is only a step towards the gray metric frame, so it can
+            # go into a scratch buffer (a gray result is kept as previous frame)
+            dst = self._scratch_buffer('resized', (new_h, new_w, frame.shape[2]), frame.dtype)
+            return cv2.resize(frame, (new_w, new_h), dst=dst, interpolation=cv2.INTER_AREA)
         return cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_AREA)
     
+    def _scratch_buffer(self, name: str, shape: Tuple[int, ...], dtype) -> np.ndarray:
+        """This thread's reusable buffer for name, reallocated only when shape or dtype change"""
+        buf = getattr(self._scratch, name, None)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            setattr(self._scratch, name, buf)
+        return buf
+    
     def calculate_brightness(self, frame: np.ndarray) -> float:
         """
         Calculate average brightness of a frame
@@ -85,13 +136,13 @@ class QualityFilter:
         Returns:
             Average brightness value (0-255)
         """
-        # Convert to grayscale if needed
+        # Luma of the per-channel means equals the mean of the luma (it's linear),
+        # so BGR input needs one cv2.mean pass and no gray image
         if len(frame.shape) == 3:
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = frame
+            b, g, r, _ = cv2.mean(frame)
+            return 0.114 * b + 0.587 * g + 0.299 * r
         
-        return np.mean(gray)
+        return cv2.mean(frame)[0]
     
     def calculate_sharpness(self, frame: np.ndarray) -> float:
         """
@@ -110,9 +161,14 @@ class QualityFilter:
         else:
             gray = frame
         
-        # Calculate Laplacian variance
-        laplacian = cv2.Laplacian(gray, cv2.CV_64F)
-        variance = laplacian.var()
+        if self.sharpness_pyr_down:
+            gray = cv2.pyrDown(gray)
+        
+        # Calculate Laplacian variance; the 3x3 Laplacian of uint8 input fits in
+        # int16, and meanStdDev gives the same population variance as np.var
+        laplacian = cv2.Laplacian(gray, cv2.CV_16S, dst=self._scratch_buffer('laplacian', gray.shape, np.int16))
+        _, stddev = cv2.meanStdDev(laplacian)
+        variance = float(stddev[0, 0]) ** 2
         
         return variance
     
@@ -145,9 +201,8 @@ class QualityFilter:
         if gray1.shape != gray2.shape:
             gray2 = cv2.resize(gray2, (gray1.shape[1], gray1.shape[0]))
         
-        # Calculate absolute difference
-        diff = cv2.absdiff(gray1, gray2)
-        motion_score = np.sum(diff)
+        # Sum of absolute differences in one pass, without an intermediate diff image
+        motion_score = cv2.norm(gray1, gray2, cv2.NORM_L1)
         
         return motion_score
     
@@ -179,8 +234,13 @@ class QualityFilter:
         
         # Calculate similarity
         if SSIM_AVAILABLE:
-            # Use SSIM if available
-            similarity = ssim(gray1, gray2)
+            # Use SSIM if available, on small thumbnails of both frames
+            size = (SSIM_THUMB_SIZE, SSIM_THUMB_SIZE)
+            thumb1 = cv2.resize(gray1, size, dst=self._scratch_buffer('ssim1', size, gray1.dtype),
+                                interpolation=cv2.INTER_AREA)
+            thumb2 = cv2.resize(gray2, size, dst=self._scratch_buffer('ssim2', size, gray2.dtype),
+                                interpolation=cv2.INTER_AREA)
+            similarity = ssim(thumb1, thumb2, data_range=255, win_size=7)
         else:
             # Fallback: Use normalized correlation
             # Normalize images
@@ -213,30 +273,58 @@ class QualityFilter:
         if not self.enabled:
             return True, {}
         
+        is_quality, metrics, metric_frame, frame_hash = self._check_frame_content(frame)
+        if not is_quality:
+            return False, metrics
+        return self._check_against_previous(metric_frame, frame_hash, metrics)
+    
+    def _check_frame_content(self, frame: np.ndarray) -> Tuple[bool, Dict, np.ndarray, Optional[int]]:
+        """
+        Per-frame half of is_quality_frame: brightness and sharpness, plus the
+        metric frame and its dHash for the temporal checks. Independent of
+        other frames, so filter_frames runs it on several frames at once.
+        """
         metrics = {}
         
-        # Prepare metric frame (possibly downsized for speed)
+        # Prepare metric frame (possibly downsized for speed), converted to grayscale
+        # once here; every metric below accepts gray input as-is
         metric_frame = self._resize_for_metrics(frame)
+        if metric_frame.ndim == 3:
+            metric_frame = cv2.cvtColor(metric_frame, cv2.COLOR_BGR2GRAY)
         
         # Calculate brightness
-        brightness = self.calculate_brightness(metric_frame)
-        metrics['brightness'] = brightness
-        
-        if brightness < self.min_brightness or brightness > self.max_brightness:
-            logger.debug(f"Frame rejected: brightness {brightness:.2f} out of range "
-                        f"[{self.min_brightness}, {self.max_brightness}]")
-            return False, metrics
+        if self._check_brightness:
+            brightness = self.calculate_brightness(metric_frame)
+            metrics['brightness'] = brightness
+            
+            if brightness < self.min_brightness or brightness > self.max_brightness:
+                logger.debug(f"Frame rejected: brightness {brightness:.2f} out of range "
+                            f"[{self.min_brightness}, {self.max_brightness}]")
+                return False, metrics, metric_frame, None
         
         # Calculate sharpness
-        sharpness = self.calculate_sharpness(metric_frame)
-        metrics['sharpness'] = sharpness
-        
-        if sharpness < self.min_sharpness:
-            logger.debug(f"Frame rejected: sharpness {sharpness:.2f} below threshold {self.min_sharpness}")
-            return False, metrics
-        
+        if self._check_sharpness:
+            sharpness = self.calculate_sharpness(metric_frame)
+            metrics['sharpness'] = sharpness
+            
+            if sharpness < self.min_sharpness:
+                logger.debug(f"Frame rejected: sharpness {sharpness:.2f} below threshold {self.min_sharpness}")
+                return False, metrics, metric_frame, None
+        
+        frame_hash = None
+        if self.skip_similar and self.similarity_method != 'ssim':
+            frame_hash = self._dhash(metric_frame)
+        return True, metrics, metric_frame, frame_hash
+    
+    def _check_against_previous(
+        self,
+        metric_frame: np.ndarray,
+        frame_hash: Optional[int],
+        metrics: Dict
+    ) -> Tuple[bool, Dict]:
+        """Temporal half of is_quality_frame: motion and similarity to the last accepted frame"""
         # Check motion (if previous frame exists)
-        if self.detect_motion and self.previous_metric_frame is not None:
+        if self._check_motion and self.previous_metric_frame is not None:
             motion_score = self.calculate_motion_score(metric_frame, self.previous_metric_frame)
             metrics['motion_score'] = motion_score
             
@@ -246,17 +334,77 @@ class QualityFilter:
         
         # Check similarity to previous frame
         if self.skip_similar and self.previous_metric_frame is not None:
-            similarity = self.calculate_similarity(metric_frame, self.previous_metric_frame)
+            if frame_hash is None:
+                similarity = self.calculate_similarity(metric_frame, self.previous_metric_frame)
+            else:
+                if self.previous_hash is None:
+                    self.previous_hash = self._dhash(self.previous_metric_frame)
+                similarity = 1.0 - bin(frame_hash ^ self.previous_hash).count('1') / 64.0
             metrics['similarity'] = similarity
             
             if similarity > self.similarity_threshold:
                 logger.debug(f"Frame rejected: too similar to previous frame (similarity: {similarity:.3f})")
                 return False, metrics
         
-        # Stash the metric frame so caller can update previous on accept
+        # Stash the metric frame (and its hash) so caller can update previous on accept
         self._last_metric_frame = metric_frame
+        self._last_hash = frame_hash
         return True, metrics
     
+    @staticmethod
+    def _dhash(gray: np.ndarray) -> int:
+        """64-bit difference hash: sign of horizontal gradients on a 9x8 thumbnail"""
+        small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+        bits = small[:, 1:] > small[:, :-1]
+        return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+    
+    @staticmethod
+    def _copy_frame(frame_path: Path, output_path: str) -> None:
+        """Place an accepted frame in the output folder without re-encoding it"""
+        try:
+            if os.path.lexists(output_path):
+                # Left by an earlier run (possibly already this very file)
+                if os.path.samefile(frame_path, output_path):
+                    return
+                os.unlink(output_path)
+            # Frames are only read downstream, so sharing the inode is fine
+            os.link(str(frame_path), output_path)
+        except OSError:
+            # Hard links can't cross filesystems
+            shutil.copyfile(str(frame_path), output_path)
+    
+    def _read_for_metrics(self, frame_path: Path) -> Optional[np.ndarray]:
+        """
+        Read a frame for scoring. With fast metrics, JPEGs are decoded at half size
+        in the DCT domain (IMREAD_REDUCED_COLOR_2) since they get downsized anyway;
+        accepted frames are linked from the original file, so nothing is lost.
+        """
+        if self.fast_metrics_enabled and frame_path.suffix.lower() in ('.jpg', '.jpeg'):
+            frame = cv2.imread(str(frame_path), cv2.IMREAD_REDUCED_COLOR_2)
+            # Only keep it if it's still at least as large as the metric frame
+            if frame is not None and max(frame.shape[:2]) >= self.fast_metrics_max_dim:
+                return frame
+        return cv2.imread(str(frame_path))
+    
+    def _read_and_score(self, image_files: List[Path]):
+        """
+        Yield (frame_path, frame, content_check) in order, where content_check is
+        _check_frame_content's result (None when filtering is disabled or the read
+        failed). Decoding and the per-frame metrics don't depend on other frames,
+        so they run on a thread pool, FILTER_WINDOW frames at a time.
+        """
+        def read_and_score(frame_path: Path):
+            frame = self._read_for_metrics(frame_path)
+            if frame is None or not self.enabled:
+                return frame, None
+            return frame, self._check_frame_content(frame)
+        
+        with ThreadPoolExecutor(max_workers=FILTER_THREADS) as executor:
+            for start in range(0, len(image_files), FILTER_WINDOW):
+                window = image_files[start:start + FILTER_WINDOW]
+                for frame_path, (frame, content) in zip(window, executor.map(read_and_score, window)):
+                    yield frame_path, frame, content
+    
     def filter_frames(
         self, 
         input_dir: str, 
@@ -279,13 +427,11 @@ class QualityFilter:
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
         
-        # Get all image files
-        image_extensions = ['.jpg', '.jpeg', '.png', '.bmp']
-        image_files = []
-        
-        for ext in image_extensions:
-            image_files.extend(Path(input_dir).glob(f'*{ext}'))
-            image_files.extend(Path(input_dir).glob(f'*{ext.upper()}'))
+        # Get all image files (one directory listing, extensions matched case-insensitively)
+        image_extensions = ('.jpg', '.jpeg', '.png', '.bmp')
+        with os.scandir(input_dir) as entries:
+            image_files = [Path(e.path) for e in entries
+                           if e.name.lower().endswith(image_extensions) and e.is_file()]
         
         # Sort by filename
         image_files = sorted(image_files)
@@ -299,47 +445,54 @@ class QualityFilter:
         # Reset previous frames
         self.previous_frame = None
         self.previous_metric_frame = None
+        self.previous_hash = None
         
         # Filter frames
         quality_count = 0
         rejected_count = 0
-        quality_frames_info = []
-        
-        for idx, frame_path in enumerate(image_files, 1):
-            # Read frame
-            frame = cv2.imread(str(frame_path))
-            
-            if frame is None:
-                logger.warning(f"Failed to read frame: {frame_path}")
-                continue
-            
-            # Check quality
-            is_quality, metrics = self.is_quality_frame(frame, str(frame_path))
+        # Accepted frames are streamed to a JSONL file instead of kept in memory
+        quality_info_path = os.path.join(output_dir, 'quality_frames.jsonl')
+        with open(quality_info_path, 'w') as quality_info_file:
             
-            if is_quality:
-                # Copy to output directory
-                output_path = os.path.join(output_dir, frame_path.name)
-                cv2.imwrite(output_path, frame)
+            for idx, (frame_path, frame, content) in enumerate(self._read_and_score(image_files), 1):
+                if frame is None:
+                    logger.warning(f"Failed to read frame: {frame_path}")
+                    continue
                 
-                quality_frames_info.append({
-                    'original_path': str(frame_path),
-                    'output_path': output_path,
-                    'metrics': metrics
-                })
+                # Check quality; motion/similarity compare against the last accepted frame, so they run in order
+                if content is None:
+                    is_quality, metrics = True, {}
+                elif not content[0]:
+                    is_quality, metrics = False, content[1]
+                else:
+                    _, metrics, metric_frame, frame_hash = content
+                    is_quality, metrics = self._check_against_previous(metric_frame, frame_hash, metrics)
                 
-                quality_count += 1
-                
-                # Update previous frames (track last accepted frame for similarity/motion)
-                self.previous_frame = frame.copy()
-                # metric frame prepared in is_quality_frame
-                if hasattr(self, '_last_metric_frame') and self._last_metric_frame is not None:
-                    self.previous_metric_frame = self._last_metric_frame
-                
-                if quality_count % 50 == 0:
-                    logger.info(f"Processed {idx}/{len(image_files)} frames, "
-                              f"{quality_count} quality frames saved")
-            else:
-                rejected_count += 1
+                if is_quality:
+                    # Copy to output directory (original bytes: no decode/re-encode loss)
+                    output_path = os.path.join(output_dir, frame_path.name)
+                    self._copy_frame(frame_path, output_path)
+                    
+                    quality_info_file.write(json.dumps({
+                        'original_path': str(frame_path),
+                        'output_path': output_path,
+                        'metrics': {k: float(v) for k, v in metrics.items()}
+                    }) + '\n')
+                    
+                    quality_count += 1
+                    
+                    # Update previous frames (track last accepted frame for similarity/motion)
+                    self.previous_frame = frame.copy()
+                    # metric frame prepared in is_quality_frame
+                    if hasattr(self, '_last_metric_frame') and self._last_metric_frame is not None:
+                        self.previous_metric_frame = self._last_metric_frame
+                        self.previous_hash = getattr(self, '_last_hash', None)
+                    
+                    if quality_count % 50 == 0:
+                        logger.info(f"Processed {idx}/{len(image_files)} frames, "
+                                  f"{quality_count} quality frames saved")
+                else:
+                    rejected_count += 1
         
         logger.info(f"Filtering complete: {quality_count}/{len(image_files)} frames passed quality check")
         logger.info(f"Rejected: {rejected_count} frames")
@@ -351,7 +504,84 @@ class QualityFilter:
             'total_frames': len(image_files),
             'quality_frames': quality_count,
             'rejected_frames': rejected_count,
-            'quality_frames_info': quality_frames_info
+            'quality_frames_info_path': quality_info_path
+        }
+    
+    def filter_frame(
+        self,
+        frame: np.ndarray,
+        source_path: Optional[str] = None,
+        dest_path: Optional[str] = None
+    ) -> bool:
+        """
+        Filter one in-memory frame (e.g. straight from FrameExtractor's decode loop)
+        
+        Args:
+            frame: Decoded BGR frame
+            source_path: Where the frame already lives on disk, if anywhere
+            dest_path: Where to place the frame if it passes (None: only score it)
+            
+        Returns:
+            True if the frame passed and became the new reference frame
+        """
+        is_quality, metrics = self.is_quality_frame(frame, source_path)
+        if not is_quality:
+            return False
+        
+        if dest_path is not None:
+            if source_path is not None and os.path.exists(source_path):
+                self._copy_frame(Path(source_path), dest_path)
+            else:
+                frame_format = self.output_config.get('frame_format', 'jpg')
+                jpeg_quality = None
+                if frame_format.lower() in ['jpg', 'jpeg']:
+                    jpeg_quality = int(self.output_config.get('frame_quality', 95))
+                if not _write_frame(dest_path, frame, jpeg_quality):
+                    logger.warning(f"Failed to write frame: {dest_path}")
+        
+        # Callers hand over a fresh array per frame, so it can be kept without a copy
+        self.previous_frame = frame
+        if self.enabled and getattr(self, '_last_metric_frame', None) is not None:
+            self.previous_metric_frame = self._last_metric_frame
+            self.previous_hash = getattr(self, '_last_hash', None)
+        return True
+    
+    def filter_frames_stream(self, frames, output_dir: str) -> Dict:
+        """
+        Filter (path, frame) pairs that are already decoded, skipping the re-read
+        filter_frames does. Passing frames are placed in output_dir under their
+        file name (linked when the path exists, encoded otherwise).
+        
+        Args:
+            frames: Iterable of (path, BGR ndarray) in temporal order
+            output_dir: Directory to save quality frames
+            
+        Returns:
+            Dictionary with filtering statistics
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        
+        # Reset previous frames
+        self.previous_frame = None
+        self.previous_metric_frame = None
+        self.previous_hash = None
+        
+        total_count = 0
+        quality_count = 0
+        for frame_path, frame in frames:
+            total_count += 1
+            dest_path = os.path.join(output_dir, os.path.basename(str(frame_path)))
+            if self.filter_frame(frame, str(frame_path), dest_path):
+                quality_count += 1
+        
+        logger.info(f"Filtering complete: {quality_count}/{total_count} frames passed quality check")
+        
+        return {
+            'success': True,
+            'output_dir': output_dir,
+            'total_frames': total_count,
+            'quality_frames': quality_count,
+            'rejected_frames': total_count - quality_count
         }
     
     def filter_frames_batch(
@@ -387,6 +617,7 @@ class QualityFilter:
             # Reset previous frame for each video
             self.previous_frame = None
             self.previous_metric_frame = None
+            self.previous_hash = None
             
             # Create corresponding output directory
             output_dir = os.path.join(output_base_dir, subdir.name)
@@ -5,12 +5,26 @@ Helper functions for the basketball dataset creation pipeline
 
 import os
 import json
+import time
+import pickle
+import hashlib
 import yaml
 import logging
 from pathlib import Path
-from datetime import datetime
 from typing import Dict, Any
 
+# Parsed configs are cached here, keyed on (path, mtime, size) of the YAML file
+CONFIG_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'bball_pipeline')
+
+# Pickled configs already loaded by this process, under the same key
+_CONFIG_MEMO: Dict[tuple, bytes] = {}
+
+# Format of get_timestamp (safe in file names)
+TIMESTAMP_FORMAT = "%Y-%m-%d_%H-%M-%S"
+
+# libyaml's C loader when PyYAML was built with it, else the pure-Python one
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 # Optional numpy support for JSON serialization
 try:
     import numpy as _np
@@ -18,6 +32,13 @@ try:
 except Exception:
     _HAS_NUMPY = False
 
+# Optional orjson: C serializer that handles numpy values natively
+try:
+    import orjson as _orjson
+    _ORJSON_OPTIONS = _orjson.OPT_INDENT_2 | _orjson.OPT_SERIALIZE_NUMPY | _orjson.OPT_NON_STR_KEYS
+except ImportError:
+    _orjson = None
+
 
 def setup_logging(config: Dict) -> None:
     """
@@ -26,6 +47,10 @@ def setup_logging(config: Dict) -> None:
     Args:
         config: Configuration dictionary containing logging settings
     """
+    # basicConfig would ignore a second call anyway; return before opening the log file again
+    if logging.getLogger().hasHandlers():
+        return
+    
     log_config = config.get('logging', {})
     log_level = log_config.get('level', 'INFO')
     save_logs = log_config.get('save_logs', True)
@@ -68,8 +93,38 @@ def load_config(config_path: str) -> Dict:
         Configuration dictionary
     """
     try:
+        st = os.stat(config_path)
+        key = (os.path.abspath(config_path), st.st_mtime_ns, st.st_size)
+        
+        # Repeat loads in this process unpickle a fresh copy, so callers may mutate it
+        if key in _CONFIG_MEMO:
+            return pickle.loads(_CONFIG_MEMO[key])
+        
+        cache_path = os.path.join(CONFIG_CACHE_DIR, hashlib.sha1(repr(key).encode()).hexdigest() + '.pkl')
+        
+        # Unchanged config files are loaded from the pickle cache instead of re-parsing YAML
+        try:
+            with open(cache_path, 'rb') as f:
+                blob = f.read()
+            config = pickle.loads(blob)
+            _CONFIG_MEMO[key] = blob
+            return config
+        except Exception:
+            pass
+        
         with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=_YAML_LOADER)
+        
+        blob = pickle.dumps(config, protocol=pickle.HIGHEST_PROTOCOL)
+        _CONFIG_MEMO[key] = blob
+        try:
+            os.makedirs(CONFIG_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
         return config
     except Exception as e:
         print(f"Error loading config from {config_path}: {e}")
@@ -103,8 +158,17 @@ def save_metadata(data: Dict, output_path: str) -> None:
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        with open(output_path, 'w') as f:
-            json.dump(data, f, indent=2, default=_json_default)
+        blob = None
+        if _orjson is not None:
+            try:
+                blob = _orjson.dumps(data, default=_json_default, option=_ORJSON_OPTIONS)
+            except TypeError:
+                pass  # e.g. integers beyond 64 bits; stdlib json handles those
+        if blob is None:
+            blob = json.dumps(data, indent=2, default=_json_default).encode()
+        
+        with open(output_path, 'wb') as f:
+            f.write(blob)
         
         logging.getLogger(__name__).info(f"Metadata saved to: {output_path}")
     except Exception as e:
@@ -122,9 +186,14 @@ def load_metadata(metadata_path: str) -> Dict:
         Metadata dictionary
     """
     try:
-        with open(metadata_path, 'r') as f:
-            metadata = json.load(f)
-        return metadata
+        with open(metadata_path, 'rb') as f:
+            blob = f.read()
+        if _orjson is not None:
+            try:
+                return _orjson.loads(blob)
+            except _orjson.JSONDecodeError:
+                pass  # e.g. NaN/Infinity written by the stdlib fallback; json accepts those
+        return json.loads(blob)
     except Exception as e:
         logging.getLogger(__name__).error(f"Error loading metadata from {metadata_path}: {e}")
         return {}
@@ -144,12 +213,14 @@ def count_files(directory: str, extensions: list = None) -> int:
     if not os.path.exists(directory):
         return 0
     
-    files = list(Path(directory).iterdir())
+    with os.scandir(directory) as it:
+        names = [entry.name for entry in it]
     
     if extensions:
-        files = [f for f in files if f.suffix.lower() in [ext.lower() for ext in extensions]]
+        ext_set = frozenset(ext.lower() for ext in extensions)
+        names = [name for name in names if os.path.splitext(name)[1].lower() in ext_set]
     
-    return len(files)
+    return len(names)
 
 
 def get_video_files(directory: str, recursive: bool = True) -> list:
@@ -163,16 +234,19 @@ def get_video_files(directory: str, recursive: bool = True) -> list:
     Returns:
         List of video file paths
     """
-    video_extensions = ['.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv']
+    video_extensions = {'.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv'}
     video_files = []
     
-    pattern = '**/*' if recursive else '*'
+    # One directory walk, matching extensions case-insensitively
+    for root, dirs, files in os.walk(directory):
+        video_files.extend(
+            Path(root) / name for name in files
+            if os.path.splitext(name)[1].lower() in video_extensions
+        )
+        if not recursive:
+            break
     
-    for ext in video_extensions:
-        video_files.extend(Path(directory).glob(f'{pattern}{ext}'))
-        video_files.extend(Path(directory).glob(f'{pattern}{ext.upper()}'))
-    
-    return sorted(video_files)
+    return sorted(video_files, key=os.fspath)
 
 
 def get_image_files(directory: str) -> list:
@@ -185,14 +259,19 @@ def get_image_files(directory: str) -> list:
     Returns:
         List of image file paths
     """
-    image_extensions = ['.jpg', '.jpeg', '.png', '.bmp']
-    image_files = []
+    image_extensions = {'.jpg', '.jpeg', '.png', '.bmp'}
     
-    for ext in image_extensions:
-        image_files.extend(Path(directory).glob(f'*{ext}'))
-        image_files.extend(Path(directory).glob(f'*{ext.upper()}'))
+    # One directory listing, matching extensions case-insensitively
+    try:
+        with os.scandir(directory) as it:
+            image_files = [
+                Path(entry.path) for entry in it
+                if os.path.splitext(entry.name)[1].lower() in image_extensions and entry.is_file()
+            ]
+    except OSError:
+        return []
     
-    return sorted(image_files)
+    return sorted(image_files, key=os.fspath)
 
 
 def create_directory_structure(base_dir: str, subdirs: list) -> None:
@@ -223,13 +302,11 @@ def format_duration(seconds: float) -> str:
     if seconds < 60:
         return f"{seconds:.1f}s"
     elif seconds < 3600:
-        minutes = int(seconds // 60)
-        secs = int(seconds % 60)
+        minutes, secs = divmod(int(seconds), 60)
         return f"{minutes}m {secs}s"
     else:
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        return f"{hours}h {minutes}m"
+        hours, rest = divmod(int(seconds), 3600)
+        return f"{hours}h {rest // 60}m"
 
 
 def get_timestamp() -> str:
@@ -239,7 +316,7 @@ def get_timestamp() -> str:
     Returns:
         Timestamp string (YYYY-MM-DD_HH-MM-SS)
     """
-    return datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    return time.strftime(TIMESTAMP_FORMAT, time.localtime())
 
 
 def print_pipeline_header(title: str) -> None:
@@ -282,13 +359,13 @@ def validate_directories(directories: Dict) -> bool:
         True if all directories exist, False otherwise
     """
     logger = logging.getLogger(__name__)
-    all_exist = True
     
-    for name, path in directories.items():
-        if not os.path.exists(path):
-            logger.error(f"{name} directory not found: {path}")
-            all_exist = False
-        else:
-            logger.debug(f"{name} directory found: {path}")
+    # A file at the path doesn't count as the directory being there
+    missing = [f"{name} ({path})" for name, path in directories.items() if not os.path.isdir(path)]
+    
+    if missing:
+        logger.error(f"Directories not found: {', '.join(missing)}")
+    else:
+        logger.debug(f"All {len(directories)} directories found")
     
-    return all_exist
+    return not missing
@@ -126,9 +126,15 @@ def test_augmentation_sample():
     logger.info(f"\n{'='*60}")
     logger.info("TEST COMPLETE")
     logger.info(f"{'='*60}")
+    # Count both kinds of output in one directory listing
+    num_images = num_labels = 0
+    with os.scandir(test_output_dir) as it:
+        for entry in it:
+            num_images += entry.name.endswith('.jpg')
+            num_labels += entry.name.endswith('.txt')
     logger.info(f"\nTest results saved to: {test_output_dir}")
-    logger.info(f"Total images: {len(list(Path(test_output_dir).glob('*.jpg')))}")
-    logger.info(f"Total labels: {len(list(Path(test_output_dir).glob('*.txt')))}")
+    logger.info(f"Total images: {num_images}")
+    logger.info(f"Total labels: {num_labels}")
     logger.info("\nPlease review the augmented images to verify:")
     logger.info("  1. Images look realistic for basketball scenes")
     logger.info("  2. Bounding boxes are correctly transformed")
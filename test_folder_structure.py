@@ -4,6 +4,7 @@ Quick test to verify folder structure preservation
 
 import os
 import sys
+import heapq
 from pathlib import Path
 
 # Add src to path
@@ -13,6 +14,18 @@ from augmentation import DataAugmentor
 from utils import load_config, setup_logging
 import logging
 
+def relative_dirs(base):
+    """All directories under base, relative to it, from a single walk"""
+    base = os.path.normpath(base)
+    prefix_len = len(base) + 1
+    folders = set()
+    for root, dirs, files in os.walk(base):
+        # Roots are base + os.sep + ..., so slicing off the prefix gives the relative path
+        rel_root = root[prefix_len:]
+        for d in dirs:
+            folders.add(os.path.join(rel_root, d) if rel_root else d)
+    return folders
+
 def test_folder_structure():
     """Test that folder structure is preserved"""
     
@@ -57,17 +70,8 @@ def test_folder_structure():
         logger.info("="*60)
         
         # Check that folders were created
-        input_folders = set()
-        for root, dirs, files in os.walk(test_input):
-            for d in dirs:
-                rel_path = os.path.relpath(os.path.join(root, d), test_input)
-                input_folders.add(rel_path)
-        
-        output_folders = set()
-        for root, dirs, files in os.walk(test_output):
-            for d in dirs:
-                rel_path = os.path.relpath(os.path.join(root, d), test_output)
-                output_folders.add(rel_path)
+        input_folders = relative_dirs(test_input)
+        output_folders = relative_dirs(test_output)
         
         logger.info(f"\nInput folders found: {len(input_folders)}")
         for folder in sorted(input_folders):
@@ -78,11 +82,12 @@ def test_folder_structure():
             logger.info(f"  - {folder}")
         
         # Check if structure matches
-        if input_folders == output_folders:
+        mismatched = input_folders ^ output_folders
+        if not mismatched:
             logger.info("\n✓ Folder structure preserved correctly!")
         else:
             logger.warning("\n✗ Folder structure mismatch!")
-            missing = input_folders - output_folders
+            missing = mismatched & input_folders
             if missing:
                 logger.warning(f"Missing folders: {missing}")
         
@@ -91,7 +96,7 @@ def test_folder_structure():
         logger.info("SAMPLE FILES IN OUTPUT FOLDERS")
         logger.info("="*60)
         
-        for folder in sorted(output_folders)[:3]:  # Show first 3 folders
+        for folder in heapq.nsmallest(3, output_folders):  # Show first 3 folders
             folder_path = os.path.join(test_output, folder)
             files = [f for f in os.listdir(folder_path) if f.endswith('.jpg')][:5]
             logger.info(f"\n{folder}/")
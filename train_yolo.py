@@ -4,6 +4,7 @@ Uses Ultralytics YOLO with settings from config/config.yaml.
 """
 
 import os
+import re
 import sys
 from pathlib import Path
 
@@ -13,6 +14,9 @@ sys.path.insert(0, str(Path(__file__).parent / 'src'))
 from utils import load_config, setup_logging
 import logging
 
+# A YOLO label line: integer class id followed by at least four values
+LABEL_LINE_RE = re.compile(rb'(?m)^[ \t]*-?\d+(?:[ \t]+\S+){4}')
+
 
 def main():
     config = load_config('config/config.yaml')
@@ -32,6 +36,9 @@ def main():
         logger.error(f'data.yaml not found at {data_yaml}. Run split_dataset.py first.')
         return
 
+    # Parsed once here (through the cached config loader) for the label check below
+    data_cfg = load_config(data_yaml)
+
     try:
         from ultralytics import YOLO
     except Exception as e:
@@ -50,12 +57,8 @@ def main():
         logger.warning('Could not query torch/cuda status.')
 
     # Helper: check if any labels exist in dataset splits
-    def dataset_has_labels(yaml_path: str) -> bool:
+    def dataset_has_labels(data: dict, base: Path) -> bool:
         try:
-            import yaml as _yaml
-            base = Path(yaml_path).parent
-            with open(yaml_path, 'r', encoding='utf-8') as f:
-                data = _yaml.safe_load(f)
             has_any = False
             for key in ('train', 'val', 'test'):
                 if key not in data or not data[key]:
@@ -65,18 +68,20 @@ def main():
                 labels_dir = images_path.parent / 'labels'
                 if not labels_dir.exists():
                     continue
-                for txt in labels_dir.glob('*.txt'):
-                    try:
-                        with open(txt, 'r', encoding='utf-8') as lf:
-                            for line in lf:
-                                line = line.strip()
-                                if not line:
-                                    continue
-                                parts = line.split()
-                                if len(parts) >= 5 and parts[0].lstrip('-').isdigit():
+                with os.scandir(labels_dir) as it:
+                    for entry in it:
+                        if not entry.name.endswith('.txt'):
+                            continue
+                        try:
+                            # Empty files are background images; skip them without opening
+                            if entry.stat().st_size == 0:
+                                continue
+                            # Label files are small: scan the raw bytes instead of decoding and splitting lines
+                            with open(entry.path, 'rb') as lf:
+                                if LABEL_LINE_RE.search(lf.read()):
                                     return True
-                    except Exception:
-                        continue
+                        except Exception:
+                            continue
             return has_any
         except Exception as e:
             logger.warning(f'Label presence check failed: {e}. Proceeding as if no labels.')
@@ -111,7 +116,7 @@ def main():
         logger.info(f'  {k}: {v}')
 
     # If no labels present, skip training gracefully
-    if not dataset_has_labels(data_yaml):
+    if not dataset_has_labels(data_cfg, Path(data_yaml).parent):
         logger.info('\nNo labels found in dataset splits. Skipping training step.\n'
                     'This is expected if you have not annotated yet.\n'
                     'When your labeled data is ready, add YOLO txt labels under train/val/test labels folders and re-run.')
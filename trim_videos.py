@@ -11,12 +11,20 @@ Usage:
     
     # Process single video with output override
     python trim_videos.py --input "source_videos/video.mp4" --ranges "5:30-20:00" --output "all_video_frames"
+    
+    # Frame-accurate cuts (re-encodes on the GPU with NVENC, or libx264)
+    python trim_videos.py --input "source_videos/video.mp4" --ranges "5:30-20:00" --accurate
+    
+    # Read ranges as JSON lines on stdin (avoids argv length limits)
+    echo '{"ranges": ["0:00-15:00", "25:00-35:00"]}' | python trim_videos.py --input "source_videos/video.mp4" --stdin
 """
 
 import argparse
+import json
 import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Tuple
 import yaml
@@ -25,6 +33,9 @@ import logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+# libyaml's C loader when PyYAML was built with it, else the pure-Python one
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 
 def parse_timestamp(timestamp: str) -> float:
     """Convert timestamp string (MM:SS or HH:MM:SS) to seconds.
@@ -72,11 +83,47 @@ def parse_range(range_str: str) -> Tuple[float, float]:
     return start_sec, end_sec
 
 
+# (input options, output codec options) tried in order for frame-accurate
+# trims: NVDEC/NVENC on the GPU first, then software x264
+ACCURATE_ENCODERS = [
+    (['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda'], ['-c:v', 'h264_nvenc', '-preset', 'p4', '-c:a', 'copy']),
+    ([], ['-c:v', 'libx264', '-preset', 'veryfast', '-c:a', 'copy']),
+]
+
+
+# Leading arguments of every ffmpeg run: overwrite output, errors only, no
+# per-frame progress output
+FFMPEG_BASE = ('ffmpeg', '-y', '-loglevel', 'error', '-nostats')
+
+# Concurrent ffmpeg processes; each trim is a child process, so threads only wait on them
+TRIM_WORKERS = 4
+
+# Bytes of ffmpeg's stderr kept for the error message when a run fails
+STDERR_TAIL_BYTES = 4096
+
+
+def run_ffmpeg(cmd: List[str]) -> Tuple[int, str]:
+    """Run ffmpeg, discarding stdout and keeping only the tail of stderr.
+    
+    Args:
+        cmd: Full ffmpeg command line
+        
+    Returns:
+        Tuple of (exit code, last STDERR_TAIL_BYTES of stderr as text)
+    """
+    tail = b''
+    with subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE) as proc:
+        for chunk in iter(lambda: proc.stderr.read(STDERR_TAIL_BYTES), b''):
+            tail = (tail + chunk)[-STDERR_TAIL_BYTES:]
+    return proc.returncode, tail.decode(errors='replace')
+
+
 def trim_video_clip(
     input_video: str,
     output_path: str,
     start_sec: float,
-    end_sec: float
+    end_sec: float,
+    accurate: bool = False
 ) -> bool:
     """Trim a video clip using ffmpeg.
     
@@ -85,46 +132,92 @@ def trim_video_clip(
         output_path: Path for output clip
         start_sec: Start time in seconds
         end_sec: End time in seconds
+        accurate: Re-encode so the cut lands exactly on start_sec instead of
+            the preceding keyframe (GPU encoder if available, else libx264)
         
     Returns:
         True if successful, False otherwise
     """
     duration = end_sec - start_sec
     
-    # ffmpeg command: -ss (start), -t (duration), -c copy (fast, no re-encode)
-    cmd = [
-        'ffmpeg',
-        '-y',  # overwrite output
-        '-ss', str(start_sec),
-        '-i', input_video,
-        '-t', str(duration),
-        '-c', 'copy',  # copy streams (fast, no quality loss)
-        '-avoid_negative_ts', '1',
-        output_path
-    ]
+    # -c copy (fast, no quality loss) unless the cut has to be frame-accurate
+    attempts = ACCURATE_ENCODERS if accurate else [([], ['-c', 'copy'])]
     
+    logger.info(f"  Trimming {start_sec:.1f}s to {end_sec:.1f}s ({duration:.1f}s) -> {Path(output_path).name}")
     try:
-        logger.info(f"  Trimming {start_sec:.1f}s to {end_sec:.1f}s ({duration:.1f}s) -> {Path(output_path).name}")
-        result = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            check=True
-        )
-        return True
-    except subprocess.CalledProcessError as e:
-        logger.error(f"  ffmpeg error: {e.stderr.decode()}")
-        return False
+        for attempt, (input_opts, codec_opts) in enumerate(attempts, 1):
+            # ffmpeg command: -ss (start), -t (duration)
+            cmd = [
+                *FFMPEG_BASE,
+                *input_opts,
+                '-ss', f"{start_sec:.3f}",
+                '-i', input_video,
+                '-t', f"{duration:.3f}",
+                *codec_opts,
+                '-avoid_negative_ts', '1',
+                output_path
+            ]
+            returncode, stderr = run_ffmpeg(cmd)
+            if returncode == 0:
+                return True
+            if attempt == len(attempts):
+                logger.error(f"  ffmpeg error: {stderr}")
+                return False
+            logger.warning(f"  {codec_opts[1]} encode failed, retrying with {attempts[attempt][1][1]}")
     except FileNotFoundError:
         logger.error("ffmpeg not found. Please install ffmpeg and add to PATH.")
         logger.error("Download from: https://ffmpeg.org/download.html")
         return False
 
 
+def trim_video_clips(
+    input_video: str,
+    clips: List[Tuple[str, float, float]]
+) -> bool:
+    """Trim several clips from one video with a single ffmpeg invocation.
+    
+    Every range is opened as its own input-seeked input (-ss/-t before -i) and
+    stream-copied to its own output, so ffmpeg only reads the packets of each
+    range once and the process/demuxer startup is paid once per video.
+    
+    Args:
+        input_video: Path to source video
+        clips: List of (output_path, start_sec, end_sec) tuples
+        
+    Returns:
+        True if all clips were written, False otherwise
+    """
+    cmd = list(FFMPEG_BASE)
+    for _, start_sec, end_sec in clips:
+        cmd += ['-ss', f"{start_sec:.3f}", '-t', f"{end_sec - start_sec:.3f}", '-i', input_video]
+    
+    for idx, (output_path, start_sec, end_sec) in enumerate(clips):
+        logger.info(f"  Trimming {start_sec:.1f}s to {end_sec:.1f}s ({end_sec - start_sec:.1f}s) -> {Path(output_path).name}")
+        cmd += [
+            '-map', f'{idx}:v:0',
+            '-map', f'{idx}:a:0?',
+            '-c', 'copy',  # copy streams (fast, no quality loss)
+            '-avoid_negative_ts', '1',
+            output_path
+        ]
+    
+    try:
+        returncode, stderr = run_ffmpeg(cmd)
+        if returncode != 0:
+            logger.warning(f"  Single-pass trim failed, falling back to one ffmpeg per clip: {stderr}")
+            return False
+        return True
+    except FileNotFoundError:
+        # Reported by the per-clip fallback
+        return False
+
+
 def process_video(
     input_video: str,
     time_ranges: List[Tuple[float, float]],
-    output_base_dir: str = "all_video_frames"
+    output_base_dir: str = "all_video_frames",
+    accurate: bool = False,
+    workers: int = TRIM_WORKERS
 ) -> List[str]:
     """Process a video and create clips for each time range.
     
@@ -132,6 +225,8 @@ def process_video(
         input_video: Path to source video
         time_ranges: List of (start, end) tuples in seconds
         output_base_dir: Base directory for output clips
+        accurate: Re-encode each clip for frame-accurate cuts
+        workers: Clips trimmed concurrently when cutting clip by clip
         
     Returns:
         List of created clip paths
@@ -152,19 +247,48 @@ def process_video(
     logger.info(f"Output directory: {output_dir}")
     logger.info(f"Creating {len(time_ranges)} clip(s)...")
     
-    created_clips = []
-    for idx, (start_sec, end_sec) in enumerate(time_ranges, 1):
-        clip_name = f"{video_name}_clip{idx:02d}{video_ext}"
-        clip_path = output_dir / clip_name
+    clips = [
+        (str(output_dir / f"{video_name}_clip{idx:02d}{video_ext}"), start_sec, end_sec)
+        for idx, (start_sec, end_sec) in enumerate(time_ranges, 1)
+    ]
+    
+    # Cut every range in one ffmpeg run; retry clip by clip if that fails
+    if not accurate and len(clips) > 1 and trim_video_clips(str(input_path), clips):
+        created_clips = [clip_path for clip_path, _, _ in clips]
+    else:
+        # Clips are independent, so several ffmpeg processes can run at once
+        def trim(clip):
+            clip_path, start_sec, end_sec = clip
+            return trim_video_clip(str(input_path), clip_path, start_sec, end_sec, accurate=accurate)
         
-        success = trim_video_clip(str(input_path), str(clip_path), start_sec, end_sec)
-        if success:
-            created_clips.append(str(clip_path))
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(clips)))) as executor:
+            results = list(executor.map(trim, clips))
+        created_clips = [clip[0] for clip, success in zip(clips, results) if success]
     
     logger.info(f"✓ Created {len(created_clips)}/{len(time_ranges)} clips successfully")
     return created_clips
 
 
+def trim_one_video(
+    input_video: str,
+    range_strs: List[str],
+    output_base_dir: str = "data/all_video_frames",
+    accurate: bool = False,
+    workers: int = TRIM_WORKERS
+) -> List[str]:
+    """Parse "START-END" range strings and trim one video into clips.
+    
+    Entry point for callers importing this module (e.g. run_pipeline.py)
+    instead of running it as a script. Callers running several videos at
+    once pass workers=1 to keep one ffmpeg per video.
+    
+    Returns:
+        List of created clip paths
+    """
+    time_ranges = [parse_range(r) for r in range_strs]
+    return process_video(input_video, time_ranges, output_base_dir, accurate=accurate, workers=workers)
+
+
 def load_config(config_path: str) -> dict:
     """Load trim configuration from YAML file.
     
@@ -184,7 +308,7 @@ def load_config(config_path: str) -> dict:
     ```
     """
     with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_YAML_LOADER)
 
 
 def main():
@@ -203,11 +327,30 @@ def main():
         help='Time ranges to extract (e.g., "0:00-15:00" "25:00-35:00")'
     )
     
+    parser.add_argument(
+        '--stdin',
+        action='store_true',
+        help='Read time ranges from stdin as JSON lines, e.g. {"ranges": ["0:00-15:00"]}'
+    )
+    
     parser.add_argument(
         '--config', '-c',
         help='YAML config file with video trim specifications'
     )
     
+    parser.add_argument(
+        '--accurate',
+        action='store_true',
+        help='Re-encode clips for frame-accurate cuts (h264_nvenc on the GPU, falling back to libx264)'
+    )
+    
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=TRIM_WORKERS,
+        help=f'Maximum concurrent ffmpeg processes (default: {TRIM_WORKERS})'
+    )
+    
     parser.add_argument(
         '--output', '-o',
         default='data/all_video_frames',
@@ -216,9 +359,25 @@ def main():
     
     args = parser.parse_args()
     
+    if args.stdin:
+        args.ranges = list(args.ranges or [])
+        for line_num, line in enumerate(sys.stdin, 1):
+            if not line.strip():
+                continue
+            try:
+                obj = json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning(f"Skipping stdin line {line_num}: invalid JSON ({e})")
+                continue
+            ranges = obj.get('ranges', []) if isinstance(obj, dict) else None
+            if not isinstance(ranges, list):
+                logger.warning(f"Skipping stdin line {line_num}: expected an object with a 'ranges' list")
+                continue
+            args.ranges.extend(ranges)
+    
     # Validate inputs
     if not args.config and not (args.input and args.ranges):
-        parser.error("Either --config or both --input and --ranges must be provided")
+        parser.error("Either --config or both --input and --ranges (or --stdin) must be provided")
     
     if args.config and (args.input or args.ranges):
         parser.error("Cannot use --config with --input/--ranges (choose one mode)")
@@ -237,6 +396,7 @@ def main():
         output_base = config.get('output_dir', args.output)
         videos = config.get('videos', [])
         
+        jobs = []
         for video_spec in videos:
             input_video = video_spec.get('input')
             range_strs = video_spec.get('ranges', [])
@@ -244,19 +404,31 @@ def main():
             if not input_video or not range_strs:
                 logger.warning(f"Skipping incomplete video spec: {video_spec}")
                 continue
-            
+            jobs.append((input_video, range_strs))
+        
+        # With several videos, run the videos concurrently (clips within each
+        # one sequentially) so at most args.workers ffmpeg processes are alive
+        per_video_workers = args.workers if len(jobs) <= 1 else 1
+        
+        def run_job(job):
+            input_video, range_strs = job
             try:
                 time_ranges = [parse_range(r) for r in range_strs]
-                clips = process_video(input_video, time_ranges, output_base)
-                all_clips.extend(clips)
+                return process_video(input_video, time_ranges, output_base,
+                                     accurate=args.accurate, workers=per_video_workers)
             except Exception as e:
                 logger.error(f"Error processing {input_video}: {e}")
+                return []
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(args.workers, len(jobs)))) as executor:
+            for clips in executor.map(run_job, jobs):
+                all_clips.extend(clips)
     
     else:
         # Command-line mode
         try:
-            time_ranges = [parse_range(r) for r in args.ranges]
-            clips = process_video(args.input, time_ranges, args.output)
+            clips = trim_one_video(args.input, args.ranges, args.output, accurate=args.accurate,
+                                   workers=args.workers)
             all_clips.extend(clips)
         except Exception as e:
             logger.error(f"Error: {e}")